@@ -1,4 +1,93 @@
-import math
+# NumPy is imported by load_numpy the first time a big group is checked, so
+# games that never check big groups don't pay for importing it.
+np = None
+numpy_loaded = False
+
+# Below this amount of pairs the plain Python loop is faster than NumPy.
+BATCH_MIN_PAIRS = 64
+
+
+def load_numpy():
+    """
+    Imports NumPy into this module's np, if it is installed. Does nothing
+    after the first call.
+    :return: the numpy module, or None if it is not installed
+    """
+    global np, numpy_loaded
+    if not numpy_loaded:
+        numpy_loaded = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+
+def find_intersections(xs_a, ys_a, radii_a, xs_b, ys_b, radii_b, width=None,
+                       height=None):
+    """
+    Finds all the pairs of intersecting objects between two groups of objects
+    (for example torpedos and asteroids), by comparing the squared distance
+    between every pair to the squared sum of their radiuses. If the screen's
+    width and height are given, the distance is measured around the screen's
+    edges as well (the shorter way in every axis), like the game measures it.
+    If NumPy is installed, big groups are checked in one broadcast operation.
+    :param xs_a: the x coordinates of the first group
+    :param ys_a: the y coordinates of the first group
+    :param radii_a: the radiuses of the first group
+    :param xs_b: the x coordinates of the second group
+    :param ys_b: the y coordinates of the second group
+    :param radii_b: the radiuses of the second group
+    :param width: the width of the screen, or None if the distance doesn't
+    go around the edges
+    :param height: the height of the screen (or None)
+    :return: a list of (i, j) tuples, for every object i of the first group
+    that intersects the object j of the second group, sorted by i and then j.
+    """
+    if len(xs_a) * len(xs_b) >= BATCH_MIN_PAIRS and \
+            load_numpy() is not None:
+        delta_x = np.abs(np.subtract.outer(np.asarray(xs_a, dtype=float),
+                                           np.asarray(xs_b, dtype=float)))
+        delta_y = np.abs(np.subtract.outer(np.asarray(ys_a, dtype=float),
+                                           np.asarray(ys_b, dtype=float)))
+        if width is not None:
+            # The remainder is slow, and it is needed only if an object is
+            # out of the screen.
+            if (delta_x >= width).any():
+                delta_x %= width
+            np.minimum(delta_x, width - delta_x, out=delta_x)
+            if (delta_y >= height).any():
+                delta_y %= height
+            np.minimum(delta_y, height - delta_y, out=delta_y)
+        max_dist = np.add.outer(np.asarray(radii_a, dtype=float),
+                                np.asarray(radii_b, dtype=float))
+        delta_x *= delta_x
+        delta_y *= delta_y
+        delta_x += delta_y
+        max_dist *= max_dist
+        rows, cols = np.nonzero(delta_x <= max_dist)
+        return list(zip(rows.tolist(), cols.tolist()))
+    # Lists are faster than arrays to read one item at a time.
+    xs_a, ys_a, radii_a, xs_b, ys_b, radii_b = [
+        values.tolist() if hasattr(values, "tolist") else values
+        for values in (xs_a, ys_a, radii_a, xs_b, ys_b, radii_b)]
+    pairs = []
+    for i in range(len(xs_a)):
+        x, y, radius = xs_a[i], ys_a[i], radii_a[i]
+        for j in range(len(xs_b)):
+            delta_x = abs(xs_b[j] - x)
+            delta_y = abs(ys_b[j] - y)
+            if width is not None:
+                if delta_x >= width:
+                    delta_x %= width
+                delta_x = min(delta_x, width - delta_x)
+                if delta_y >= height:
+                    delta_y %= height
+                delta_y = min(delta_y, height - delta_y)
+            max_dist = radius + radii_b[j]
+            if delta_x * delta_x + delta_y * delta_y <= max_dist * max_dist:
+                pairs.append((i, j))
+    return pairs
 
 
 class Asteroid:
@@ -9,6 +98,10 @@ class Asteroid:
     asteroid, and functions that change the asteroid's attributes if needed.
     """
 
+    # The attributes are kept in slots instead of a dictionary in every
+    # object. The coordinates and the speeds are always floats.
+    __slots__ = ("__x_coor", "__x_speed", "__y_coor", "__y_speed", "__size")
+
     def __init__(self, x_coor, x_speed, y_coor, y_speed, size):
         """
         Initialize a new Asteroid object.
@@ -18,10 +111,10 @@ class Asteroid:
         :param y_speed: y axis speed
         :param size: the size of the asteroid
         """
-        self.__x_coor = x_coor
-        self.__x_speed = x_speed
-        self.__y_coor = y_coor
-        self.__y_speed = y_speed
+        self.__x_coor = float(x_coor)
+        self.__x_speed = float(x_speed)
+        self.__y_coor = float(y_coor)
+        self.__y_speed = float(y_speed)
         self.__size = size
 
     def get_coor(self):
@@ -37,7 +130,25 @@ class Asteroid:
         asteroid coordinates to.
         :return: None
         """
-        self.__x_coor, self.__y_coor = new_coor
+        x_coor, y_coor = new_coor
+        self.__x_coor = float(x_coor)
+        self.__y_coor = float(y_coor)
+
+    def advance(self, x_range, y_range):
+        """
+        Moves the asteroid by its speed, around the screen's edges.
+        :param x_range: a tuple of the minimum x coordinate of the screen and
+        the screen's width
+        :param y_range: a tuple of the minimum y coordinate of the screen and
+        the screen's height
+        :return: None
+        """
+        min_x, delta_x = x_range
+        min_y, delta_y = y_range
+        self.__x_coor = (self.__x_speed + self.__x_coor - min_x) % delta_x + \
+            min_x
+        self.__y_coor = (self.__y_speed + self.__y_coor - min_y) % delta_y + \
+            min_y
 
     def get_speed(self):
         """
@@ -58,16 +169,20 @@ class Asteroid:
         radius = self.__size * 10 - 5
         return radius
 
-    def has_intersection(self, obj):
+    def has_intersection(self, obj, width=None, height=None):
         """
         Checks if their was an intersection between the asteroid and the
-        object, by checking the distance between them.
+        object, by checking the distance between them (with
+        find_intersections).
         :param obj: another object (ship or torpedo).
+        :param width: the width of the screen, if the distance should be
+        measured around the screen's edges as well (or None)
+        :param height: the height of the screen (or None)
         :return: True if their was an intersection between the asteroid and the
         object, and False if their wasn't.
         """
-        distance = math.sqrt((obj.get_coor()[0] - self.__x_coor) ** 2 +
-                             (obj.get_coor()[1] - self.__y_coor) ** 2)
-        if distance <= self.get_radius() + obj.get_radius():
-            return True
-        return False
+        x, y = self.get_coor()
+        obj_x, obj_y = obj.get_coor()
+        return bool(find_intersections((x,), (y,), (self.get_radius(),),
+                                       (obj_x,), (obj_y,),
+                                       (obj.get_radius(),), width, height))
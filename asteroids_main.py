@@ -1,14 +1,62 @@
-from screen import Screen
 from ship import Ship
-from asteroid import Asteroid
-from torpedo import Torpedo
+from asteroid import Asteroid, find_intersections
+from torpedo_pool import TorpedoPool
+from spatial_hash import SpatialHash
+from entity_list import EntityList
+from placement import Placement
 import sys
 import random
 import math
+import time
+import struct
+import zlib
+import trig
+import input_queue
 
 DEFAULT_ASTEROIDS_NUM = 5
 DEF_AST_SIZE = 3
 
+SNAPSHOT_MAGIC = b"ASNP"
+# magic, score, lives, the amounts of asteroids, torpedos and special
+# torpedos, and the ship's x, y, x speed, y speed and direction
+SNAPSHOT_HEADER = struct.Struct("<4sqqqqq5d")
+# The columns of every kind of objects in a snapshot, after the header: a
+# double ("d") or an integer ("q") of every object in every column.
+# x, y, x speed, y speed, size
+ASTEROID_COLUMNS = "ddddq"
+# x, y, x speed, y speed, direction, life-time
+TORPEDO_COLUMNS = "dddddq"
+# x, y, x speed, y speed, direction, life-time, original direction, cos, sin
+SPECIAL_COLUMNS = "dddddqddd"
+
+
+def snapshot_size(asteroids_amount, torpedos_amount, special_amount):
+    """
+    :return: the amount of bytes a snapshot with the given amounts of
+    asteroids, torpedos and special torpedos takes.
+    """
+    return SNAPSHOT_HEADER.size + 8 * (
+        len(ASTEROID_COLUMNS) * asteroids_amount +
+        len(TORPEDO_COLUMNS) * torpedos_amount +
+        len(SPECIAL_COLUMNS) * special_amount)
+
+
+def snapshot_columns(view, pos, amount, formats):
+    """
+    Splits a part of a snapshot into its columns.
+    :param view: a memoryview of the snapshot
+    :param pos: the position of the first column in the snapshot
+    :param amount: the amount of objects in every column
+    :param formats: the formats of the columns
+    :return: a tuple of a list of memoryviews of the columns and the position
+    after the last column
+    """
+    columns = []
+    for column_format in formats:
+        columns.append(view[pos:pos + 8 * amount].cast(column_format))
+        pos += 8 * amount
+    return columns, pos
+
 
 class GameRunner:
     """
@@ -26,6 +74,15 @@ class GameRunner:
     SPECIAL_MAX_LIFE_TIME = 150
     SPECIAL_TORPEDOS_AMOUNT = 8
     SHIP_LIFE = 3
+    # The amount of torpedos (and their drawings) to create in advance, so
+    # firing doesn't need to create new objects.
+    TORPEDO_POOL_SIZE = MAX_TORPEDOS + \
+        MAX_SPECIAL_TORPEDOS * SPECIAL_TORPEDOS_AMOUNT
+    # Settings of the fixed time-step loop: the amount of game ticks per
+    # second, and the maximum amount of ticks to run to catch up before
+    # drawing a frame.
+    TICK_RATE = 200
+    MAX_CATCH_UP = 5
     SCORE = {3: 20, 2: 50, 1: 100}
     COL_MSG = ("Collision!", "You hit an asteroid! You've got one less lives. "
                              "Be careful!")
@@ -33,25 +90,108 @@ class GameRunner:
     EXIT_MSG = ("Exit", "See you next time!")
     GAME_OVER_MSG = ("Game Over", "You ran out of lives :(")
 
-    def __init__(self, asteroids_amount=DEFAULT_ASTEROIDS_NUM):
+    # The order of the keys in the tuples returned by __read_keys.
+    KEYS = input_queue.KEYS
+
+    def __init__(self, asteroids_amount=DEFAULT_ASTEROIDS_NUM, screen=None,
+                 use_numpy=False, seed=None, recorder=None, replay=None):
         """
         Initialize a new GameRunner object.
         :param asteroids_amount: the amount of asteroids in the beginning of
         the game (default number).
+        :param screen: the display of the game. Any object with the methods of
+        the Screen class can be given (for example a HeadlessScreen). If None,
+        a new Screen is created, and the program exits when the game ends.
+        :param use_numpy: if True, the asteroids and torpedos are kept in NumPy
+        entity stores and are moved together in one vectorized step (for games
+        with a lot of asteroids). In this mode the life-time counters of the
+        torpedos are kept in the stores and not in the torpedos lists.
+        :param seed: the seed of the game's random numbers. Two games with the
+        same seed and the same keys in every tick are the same.
+        :param recorder: an object with record(keys) and record_state(digest)
+        functions (like replay.InputRecorder), that gets the keys of every
+        tick and the state digest after it (or None). If the recorder's
+        NEEDS_DIGEST attribute is False, it gets None instead of the digest,
+        and the digest isn't computed. If the recorder has a start(runner)
+        function, it is called with this GameRunner when it is created.
+        :param replay: an object with a next_keys() function (like
+        replay.InputReplay), that gives the keys of every tick instead of the
+        screen (or None).
         """
-        self.__screen = Screen()
-        self.__screen_max_x = Screen.SCREEN_MAX_X
-        self.__screen_max_y = Screen.SCREEN_MAX_Y
-        self.__screen_min_x = Screen.SCREEN_MIN_X
-        self.__screen_min_y = Screen.SCREEN_MIN_Y
+        if screen is None:
+            # Imported here so a headless game never imports tkinter.
+            from screen import Screen
+            screen = Screen(self.TORPEDO_POOL_SIZE)
+            self.__exit_on_end = True
+        else:
+            self.__exit_on_end = False
+        self.__screen = screen
+        self.__screen_max_x = screen.SCREEN_MAX_X
+        self.__screen_max_y = screen.SCREEN_MAX_Y
+        self.__screen_min_x = screen.SCREEN_MIN_X
+        self.__screen_min_y = screen.SCREEN_MIN_Y
+        # The ranges the objects move in (see advance).
+        self.__x_range = (self.__screen_min_x,
+                          self.__screen_max_x - self.__screen_min_x)
+        self.__y_range = (self.__screen_min_y,
+                          self.__screen_max_y - self.__screen_min_y)
+        self.__game_over = False
+        self.__random = random.Random(seed)
+        self.__recorder = recorder
+        self.__record_digest = getattr(recorder, "NEEDS_DIGEST", True)
+        self.__replay = replay
+        self.__quit_pressed = False
+        self.__profiler = None
 
+        if use_numpy:
+            # Imported here so NumPy is needed only when it is used.
+            from entity_store import EntityStore
+            bounds = (self.__screen_min_x, self.__screen_max_x,
+                      self.__screen_min_y, self.__screen_max_y)
+            self.__asteroid_store = EntityStore(*bounds)
+            self.__torpedo_store = EntityStore(*bounds)
+            self.__special_store = EntityStore(*bounds)
+        else:
+            self.__asteroid_store = None
+            self.__torpedo_store = None
+            self.__special_store = None
+
+        self.__placement = Placement(self.__screen_min_x,
+                                     self.__screen_max_x,
+                                     self.__screen_min_y,
+                                     self.__screen_max_y)
         self.__ship = self.__add_ship()
-        self.__asteroids = []
+        self.__asteroids = EntityList()
+        self.__asteroid_grid = SpatialHash(self.__screen_min_x,
+                                           self.__screen_max_x,
+                                           self.__screen_min_y,
+                                           self.__screen_max_y)
         self.__add_asteroids(asteroids_amount)
-        self.__torpedos = {}
-        self.__special_torpedos = {}
+        self.__torpedos = EntityList()
+        self.__special_torpedos = EntityList()
+        # The objects that were destroyed during the current tick. They are
+        # removed from the game together at the end of the tick.
+        self.__dead_asteroids = {}
+        self.__dead_torpedos = {}
+        self.__dead_special_torpedos = {}
+        self.__torpedo_pool = TorpedoPool(self.TORPEDO_POOL_SIZE)
         self.__lives = self.SHIP_LIFE
         self.__score = 0
+        # A recorder that records the game's state (like a
+        # replay_stream.ReplayStreamWriter) gets the game before its first
+        # tick.
+        start = getattr(recorder, "start", None)
+        if start is not None:
+            start(self)
+
+    def __random_coor(self):
+        """
+        :return: a tuple of random integer coordinates on the screen, from the
+        game's random numbers generator.
+        """
+        x = self.__random.randint(self.__screen_min_x, self.__screen_max_x)
+        y = self.__random.randint(self.__screen_min_y, self.__screen_max_y)
+        return x, y
 
     def __add_ship(self):
         """
@@ -59,8 +199,7 @@ class GameRunner:
         and direction 0, and put the ship on the screen.
         :return: the object of the ship
         """
-        x = random.randint(self.__screen_min_x, self.__screen_max_x)
-        y = random.randint(self.__screen_min_y, self.__screen_max_y)
+        x, y = self.__random_coor()
         ship = Ship(x, 0, y, 0, 0)
         self.__screen.draw_ship(x, y, 0)
         return ship
@@ -74,20 +213,52 @@ class GameRunner:
         the game.
         :return: None
         """
+        # The placement makes sure that the asteroids are not on the ship.
+        x, y = self.__ship.get_coor()
+        circles = ((x, y, self.__ship.get_radius() +
+                    Asteroid(x, 0, y, 0, DEF_AST_SIZE).get_radius()),)
+
+        def is_free(x_coor, y_coor):
+            return self.__placement.is_clear(x_coor, y_coor, circles)
+
         for ast in range(asteroids_amount):
-            x = random.randint(self.__screen_min_x, self.__screen_max_x)
-            y = random.randint(self.__screen_min_y, self.__screen_max_y)
-            x_speed = random.randint(self.AST_MIN_SPEED, self.AST_MAX_SPEED)
-            y_speed = random.randint(self.AST_MIN_SPEED, self.AST_MAX_SPEED)
-            asteroid_to_add = Asteroid(x, x_speed, y, y_speed, DEF_AST_SIZE)
-            # The while loop makes sure that the asteroid is not on the ship.
-            while asteroid_to_add.has_intersection(self.__ship):
-                x = random.randint(self.__screen_min_x, self.__screen_max_x)
-                y = random.randint(self.__screen_min_y, self.__screen_max_y)
-                asteroid_to_add = Asteroid(x, x_speed, y, y_speed,
-                                           DEF_AST_SIZE)
+            coor = self.__placement.find(self.__random, is_free,
+                                         lambda: circles)
+            if coor is None:
+                break
+            x, y = coor
+            x_speed = self.__random.randint(self.AST_MIN_SPEED,
+                                            self.AST_MAX_SPEED)
+            y_speed = self.__random.randint(self.AST_MIN_SPEED,
+                                            self.AST_MAX_SPEED)
+            asteroid_to_add = self.__new_asteroid(x, x_speed, y, y_speed,
+                                                  DEF_AST_SIZE)
             self.__add_ast_on_screen(asteroid_to_add)
 
+    def __new_asteroid(self, x_coor, x_speed, y_coor, y_speed, size):
+        """
+        Creates a new asteroid object, in the asteroids store if there is one.
+        :return: the new asteroid object
+        """
+        if self.__asteroid_store is not None:
+            return self.__asteroid_store.add_asteroid(x_coor, x_speed, y_coor,
+                                                      y_speed, size)
+        return Asteroid(x_coor, x_speed, y_coor, y_speed, size)
+
+    def __new_torpedo(self, store, x_coor, x_speed, y_coor, y_speed,
+                      direction):
+        """
+        Creates a new torpedo object, in the given store if there is one, or
+        takes one from the torpedos pool.
+        :param store: the torpedos store the torpedo belongs to (or None).
+        :return: the new torpedo object
+        """
+        if store is not None:
+            return store.add_torpedo(x_coor, x_speed, y_coor, y_speed,
+                                     direction)
+        return self.__torpedo_pool.acquire(x_coor, x_speed, y_coor, y_speed,
+                                           direction)
+
     def __add_ast_on_screen(self, ast):
         """
         Adds the given asteroid to the screen.
@@ -95,24 +266,28 @@ class GameRunner:
         :return: None
         """
         self.__screen.register_asteroid(ast, ast.get_size())
-        self.__asteroids.append(ast)
-        self.__screen.draw_asteroid(ast, ast.get_coor()[0], ast.get_coor()[1])
+        self.__asteroids.add(ast)
+        self.__asteroid_grid.insert(ast)
+        x, y = ast.get_coor()
+        self.__screen.draw_asteroid(ast, x, y)
 
     def __add_torpedo(self):
         """
         Adds torpedo to the screen, with the ship's direction and a speed that
         calculates by the ship's speed and direction. The function will also
-        add the torpedo to the torpedos dictionary with a life-time counter
+        add the torpedo to the torpedos list with a life-time counter
         that starts with zero.
         :return: None
         """
-        ship_dir = math.radians(self.__ship.get_direction())
-        x_speed = self.__ship.get_speed()[0] + 2 * math.cos(ship_dir)
-        y_speed = self.__ship.get_speed()[1] + 2 * math.sin(ship_dir)
+        ship_dir = self.__ship.get_direction()
+        ship_x_speed, ship_y_speed = self.__ship.get_speed()
+        x_speed = ship_x_speed + 2 * trig.cos_deg(ship_dir)
+        y_speed = ship_y_speed + 2 * trig.sin_deg(ship_dir)
         x_coor, y_coor = self.__ship.get_coor()
-        tor_to_add = Torpedo(x_coor, x_speed, y_coor, y_speed,
-                             self.__ship.get_direction())
-        self.__torpedos[tor_to_add] = 0
+        tor_to_add = self.__new_torpedo(self.__torpedo_store, x_coor, x_speed,
+                                        y_coor, y_speed,
+                                        self.__ship.get_direction())
+        self.__torpedos.add(tor_to_add, 0)
         self.__screen.register_torpedo(tor_to_add)
         self.__screen.draw_torpedo(tor_to_add, x_coor, y_coor,
                                    self.__ship.get_direction())
@@ -122,19 +297,23 @@ class GameRunner:
         Adds special torpedo - a default amount of regular torpedos, that will
         be around the ship, will move with it, and will turn around themselves.
         The function will add every torpedo to the screen, and to the special
-        torpedos dictionary with it's life-time counter and it's original
-        direction.
+        torpedos list with it's life-time counter, it's original direction
+        and the cos and sin of that direction (so they are calculated once).
         :return: None
         """
+        ship_x_speed, ship_y_speed = self.__ship.get_speed()
+        x_coor, y_coor = self.__ship.get_coor()
         for i in range(self.SPECIAL_TORPEDOS_AMOUNT):
             direction = self.__ship.get_direction() + \
                         (i * (360 / self.SPECIAL_TORPEDOS_AMOUNT))
-            dir_in_rad = math.radians(direction)
-            x_speed = self.__ship.get_speed()[0] + 2 * math.cos(dir_in_rad)
-            y_speed = self.__ship.get_speed()[1] + 2 * math.sin(dir_in_rad)
-            x_coor, y_coor = self.__ship.get_coor()
-            special_tor = Torpedo(x_coor, x_speed, y_coor, y_speed, direction)
-            self.__special_torpedos[special_tor] = [0, dir_in_rad]
+            x_speed = ship_x_speed + 2 * trig.cos_deg(direction)
+            y_speed = ship_y_speed + 2 * trig.sin_deg(direction)
+            special_tor = self.__new_torpedo(self.__special_store, x_coor,
+                                             x_speed, y_coor, y_speed,
+                                             direction)
+            self.__special_torpedos.add(special_tor, [
+                0, direction, trig.cos_deg(direction),
+                trig.sin_deg(direction)])
             self.__screen.register_torpedo(special_tor)
             self.__screen.draw_torpedo(special_tor, x_coor, y_coor, direction)
 
@@ -144,13 +323,7 @@ class GameRunner:
         :param obj: an object of one of the classes (ship, torpedo, asteroid).
         :return: None
         """
-        delta_x = self.__screen_max_x - self.__screen_min_x
-        delta_y = self.__screen_max_y - self.__screen_min_y
-        new_coor_x = (obj.get_speed()[0] + obj.get_coor()[0] -
-                      self.__screen_min_x) % delta_x + self.__screen_min_x
-        new_coor_y = (obj.get_speed()[1] + obj.get_coor()[1] -
-                      self.__screen_min_y) % delta_y + self.__screen_min_y
-        obj.set_coor((new_coor_x, new_coor_y))
+        obj.advance(self.__x_range, self.__y_range)
 
     def __update_ship(self):
         """
@@ -158,9 +331,8 @@ class GameRunner:
         attributes.
         :return: None
         """
-        self.__screen.draw_ship(self.__ship.get_coor()[0],
-                                self.__ship.get_coor()[1],
-                                self.__ship.get_direction())
+        x, y = self.__ship.get_coor()
+        self.__screen.draw_ship(x, y, self.__ship.get_direction())
 
     def __ship_hit_asteroid(self):
         """
@@ -169,15 +341,17 @@ class GameRunner:
         remove the steroid.
         :return: None
         """
-        ast_to_remove = None
-        for ast in self.__asteroids:
-            if ast.has_intersection(self.__ship):
-                ast_to_remove = ast
-                if self.__lives > 1:
-                    self.__screen.show_message(self.COL_MSG[0],
-                                               self.COL_MSG[1])
-                    break
-        if ast_to_remove:
+        hits = [ast for ast in self.__asteroid_grid.find_intersections(
+            self.__ship) if ast not in self.__dead_asteroids]
+        if hits:
+            # The asteroids are taken in the asteroids list's order, so the
+            # result doesn't depend on the order of the spatial hash.
+            hits.sort(key=self.__asteroids.index)
+            if self.__lives > 1:
+                self.__screen.show_message(self.COL_MSG[0], self.COL_MSG[1])
+                ast_to_remove = hits[0]
+            else:
+                ast_to_remove = hits[-1]
             self.__lives -= 1
             self.__screen.remove_life()
             self.__remove_asteroid(ast_to_remove)
@@ -185,30 +359,42 @@ class GameRunner:
     def __ship_teleport(self):
         """
         Teleports the ship to another coordinates on the screen, and make sure
-        it won't be on an asteroid.
-        :return: None
+        it won't be on an asteroid. If no such coordinates were found, the
+        ship stays where it is.
+        :return: True if the ship was teleported, and False otherwise
         """
-        x_coor = random.randint(self.__screen_min_x, self.__screen_max_x)
-        y_coor = random.randint(self.__screen_min_y, self.__screen_max_y)
-        self.__ship.set_coor((x_coor, y_coor))
-        for ast in self.__asteroids:
-            # The while loop makes sure that the ship won't be on an asteroid.
-            while ast.has_intersection(self.__ship):
-                x_coor = random.randint(self.__screen_min_x,
-                                        self.__screen_max_x)
-                y_coor = random.randint(self.__screen_min_y,
-                                        self.__screen_max_y)
-                self.__ship.set_coor((x_coor, y_coor))
+        ship_radius = self.__ship.get_radius()
+
+        def is_free(x, y):
+            return self.__asteroid_grid.is_free(x, y, ship_radius)
+
+        def circles():
+            return [(*ast.get_coor(), ship_radius + ast.get_radius())
+                    for ast in self.__asteroids]
+
+        coor = self.__placement.find(self.__random, is_free, circles)
+        if coor is None:
+            return False
+        self.__ship.set_coor(coor)
+        return True
 
     def __move_asteroids(self):
         """
         Moves all the asteroids on the screen.
         :return: None
         """
+        if self.__asteroid_store is not None:
+            self.__asteroid_store.advance()
+            for ast in self.__asteroids:
+                self.__asteroid_grid.move(ast)
+                x, y = ast.get_coor()
+                self.__screen.draw_asteroid(ast, x, y)
+            return
         for ast in self.__asteroids:
             self.__move_object(ast)
-            self.__screen.draw_asteroid(ast, ast.get_coor()[0],
-                                        ast.get_coor()[1])
+            self.__asteroid_grid.move(ast)
+            x, y = ast.get_coor()
+            self.__screen.draw_asteroid(ast, x, y)
 
     def __change_asteroid(self, tor, ast):
         """
@@ -223,28 +409,23 @@ class GameRunner:
         x, y = ast.get_coor()
         ast_speed = ast.get_speed()
         speed_av = math.sqrt(ast_speed[0] ** 2 + ast_speed[1] ** 2)
-        x_speed_1 = (tor.get_speed()[0] + ast_speed[0]) / speed_av
-        y_speed_1 = (tor.get_speed()[1] + ast_speed[1]) / speed_av
-        x_speed_2 = (tor.get_speed()[0] - ast_speed[0]) / speed_av
-        y_speed_2 = (tor.get_speed()[1] - ast_speed[1]) / speed_av
-        asteroid_1 = Asteroid(x, x_speed_1, y, y_speed_1, new_size)
-        asteroid_2 = Asteroid(x, x_speed_2, y, y_speed_2, new_size)
+        tor_x_speed, tor_y_speed = tor.get_speed()
+        x_speed_1 = (tor_x_speed + ast_speed[0]) / speed_av
+        y_speed_1 = (tor_y_speed + ast_speed[1]) / speed_av
+        x_speed_2 = (tor_x_speed - ast_speed[0]) / speed_av
+        y_speed_2 = (tor_y_speed - ast_speed[1]) / speed_av
+        asteroid_1 = self.__new_asteroid(x, x_speed_1, y, y_speed_1, new_size)
+        asteroid_2 = self.__new_asteroid(x, x_speed_2, y, y_speed_2, new_size)
         self.__add_ast_on_screen(asteroid_1)
         self.__add_ast_on_screen(asteroid_2)
 
     def __remove_asteroid(self, ast):
         """
-        Remove the given asteroid from the screen, and updates the asteroids
-        list.
+        Marks the given asteroid to be removed at the end of the current tick.
         :param ast: the asteroid the user want to remove
         :return: None
         """
-        self.__screen.unregister_asteroid(ast)
-        new_asteroids_lst = []
-        for ast_obj in self.__asteroids:
-            if ast is not ast_obj:
-                new_asteroids_lst.append(ast_obj)
-        self.__asteroids = new_asteroids_lst
+        self.__dead_asteroids[ast] = None
 
     def __move_torpedos(self):
         """
@@ -253,15 +434,23 @@ class GameRunner:
         any other torpedo's counter.
         :return: None
         """
-        for tor in self.__torpedos:
+        if self.__torpedo_store is not None:
+            self.__torpedo_store.advance()
+            for tor in self.__torpedos:
+                x, y = tor.get_coor()
+                self.__screen.draw_torpedo(tor, x, y, tor.get_direction())
+            for tor in self.__torpedo_store.age(self.MAX_LIFE_TIME):
+                self.__remove_torpedo(tor)
+            return
+        for tor, life_time in self.__torpedos.items():
             self.__move_object(tor)
-            self.__screen.draw_torpedo(tor, tor.get_coor()[0],
-                                       tor.get_coor()[1], tor.get_direction())
+            x, y = tor.get_coor()
+            self.__screen.draw_torpedo(tor, x, y, tor.get_direction())
             # Checks if the torpedo's life-time arrived to the maximum.
-            if self.__torpedos[tor] == self.MAX_LIFE_TIME:
+            if life_time == self.MAX_LIFE_TIME:
                 self.__remove_torpedo(tor)
             else:
-                self.__torpedos[tor] += 1
+                self.__torpedos.set(tor, life_time + 1)
 
     def __move_special_torpedos(self):
         """
@@ -271,84 +460,158 @@ class GameRunner:
         life-time, and will add 1 to every other torpedo's life-time counter.
         :return: None
         """
-        for tor in self.__special_torpedos:
-            cur_dir = self.__special_torpedos[tor][1]
-            x_speed = self.__ship.get_speed()[0] + 2 * math.cos(cur_dir)
-            y_speed = self.__ship.get_speed()[1] + 2 * math.sin(cur_dir)
-            tor.set_speed((x_speed, y_speed))
+        if self.__special_store is not None:
+            ship_speed = self.__ship.get_speed()
+            for tor, tor_info in self.__special_torpedos.items():
+                tor.set_speed((ship_speed[0] + 2 * tor_info[2],
+                               ship_speed[1] + 2 * tor_info[3]))
+            self.__special_store.advance()
+            self.__special_store.direction[:len(self.__special_store)] += 5
+            for tor in self.__special_torpedos:
+                x, y = tor.get_coor()
+                self.__screen.draw_torpedo(tor, x, y, tor.get_direction())
+            for tor in self.__special_store.age(self.SPECIAL_MAX_LIFE_TIME):
+                self.__remove_torpedo(tor)
+            return
+        ship_x_speed, ship_y_speed = self.__ship.get_speed()
+        for tor, tor_info in self.__special_torpedos.items():
+            tor.set_speed((ship_x_speed + 2 * tor_info[2],
+                           ship_y_speed + 2 * tor_info[3]))
             self.__move_object(tor)
             new_dir = tor.get_direction() + 5
             tor.set_direction(new_dir)
-            self.__screen.draw_torpedo(tor, tor.get_coor()[0],
-                                       tor.get_coor()[1], tor.get_direction())
+            x, y = tor.get_coor()
+            self.__screen.draw_torpedo(tor, x, y, new_dir)
             # Checks if the torpedo's life-time arrived to the maximum.
-            if self.__special_torpedos[tor][0] == self.SPECIAL_MAX_LIFE_TIME:
+            if tor_info[0] == self.SPECIAL_MAX_LIFE_TIME:
                 self.__remove_torpedo(tor)
             else:
-                self.__special_torpedos[tor][0] += 1
+                tor_info[0] += 1
 
     def __remove_torpedo(self, tor):
         """
-        Remove the torpedo from the screen and from the dictionary it appears
-        in (regular torpedos or special torpedos).
+        Marks the torpedo to be removed at the end of the current tick from
+        the list it appears in (regular torpedos or special torpedos).
         :param tor: the torpedo the user wants to remove.
         :return: None
         """
-        new_torpedos_dic = {}
         # Checks if it is a regular torpedo.
         if tor in self.__torpedos:
-            for tor_obj in self.__torpedos:
-                if tor is not tor_obj:
-                    new_torpedos_dic[tor_obj] = self.__torpedos[tor_obj]
-            self.__torpedos = new_torpedos_dic
+            self.__dead_torpedos[tor] = None
         # checks if it is a special torpedo.
         elif tor in self.__special_torpedos:
-            for tor_obj in self.__special_torpedos:
-                if tor is not tor_obj:
-                    new_torpedos_dic[tor_obj] = self.__special_torpedos[
-                        tor_obj]
-            self.__special_torpedos = new_torpedos_dic
-        self.__screen.unregister_torpedo(tor)
-
-    def __check_torpedo_hit_asteroid(self, torpedos_dic):
-        """
-        checks if one of the torpedos in the given dictionary hit one of the
-        asteroid on the screen. If thir is a torpedo that hit an asteroid, the
-        function will remove the asteroid and the torpedo from the screen, will
-        add new asteroids as needed and will update the score.
-        :param torpedos_dic: the torpedo's dictionary (regular torpedos or
-        special torpedos) the user want to check if one of them hit an
-        asteroid.
-        :return:
-        """
-        tor_to_remove, ast_to_remove = None, None
-        for tor in torpedos_dic:
-            for ast in self.__asteroids:
-                if ast.has_intersection(tor):
-                    tor_to_remove, ast_to_remove = tor, ast
-                    # if the asteroid has the smallest size, we don't need to
-                    # add new asteroids instead.
-                    if ast.get_size() > 1:
-                        self.__change_asteroid(tor_to_remove, ast_to_remove)
-                        break
-        if tor_to_remove:
-            self.__score += self.SCORE[ast_to_remove.get_size()]
-            self.__screen.set_score(self.__score)
-            self.__remove_asteroid(ast_to_remove)
-            self.__remove_torpedo(tor_to_remove)
+            self.__dead_special_torpedos[tor] = None
+
+    def __despawn(self):
+        """
+        Removes all the asteroids and torpedos that were destroyed during the
+        current tick from the screen and from the game.
+        :return: None
+        """
+        for ast in self.__dead_asteroids:
+            self.__screen.unregister_asteroid(ast)
+            self.__asteroid_grid.remove(ast)
+            self.__asteroids.remove(ast)
+            if self.__asteroid_store is not None:
+                self.__asteroid_store.remove(ast)
+        for tor in self.__dead_torpedos:
+            self.__screen.unregister_torpedo(tor)
+            self.__torpedos.remove(tor)
+            if self.__torpedo_store is not None:
+                self.__torpedo_store.remove(tor)
+            else:
+                self.__torpedo_pool.release(tor)
+        for tor in self.__dead_special_torpedos:
+            self.__screen.unregister_torpedo(tor)
+            self.__special_torpedos.remove(tor)
+            if self.__special_store is not None:
+                self.__special_store.remove(tor)
+            else:
+                self.__torpedo_pool.release(tor)
+        self.__dead_asteroids.clear()
+        self.__dead_torpedos.clear()
+        self.__dead_special_torpedos.clear()
+
+    def __find_torpedo_hits(self, torpedos_lst, store):
+        """
+        Finds the asteroids that every torpedo of the list intersects. If the
+        torpedos are kept in a store, all of them are checked against the
+        asteroids store in one find_intersections call, and otherwise every
+        torpedo is checked with the asteroids spatial hash.
+        :param torpedos_lst: a list of torpedos (regular or special)
+        :param store: the store of the torpedos (or None)
+        :return: a list of (torpedo, asteroids list) tuples of the torpedos
+        that intersect asteroids, in the torpedos list's order. The asteroids
+        of every torpedo are in the asteroids list's order.
+        """
+        found = []
+        if store is None:
+            for tor in torpedos_lst:
+                asteroids = self.__asteroid_grid.find_intersections(tor)
+                if asteroids:
+                    asteroids.sort(key=self.__asteroids.index)
+                    found.append((tor, asteroids))
+            return found
+        # The rows of the stores are in the same order as the lists, since
+        # both of them remove an object by moving the last one to its place.
+        ast_store = self.__asteroid_store
+        tor_amount = len(store)
+        ast_amount = len(ast_store)
+        if tor_amount == 0 or ast_amount == 0:
+            return found
+        pairs = find_intersections(
+            store.x[:tor_amount], store.y[:tor_amount],
+            store.radius[:tor_amount], ast_store.x[:ast_amount],
+            ast_store.y[:ast_amount], ast_store.radius[:ast_amount],
+            self.__x_range[1], self.__y_range[1])
+        for i, j in pairs:
+            if not found or found[-1][0] is not store.get_view(i):
+                found.append((store.get_view(i), []))
+            found[-1][1].append(ast_store.get_view(j))
+        return found
 
     def __torpedo_hit_asteroid(self):
         """
-        Checks if one of all the torpedos - regular and special - hit an
-        asteroid.
+        Checks which torpedos - regular and special - hit an asteroid, and
+        handles all the hits of the tick together: removes the torpedos and
+        the asteroids, adds new asteroids as needed and updates the score.
+        Every torpedo can hit one asteroid, and every asteroid can be hit by
+        one torpedo. If a few torpedos hit the same asteroid, the first of
+        them (regular torpedos before special ones, in the lists' order) hits
+        it, and the others continue. A torpedo that hits a few asteroids hits
+        the first of them in the asteroids list.
         :return: None
         """
-        self.__check_torpedo_hit_asteroid(self.__torpedos)
-        self.__check_torpedo_hit_asteroid(self.__special_torpedos)
+        hits = {}
+        for torpedos_lst, store, dead_torpedos in (
+                (self.__torpedos, self.__torpedo_store, self.__dead_torpedos),
+                (self.__special_torpedos, self.__special_store,
+                 self.__dead_special_torpedos)):
+            for tor, asteroids in self.__find_torpedo_hits(torpedos_lst,
+                                                           store):
+                if tor in dead_torpedos:
+                    continue
+                for ast in asteroids:
+                    if ast not in hits and ast not in self.__dead_asteroids:
+                        hits[ast] = tor
+                        dead_torpedos[tor] = None
+                        break
+        if not hits:
+            return
+        for ast, tor in hits.items():
+            self.__score += self.SCORE[ast.get_size()]
+            # if the asteroid has the smallest size, we don't need to add new
+            # asteroids instead.
+            if ast.get_size() > 1:
+                self.__change_asteroid(tor, ast)
+            self.__remove_asteroid(ast)
+        self.__screen.set_score(self.__score)
 
     def __clicks_control(self):
         """
-        Checks which the user pressed and respond for that key.
+        Checks which the user pressed and respond for that key. Every key
+        that was pressed a few times since the last tick is applied that
+        amount of times in this tick (except the teleport).
         Up - accelerate the ship's speed.
         Right - turn the ship right.
         Left - turn the ship left.
@@ -357,25 +620,301 @@ class GameRunner:
         "s" - make a spacial torpedo.
         :return: None
         """
-        if self.__screen.is_up_pressed():
+        up, right, left, teleport, space, special, self.__quit_pressed = \
+            self.__read_keys()
+        for press in range(up):
             self.__ship.speed_up()
-            self.__update_ship()
-        if self.__screen.is_right_pressed():
+        for press in range(right):
             self.__ship.turn_ship_right()
-            self.__update_ship()
-        if self.__screen.is_left_pressed():
+        for press in range(left):
             self.__ship.turn_ship_left()
-            self.__update_ship()
-        if self.__screen.is_teleport_pressed():
+        if teleport:
             self.__ship_teleport()
+        if up or right or left or teleport:
             self.__update_ship()
-        if self.__screen.is_space_pressed() and len(self.__torpedos) < \
-                self.MAX_TORPEDOS:
+        # The torpedos that were destroyed in this tick are not counted.
+        for press in range(space):
+            if len(self.__torpedos) - len(self.__dead_torpedos) >= \
+                    self.MAX_TORPEDOS:
+                break
             self.__add_torpedo()
-        if self.__screen.is_special_pressed() and len(self.__special_torpedos)\
-                < self.MAX_SPECIAL_TORPEDOS * self.SPECIAL_TORPEDOS_AMOUNT:
+        for press in range(special):
+            if len(self.__special_torpedos) - \
+                    len(self.__dead_special_torpedos) >= \
+                    self.MAX_SPECIAL_TORPEDOS * self.SPECIAL_TORPEDOS_AMOUNT:
+                break
             self.__add_special_torpedo()
 
+    def __read_keys(self):
+        """
+        Reads the keys of the current tick, from the replay if there is one
+        and from the screen's input queue otherwise (all the presses since the
+        last tick, in one call), and gives them to the recorder if there is
+        one. The quit key is read from the screen during a replay as well.
+        :return: a tuple of the amount of presses of every key since the last
+        tick, in the order of KEYS (the quit key is 1 if the game should end).
+        """
+        if self.__replay is not None:
+            keys = self.__replay.next_keys()
+            # The player can still end a replayed game from the screen.
+            if self.__screen.should_end():
+                keys = keys[:-1] + (1,)
+        else:
+            keys = self.__screen.drain_keys()
+        if self.__recorder is not None:
+            self.__recorder.record(keys)
+        return keys
+
+    def get_score(self):
+        """
+        :return: the current score of the game.
+        """
+        return self.__score
+
+    def get_use_numpy(self):
+        """
+        :return: True if the game keeps its objects in NumPy entity stores
+        (the use_numpy option), and False otherwise.
+        """
+        return self.__asteroid_store is not None
+
+    def get_lives(self):
+        """
+        :return: the amount of lives the ship has left.
+        """
+        return self.__lives
+
+    def get_ship(self):
+        """
+        :return: the ship object of the game.
+        """
+        return self.__ship
+
+    def get_asteroids(self):
+        """
+        :return: the asteroids of the game (an EntityList that can be iterated
+        over, and shouldn't be changed).
+        """
+        return self.__asteroids
+
+    def get_torpedos(self):
+        """
+        :return: a tuple of the regular torpedos and the special torpedos of
+        the game (EntityLists that can be iterated over, and shouldn't be
+        changed).
+        """
+        return self.__torpedos, self.__special_torpedos
+
+    def get_stores(self):
+        """
+        :return: a tuple of the EntityStores of the asteroids, the torpedos
+        and the special torpedos, in the same order as their lists (or a
+        tuple of Nones if the game doesn't use NumPy).
+        """
+        return self.__asteroid_store, self.__torpedo_store, \
+            self.__special_store
+
+    def get_state_digest(self):
+        """
+        :return: a checksum of the game's state: the ship, the coordinates of
+        all the asteroids and torpedos, the score and the lives.
+        """
+        values = [*self.__ship.get_coor(), *self.__ship.get_speed(),
+                  self.__ship.get_direction(), self.__score, self.__lives]
+        for objects in (self.__asteroids, self.__torpedos,
+                        self.__special_torpedos):
+            for obj in objects:
+                values.extend(obj.get_coor())
+        return zlib.crc32(struct.pack("%dd" % len(values), *values))
+
+    def get_snapshot_size(self):
+        """
+        :return: the amount of bytes a snapshot of the current state takes.
+        """
+        return snapshot_size(len(self.__asteroids), len(self.__torpedos),
+                             len(self.__special_torpedos))
+
+    def snapshot(self):
+        """
+        :return: a bytearray of a snapshot of the game's state (see
+        write_snapshot).
+        """
+        buffer = bytearray(self.get_snapshot_size())
+        self.write_snapshot(buffer)
+        return buffer
+
+    def __copy_store(self, columns, store, arrays):
+        """
+        Copies the rows of an entity store into snapshot columns, without
+        going over the objects.
+        :param arrays: the names of the store's arrays of the columns
+        :return: None
+        """
+        for column, name in zip(columns, arrays):
+            array = getattr(store, name)[:len(store)]
+            column[:] = memoryview(array).cast("B").cast(column.format)
+
+    def write_snapshot(self, buffer, offset=0):
+        """
+        Writes a snapshot of the game's state to a buffer: the score, the
+        lives, the ship, and all the asteroids, torpedos and special torpedos
+        with their life-time counters. The snapshot has a fixed layout - a
+        header (SNAPSHOT_HEADER) and then a column of every attribute of every
+        kind of objects - so it is written straight into the buffer.
+        Should be called between ticks.
+        :param buffer: a writable buffer (like a bytearray, a memoryview or an
+        mmap) with at least get_snapshot_size bytes after the offset.
+        :param offset: the position in the buffer to write the snapshot at.
+        :return: the amount of bytes that were written.
+        """
+        size = self.get_snapshot_size()
+        view = memoryview(buffer)[offset:offset + size]
+        ship = self.__ship
+        SNAPSHOT_HEADER.pack_into(
+            view, 0, SNAPSHOT_MAGIC, self.__score, self.__lives,
+            len(self.__asteroids), len(self.__torpedos),
+            len(self.__special_torpedos), *ship.get_coor(),
+            *ship.get_speed(), ship.get_direction())
+        columns, pos = snapshot_columns(
+            view, SNAPSHOT_HEADER.size, len(self.__asteroids),
+            ASTEROID_COLUMNS)
+        if self.__asteroid_store is not None:
+            self.__copy_store(columns, self.__asteroid_store,
+                              ("x", "y", "x_speed", "y_speed", "size"))
+        else:
+            xs, ys, x_speeds, y_speeds, sizes = columns
+            for i, ast in enumerate(self.__asteroids):
+                xs[i], ys[i] = ast.get_coor()
+                x_speeds[i], y_speeds[i] = ast.get_speed()
+                sizes[i] = ast.get_size()
+
+        columns, pos = snapshot_columns(
+            view, pos, len(self.__torpedos), TORPEDO_COLUMNS)
+        if self.__torpedo_store is not None:
+            self.__copy_store(columns, self.__torpedo_store,
+                              ("x", "y", "x_speed", "y_speed", "direction",
+                               "life"))
+        else:
+            xs, ys, x_speeds, y_speeds, directions, lives = columns
+            for i, (tor, life_time) in enumerate(self.__torpedos.items()):
+                xs[i], ys[i] = tor.get_coor()
+                x_speeds[i], y_speeds[i] = tor.get_speed()
+                directions[i] = tor.get_direction()
+                lives[i] = life_time
+
+        columns, pos = snapshot_columns(
+            view, pos, len(self.__special_torpedos), SPECIAL_COLUMNS)
+        xs, ys, x_speeds, y_speeds, directions, lives, originals, coses, \
+            sins = columns
+        if self.__special_store is not None:
+            self.__copy_store(columns, self.__special_store,
+                              ("x", "y", "x_speed", "y_speed", "direction",
+                               "life"))
+        for i, (tor, tor_info) in enumerate(self.__special_torpedos.items()):
+            if self.__special_store is None:
+                xs[i], ys[i] = tor.get_coor()
+                x_speeds[i], y_speeds[i] = tor.get_speed()
+                directions[i] = tor.get_direction()
+                lives[i] = tor_info[0]
+            originals[i], coses[i], sins[i] = tor_info[1:]
+        return size
+
+    def restore(self, buffer, offset=0):
+        """
+        Replaces the game's state with a snapshot that was written by
+        write_snapshot (of this game or of another one), and registers all
+        the new objects on the screen together. The screen can't get back
+        lives icons, so it shows the smaller amount of lives.
+        :param buffer: a buffer (like bytes, a memoryview or an mmap) with
+        the snapshot.
+        :param offset: the position of the snapshot in the buffer.
+        :return: None
+        :raises ValueError: if the buffer has no snapshot in the offset, or
+        if the snapshot is cut (the game doesn't change then)
+        """
+        view = memoryview(buffer)[offset:]
+        if len(view) < SNAPSHOT_HEADER.size:
+            raise ValueError("The buffer has no game snapshot")
+        magic, score, lives, asteroids_amount, torpedos_amount, \
+            special_amount, x, y, x_speed, y_speed, direction = \
+            SNAPSHOT_HEADER.unpack_from(view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("The buffer has no game snapshot")
+        if min(asteroids_amount, torpedos_amount, special_amount) < 0 or \
+                len(view) < snapshot_size(asteroids_amount, torpedos_amount,
+                                          special_amount):
+            raise ValueError("The game snapshot is cut")
+        self.__clear_objects()
+        self.__ship = Ship(x, x_speed, y, y_speed, direction)
+
+        new_asteroids = []
+        columns, pos = snapshot_columns(
+            view, SNAPSHOT_HEADER.size, asteroids_amount, ASTEROID_COLUMNS)
+        for x, y, x_speed, y_speed, size in zip(*columns):
+            ast = self.__new_asteroid(x, x_speed, y, y_speed, size)
+            self.__asteroids.add(ast)
+            self.__asteroid_grid.insert(ast)
+            new_asteroids.append((ast, size))
+
+        new_torpedos = []
+        store = self.__torpedo_store
+        columns, pos = snapshot_columns(view, pos, torpedos_amount,
+                                        TORPEDO_COLUMNS)
+        for x, y, x_speed, y_speed, direction, life_time in zip(*columns):
+            tor = self.__new_torpedo(store, x, x_speed, y, y_speed,
+                                     direction)
+            self.__torpedos.add(tor, life_time)
+            if store is not None:
+                store.life[len(store) - 1] = life_time
+            new_torpedos.append(tor)
+
+        store = self.__special_store
+        columns, pos = snapshot_columns(view, pos, special_amount,
+                                        SPECIAL_COLUMNS)
+        for x, y, x_speed, y_speed, direction, life_time, original, cos, \
+                sin in zip(*columns):
+            tor = self.__new_torpedo(store, x, x_speed, y, y_speed,
+                                     direction)
+            self.__special_torpedos.add(tor, [life_time, original, cos, sin])
+            if store is not None:
+                store.life[len(store) - 1] = life_time
+            new_torpedos.append(tor)
+
+        self.__screen.register_objects(new_asteroids, new_torpedos)
+        self.__update_ship()
+        for ast in self.__asteroids:
+            self.__screen.draw_asteroid(ast, *ast.get_coor())
+        for tor in new_torpedos:
+            self.__screen.draw_torpedo(tor, *tor.get_coor(),
+                                       tor.get_direction())
+        self.__score = score
+        self.__screen.set_score(score)
+        for life in range(self.__lives - lives):
+            self.__screen.remove_life()
+        self.__lives = lives
+        self.__game_over = False
+
+    def __clear_objects(self):
+        """
+        Removes all the asteroids and torpedos from the screen and from the
+        game.
+        :return: None
+        """
+        torpedos = list(self.__torpedos) + list(self.__special_torpedos)
+        self.__screen.unregister_objects(list(self.__asteroids), torpedos)
+        for ast in self.__asteroids:
+            self.__asteroid_grid.remove(ast)
+        for store in (self.__asteroid_store, self.__torpedo_store,
+                      self.__special_store):
+            if store is not None:
+                store.clear()
+        if self.__torpedo_store is None:
+            for tor in torpedos:
+                self.__torpedo_pool.release(tor)
+        self.__asteroids = EntityList()
+        self.__torpedos = EntityList()
+        self.__special_torpedos = EntityList()
+
     def __end_game(self):
         """
         Checks if the game supposed to end, by checking if their are no more
@@ -385,23 +924,46 @@ class GameRunner:
         """
         # Checks if the player hit all the asteroids and won the game.
         if len(self.__asteroids) == 0:
-            self.__screen.show_message(self.WIN_MSG[0], self.WIN_MSG[1])
-            self.__screen.end_game()
-            sys.exit()
+            self.__finish_game(self.WIN_MSG)
         # Checks if the player want to stop the game.
-        elif self.__screen.should_end():
-            self.__screen.show_message(self.EXIT_MSG[0], self.EXIT_MSG[1])
-            self.__screen.end_game()
-            sys.exit()
+        elif self.__quit_pressed:
+            self.__finish_game(self.EXIT_MSG)
         # Checks if their are no more lives.
         elif self.__lives == 0:
-            self.__screen.show_message(self.GAME_OVER_MSG[0],
-                                       self.GAME_OVER_MSG[1])
-            self.__screen.end_game()
+            self.__finish_game(self.GAME_OVER_MSG)
+
+    def __finish_game(self, msg):
+        """
+        Shows the given message and ends the game. The program exits only if
+        the game runs with the default Screen.
+        :param msg: a tuple of the message's title and text.
+        :return: None
+        """
+        self.__screen.show_message(msg[0], msg[1])
+        self.__screen.end_game()
+        self.__game_over = True
+        if self.__exit_on_end:
             sys.exit()
 
-    def run(self):
-        self._do_loop()
+    def is_game_over(self):
+        """
+        :return: True if the game has ended, and False otherwise.
+        """
+        return self.__game_over
+
+    def run(self, fixed_step=False):
+        """
+        Runs the game.
+        :param fixed_step: if True, the game runs TICK_RATE ticks per second
+        no matter how fast the screen is drawn (see _do_fixed_loop).
+        Otherwise, one tick is run for every frame.
+        :return: None
+        """
+        if fixed_step:
+            self.__next_tick = time.monotonic()
+            self._do_fixed_loop()
+        else:
+            self._do_loop()
         self.__screen.start_screen()
 
     def _do_loop(self):
@@ -409,9 +971,102 @@ class GameRunner:
         self._game_loop()
 
         # Set the timer to go off again
-        self.__screen.update()
+        self.__update_screen()
         self.__screen.ontimer(self._do_loop, 5)
 
+    def _do_fixed_loop(self):
+        """
+        Runs all the game ticks that are due by the monotonic clock, and then
+        draws one frame. If the drawing is slower than the ticks, a few ticks
+        are run before every frame (and the frames between them are skipped)
+        so the game keeps its speed. If more than MAX_CATCH_UP ticks are due,
+        the rest are dropped, so the game slows down instead of freezing.
+        :return: None
+        """
+        tick_time = 1 / self.TICK_RATE
+        now = time.monotonic()
+        ticks = 0
+        while self.__next_tick <= now and ticks < self.MAX_CATCH_UP:
+            self._game_loop()
+            if self.__game_over:
+                return
+            self.__next_tick += tick_time
+            ticks += 1
+        # Checks if the game is too far behind, and drops the ticks left.
+        if self.__next_tick <= now:
+            self.__next_tick = now + tick_time
+
+        if ticks > 0:
+            self.__update_screen()
+        delay = math.ceil((self.__next_tick - time.monotonic()) * 1000)
+        self.__screen.ontimer(self._do_fixed_loop, max(delay, 0))
+
+    def set_profiler(self, profiler):
+        """
+        Sets a profiler that gets the time of every phase of every tick and
+        the tick's counters. Without a profiler (the default) nothing is
+        measured.
+        :param profiler: an instrumentation.TickProfiler object, or None to
+        stop measuring.
+        :return: None
+        """
+        self.__profiler = profiler
+
+    def __update_screen(self):
+        """
+        Updates the screen, and measures the time it took if there is a
+        profiler.
+        :return: None
+        """
+        if self.__profiler is None:
+            self.__screen.update()
+            return
+        start = time.perf_counter_ns()
+        self.__screen.update()
+        self.__profiler.record_phase("screen_update",
+                                     time.perf_counter_ns() - start)
+
+    def __move_ship(self):
+        """
+        Moves the ship and puts it on the screen.
+        :return: None
+        """
+        self.__move_object(self.__ship)
+        self.__update_ship()
+
+    def __profiled_tick_phases(self):
+        """
+        Runs the phases of a tick like _game_loop does, and gives the time of
+        every phase and the tick's counters to the profiler.
+        :return: None
+        """
+        clock = time.perf_counter_ns
+        pairs_tested = self.__asteroid_grid.pairs_tested
+        draw_stats = getattr(self.__screen, "get_draw_stats", None)
+        draw_calls = draw_stats()[0] if draw_stats else 0
+        entities = len(self.__asteroids) + len(self.__torpedos) + \
+            len(self.__special_torpedos) + 1
+        samples = {}
+        for name, phase in (("move_ship", self.__move_ship),
+                            ("move_asteroids", self.__move_asteroids),
+                            ("move_torpedos", self.__move_torpedos),
+                            ("move_special_torpedos",
+                             self.__move_special_torpedos),
+                            ("clicks_control", self.__clicks_control),
+                            ("ship_hit_asteroid", self.__ship_hit_asteroid),
+                            ("torpedo_hit_asteroid",
+                             self.__torpedo_hit_asteroid),
+                            ("despawn", self.__despawn)):
+            start = clock()
+            phase()
+            samples[name] = clock() - start
+        samples["collision_pairs"] = \
+            self.__asteroid_grid.pairs_tested - pairs_tested
+        samples["entities_moved"] = entities
+        samples["draw_calls"] = \
+            draw_stats()[0] - draw_calls if draw_stats else 0
+        self.__profiler.record_tick(samples)
+
     def _game_loop(self):
         """
         Runs the loops by moving the ship, the asteroids and the torpedos,
@@ -420,14 +1075,20 @@ class GameRunner:
         checking if the game supposed to end.
         :return: None
         """
-        self.__move_object(self.__ship)
-        self.__update_ship()
-        self.__move_asteroids()
-        self.__move_torpedos()
-        self.__move_special_torpedos()
-        self.__clicks_control()
-        self.__ship_hit_asteroid()
-        self.__torpedo_hit_asteroid()
+        if self.__profiler is not None:
+            self.__profiled_tick_phases()
+        else:
+            self.__move_ship()
+            self.__move_asteroids()
+            self.__move_torpedos()
+            self.__move_special_torpedos()
+            self.__clicks_control()
+            self.__ship_hit_asteroid()
+            self.__torpedo_hit_asteroid()
+            self.__despawn()
+        if self.__recorder is not None:
+            self.__recorder.record_state(
+                self.get_state_digest() if self.__record_digest else None)
         self.__end_game()
 
 
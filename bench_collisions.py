@@ -0,0 +1,75 @@
+import random
+import sys
+import timeit
+
+from asteroid import Asteroid, find_intersections
+from torpedo import Torpedo
+
+SIZES = ((10, 5), (10, 100), (50, 1000), (50, 10000))
+REPEATS = 5
+# The objects are on a screen of this size, whose edges wrap around.
+SCREEN_SIZE = 1000
+
+
+def make_objects(torpedos_amount, asteroids_amount):
+    """
+    Creates torpedos and asteroids with random coordinates on the screen.
+    :return: a tuple of a list of torpedos and a list of asteroids.
+    """
+    torpedos = [Torpedo(random.uniform(-500, 500), 0,
+                        random.uniform(-500, 500), 0, 0)
+                for _ in range(torpedos_amount)]
+    asteroids = [Asteroid(random.uniform(-500, 500), 0,
+                          random.uniform(-500, 500), 0,
+                          random.randint(1, 3))
+                 for _ in range(asteroids_amount)]
+    return torpedos, asteroids
+
+
+def scalar_path(torpedos, asteroids):
+    """
+    Checks every pair with Asteroid.has_intersection, around the screen's
+    edges.
+    :return: a list of the intersecting (torpedo, asteroid) index pairs.
+    """
+    return [(i, j) for i, tor in enumerate(torpedos)
+            for j, ast in enumerate(asteroids)
+            if ast.has_intersection(tor, SCREEN_SIZE, SCREEN_SIZE)]
+
+
+def batch_path(torpedos, asteroids):
+    """
+    Checks all the pairs with one find_intersections call, around the
+    screen's edges, including the building of the coordinates arrays.
+    :return: a list of the intersecting (torpedo, asteroid) index pairs.
+    """
+    tor_coors = [tor.get_coor() for tor in torpedos]
+    ast_coors = [ast.get_coor() for ast in asteroids]
+    return find_intersections([c[0] for c in tor_coors],
+                              [c[1] for c in tor_coors],
+                              [tor.get_radius() for tor in torpedos],
+                              [c[0] for c in ast_coors],
+                              [c[1] for c in ast_coors],
+                              [ast.get_radius() for ast in asteroids],
+                              SCREEN_SIZE, SCREEN_SIZE)
+
+
+def main():
+    random.seed(0)
+    print("%10s %10s %14s %14s %8s" % ("torpedos", "asteroids", "scalar (ms)",
+                                       "batch (ms)", "speedup"))
+    for torpedos_amount, asteroids_amount in SIZES:
+        torpedos, asteroids = make_objects(torpedos_amount, asteroids_amount)
+        assert scalar_path(torpedos, asteroids) == \
+            batch_path(torpedos, asteroids)
+        scalar = min(timeit.repeat(lambda: scalar_path(torpedos, asteroids),
+                                   number=1, repeat=REPEATS))
+        batch = min(timeit.repeat(lambda: batch_path(torpedos, asteroids),
+                                  number=1, repeat=REPEATS))
+        print("%10d %10d %14.3f %14.3f %7.1fx" % (
+            torpedos_amount, asteroids_amount, scalar * 1000, batch * 1000,
+            scalar / batch))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
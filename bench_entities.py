@@ -0,0 +1,80 @@
+import sys
+import tracemalloc
+
+from asteroid import Asteroid
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from ship import Ship
+from torpedo import Torpedo
+
+ENTITIES_AMOUNT = 10000
+TICKS = 500
+# The entity functions that build a new tuple in every call.
+TUPLE_GETTERS = ("get_coor", "get_speed")
+
+
+def entity_memory(create):
+    """
+    Measures the memory of one entity, by creating a lot of them.
+    :param create: a function that creates a new entity
+    :return: the average amount of bytes every entity takes
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [create() for _ in range(ENTITIES_AMOUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds a pointer to every entity.
+    return (after - before) / len(entities) - 8
+
+
+class BenchGameRunner(GameRunner):
+    """
+    A GameRunner whose ship never runs out of lives.
+    """
+    SHIP_LIFE = 10 ** 9
+
+
+def tick_calls(asteroids_amount, ticks=TICKS):
+    """
+    Counts the calls of the entities' getters that build a new tuple, in
+    the ticks of a headless game that fires a torpedo in every tick.
+    :return: a tuple of the average amount of such calls and of all the
+    entities' functions calls in a tick
+    """
+    screen = HeadlessScreen()
+    runner = BenchGameRunner(asteroids_amount, screen, seed=0)
+    counts = {"tuples": 0, "calls": 0}
+    entity_files = {sys.modules[cls.__module__].__file__
+                    for cls in (Asteroid, Ship, Torpedo)}
+
+    def count(frame, event, arg):
+        if event == "call" and frame.f_code.co_filename in entity_files:
+            counts["calls"] += 1
+            if frame.f_code.co_name in TUPLE_GETTERS:
+                counts["tuples"] += 1
+
+    sys.setprofile(count)
+    try:
+        for tick in range(ticks):
+            screen.press("space")
+            runner._game_loop()
+    finally:
+        sys.setprofile(None)
+    return counts["tuples"] / ticks, counts["calls"] / ticks
+
+
+def main():
+    for name, create in (
+            ("Asteroid", lambda: Asteroid(1.0, 2.0, 3.0, 4.0, 3)),
+            ("Ship", lambda: Ship(1.0, 2.0, 3.0, 4.0, 0)),
+            ("Torpedo", lambda: Torpedo(1.0, 2.0, 3.0, 4.0, 0))):
+        print("%-8s %6.1f bytes per entity" % (name, entity_memory(create)))
+    for asteroids_amount in (5, 50, 500):
+        tuples, calls = tick_calls(asteroids_amount)
+        print("%3d asteroids: %7.1f tuples from getters and %7.1f entity "
+              "calls per tick" % (asteroids_amount, tuples, calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import sys
+import time
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+
+# The rate of a key's auto-repeat (presses per second), and the length of
+# every burst of presses in seconds.
+REPEAT_RATE = 30
+BURST_TIME = 0.5
+KEYS = ("Left", "Up", "space")
+
+
+class BenchGameRunner(GameRunner):
+    """
+    A GameRunner whose ship never runs out of lives.
+    """
+    SHIP_LIFE = 10 ** 9
+
+
+def burst_events(start, seconds):
+    """
+    Makes the key events of bursts of auto-repeat, one key after another,
+    every key released at the end of its burst.
+    :param start: the time of the first event, in nanoseconds
+    :return: a list of (time, key, pressed) tuples, sorted by time
+    """
+    events = []
+    presses = int(BURST_TIME * REPEAT_RATE)
+    burst = 0
+    while (burst + 1) * BURST_TIME <= seconds:
+        key = KEYS[burst % len(KEYS)]
+        burst_start = start + int(burst * BURST_TIME * 10 ** 9)
+        for press in range(presses):
+            events.append((burst_start + press * 10 ** 9 // REPEAT_RATE,
+                           key, True))
+        events.append((burst_start + int(BURST_TIME * 10 ** 9) - 1, key,
+                       False))
+        burst += 1
+    return events
+
+
+def main(asteroids_amount, seconds):
+    """
+    Runs a headless game in real time (TICK_RATE ticks per second) with
+    bursts of key presses, that reach the screen's input queue when their
+    time comes (like the GUI's key callbacks between the ticks), and prints
+    the input latency: the time from every press to the tick that applied
+    it.
+    """
+    screen = HeadlessScreen()
+    runner = BenchGameRunner(asteroids_amount, screen, seed=0)
+    tick_time = 1 / runner.TICK_RATE
+    start = time.perf_counter()
+    events = burst_events(time.perf_counter_ns(), seconds)
+    event = 0
+    ticks = 0
+    while event < len(events):
+        now = time.perf_counter_ns()
+        while event < len(events) and events[event][0] <= now:
+            timestamp, key, pressed = events[event]
+            if pressed:
+                screen.press(key, timestamp)
+            else:
+                screen.release(key, timestamp)
+            event += 1
+        runner._game_loop()
+        ticks += 1
+        delay = start + ticks * tick_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    queue = screen.get_input_queue()
+    stats = queue.get_latency_stats()
+    print("%d asteroids, %d ticks: %d presses, latency p50 %.3f ms, p99 "
+          "%.3f ms, max %.3f ms, %d dropped" % (
+              asteroids_amount, ticks, stats["presses"], stats["p50_ms"],
+              stats["p99_ms"], stats["max_ms"], queue.get_dropped()))
+
+
+if __name__ == "__main__":
+    # Usage: python bench_input.py [asteroids amount] [seconds]
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 3)
@@ -0,0 +1,80 @@
+import random
+import sys
+import time
+import tkinter
+
+from asteroid import Asteroid
+from torpedo import Torpedo
+from screen import Screen
+from canvas_screen import CanvasScreen
+
+ENTITIES_AMOUNTS = (100, 1000, 5000)
+FRAMES = 20
+
+
+def frame_time(screen_class, entities_amount):
+    """
+    Measures the average time of a frame on the given screen class, where
+    every asteroid moves a little, every torpedo spins like a special torpedo
+    and the screen is updated.
+    :param screen_class: Screen or CanvasScreen
+    :param entities_amount: the amount of objects on the screen (a tenth of
+    them are torpedos)
+    :return: the average frame time in seconds
+    """
+    screen = screen_class()
+    torpedos = []
+    for i in range(entities_amount // 10):
+        tor = Torpedo(random.uniform(-500, 500), 0,
+                      random.uniform(-500, 500), 0, random.randint(0, 359))
+        screen.register_torpedo(tor)
+        torpedos.append(tor)
+    asteroids = []
+    for i in range(entities_amount - len(torpedos)):
+        ast = Asteroid(random.uniform(-500, 500), random.uniform(-3, 3),
+                       random.uniform(-500, 500), random.uniform(-3, 3),
+                       random.randint(1, 3))
+        screen.register_asteroid(ast, ast.get_size())
+        asteroids.append(ast)
+    screen.update()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        for ast in asteroids:
+            x, y = ast.get_coor()
+            x_speed, y_speed = ast.get_speed()
+            ast.set_coor((x + x_speed, y + y_speed))
+            screen.draw_asteroid(ast, x + x_speed, y + y_speed)
+        for tor in torpedos:
+            tor.set_direction(tor.get_direction() + 5)
+            x, y = tor.get_coor()
+            screen.draw_torpedo(tor, x, y, tor.get_direction())
+        screen.update()
+        # Makes sure the canvas is really drawn, for both screens.
+        screen._root.update()
+    elapsed = (time.perf_counter() - start) / FRAMES
+    if screen_class is CanvasScreen:
+        hits, misses, memory = screen.get_shape_cache_stats()
+        print("%10s shapes cache: %.1f%% hits, %d rotations, %d bytes" % (
+            "", 100 * hits / max(hits + misses, 1), misses, memory))
+    screen._root.destroy()
+    return elapsed
+
+
+def main():
+    random.seed(0)
+    print("%10s %16s %16s %8s" % ("entities", "turtle (ms)", "canvas (ms)",
+                                  "speedup"))
+    for entities_amount in ENTITIES_AMOUNTS:
+        try:
+            turtle_time = frame_time(Screen, entities_amount)
+            canvas_time = frame_time(CanvasScreen, entities_amount)
+        except tkinter.TclError as error:
+            print("Error: can't open a display (%s)" % error)
+            return 1
+        print("%10d %16.2f %16.2f %7.1fx" % (
+            entities_amount, turtle_time * 1000, canvas_time * 1000,
+            turtle_time / canvas_time))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import math
+import sys
+import timeit
+
+import trig
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+
+TICKS = 2000
+REPEATS = 5
+
+
+class RingGameRunner(GameRunner):
+    """
+    A GameRunner whose special torpedos live for the whole benchmark.
+    """
+    SPECIAL_MAX_LIFE_TIME = 10 ** 9
+
+
+def make_ring_runner():
+    """
+    Creates a headless game with a full ring of special torpedos
+    (MAX_SPECIAL_TORPEDOS * SPECIAL_TORPEDOS_AMOUNT torpedos).
+    :return: the GameRunner object
+    """
+    screen = HeadlessScreen()
+    runner = RingGameRunner(1, screen)
+    for i in range(RingGameRunner.MAX_SPECIAL_TORPEDOS):
+        screen.press("s")
+        runner._GameRunner__clicks_control()
+    return runner
+
+
+def best_time(func):
+    """
+    :return: the best time of one call of func, in seconds.
+    """
+    return min(timeit.repeat(func, number=TICKS, repeat=REPEATS)) / TICKS
+
+
+def main():
+    runner = make_ring_runner()
+    directions = [info[1] for tor, info in
+                  runner._GameRunner__special_torpedos.items()]
+    cached = [(info[2], info[3]) for tor, info in
+              runner._GameRunner__special_torpedos.items()]
+
+    def math_speeds():
+        return [(2 * math.cos(math.radians(d)), 2 * math.sin(math.radians(d)))
+                for d in directions]
+
+    def table_speeds():
+        return [(2 * trig.table_cos_deg(d), 2 * trig.table_sin_deg(d))
+                for d in directions]
+
+    def cached_speeds():
+        return [(2 * c, 2 * s) for c, s in cached]
+
+    print("Speeds of %d special torpedos, per tick:" % len(directions))
+    for name, func in (("math functions", math_speeds),
+                       ("trig tables", table_speeds),
+                       ("cached per torpedo", cached_speeds)):
+        print("  %-20s %8.2f us" % (name, best_time(func) * 10 ** 6))
+
+    print("Full special torpedos move, per tick:")
+    for use_tables in (False, True):
+        trig.use_tables(use_tables)
+        runner = make_ring_runner()
+        move = runner._GameRunner__move_special_torpedos
+        print("  %-20s %8.2f us" % ("trig tables" if use_tables else
+                                    "math functions",
+                                    best_time(move) * 10 ** 6))
+    trig.use_tables(False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from instrumentation import TickProfiler, percentile
+
+SEED = 0
+DEFAULT_TOLERANCE = 0.1
+
+
+class BenchGameRunner(GameRunner):
+    """
+    A GameRunner whose ship never runs out of lives, so a scenario isn't
+    ended by the asteroids.
+    """
+    SHIP_LIFE = 10 ** 9
+
+
+class RingGameRunner(BenchGameRunner):
+    """
+    A BenchGameRunner whose special torpedos live for the whole scenario.
+    """
+    SPECIAL_MAX_LIFE_TIME = 10 ** 9
+
+
+def no_keys(tick, screen):
+    pass
+
+
+def fire_ring(tick, screen):
+    # The game fires special torpedos only while the ring isn't full, so
+    # pressing every tick keeps the ring full.
+    screen.press("s")
+
+
+def constant_fire(tick, screen):
+    screen.press("space")
+
+
+# name: (runner class, asteroids amount, ticks amount, keys function)
+SCENARIOS = {
+    "default": (BenchGameRunner, 5, 5000, no_keys),
+    "asteroids_1k": (BenchGameRunner, 1000, 500, no_keys),
+    "asteroids_10k": (BenchGameRunner, 10000, 50, no_keys),
+    "special_ring": (RingGameRunner, 5, 3000, fire_ring),
+    "constant_fire": (BenchGameRunner, 50, 5000, constant_fire),
+}
+
+
+def run_scenario(name, measure_memory=False, profiler=None):
+    """
+    Runs a scenario headless, and measures the time of every tick.
+    :param name: the name of a scenario in SCENARIOS
+    :param measure_memory: if True, the peak memory is measured with
+    tracemalloc (which makes the ticks slower).
+    :param profiler: a TickProfiler to give to the GameRunner (or None).
+    :return: a tuple of a list of the ticks times in nanoseconds and the peak
+    memory in bytes (or None).
+    """
+    runner_class, asteroids_amount, ticks, keys = SCENARIOS[name]
+    if measure_memory:
+        tracemalloc.start()
+    screen = HeadlessScreen()
+    runner = runner_class(asteroids_amount, screen, seed=SEED)
+    runner.set_profiler(profiler)
+    times = []
+    for tick in range(ticks):
+        keys(tick, screen)
+        start = time.perf_counter_ns()
+        runner._game_loop()
+        times.append(time.perf_counter_ns() - start)
+        if runner.is_game_over():
+            break
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return times, peak
+
+
+def measure(name):
+    """
+    Runs a scenario twice, once for the times and once for the memory.
+    :return: a dictionary of the scenario's results
+    """
+    times, peak = run_scenario(name)
+    peak = run_scenario(name, measure_memory=True)[1]
+    times_sorted = sorted(times)
+    return {
+        "ticks": len(times),
+        "ticks_per_sec": len(times) * 10 ** 9 / sum(times),
+        "p50_ms": percentile(times_sorted, 50) / 10 ** 6,
+        "p99_ms": percentile(times_sorted, 99) / 10 ** 6,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Compares results to a baseline. A scenario regressed if its ticks per
+    second are lower, or its p99 latency or peak memory are higher, by more
+    than the tolerance.
+    :param results: a dictionary of scenarios results
+    :param baseline: a dictionary of scenarios results to compare to
+    :param tolerance: the allowed relative change (0.1 is 10%)
+    :return: a list of messages, one for every regression
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result["ticks_per_sec"] < base["ticks_per_sec"] * (1 - tolerance):
+            regressions.append("%s: ticks/s %.1f -> %.1f" % (
+                name, base["ticks_per_sec"], result["ticks_per_sec"]))
+        for key in ("p99_ms", "peak_memory_kb"):
+            if result[key] > base[key] * (1 + tolerance):
+                regressions.append("%s: %s %.3f -> %.3f" % (
+                    name, key, base[key], result[key]))
+    return regressions
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Runs headless GameRunner benchmark scenarios.")
+    parser.add_argument("-s", "--scenario", action="append",
+                        choices=list(SCENARIOS), dest="scenarios",
+                        help="a scenario to run (can be given a few times, "
+                             "all the scenarios run if none is given)")
+    parser.add_argument("-o", "--output", help="a JSON file to save the "
+                                               "results to")
+    parser.add_argument("-b", "--baseline", help="a JSON file of results to "
+                                                 "compare to")
+    parser.add_argument("-t", "--tolerance", type=float,
+                        default=DEFAULT_TOLERANCE,
+                        help="the allowed relative change from the baseline")
+    parser.add_argument("-p", "--profile", action="store_true",
+                        help="also print the time of every phase of the "
+                             "ticks of every scenario")
+    options = parser.parse_args(args)
+
+    results = {}
+    print("%-15s %8s %12s %10s %10s %12s" % (
+        "scenario", "ticks", "ticks/s", "p50 (ms)", "p99 (ms)", "peak (KB)"))
+    for name in options.scenarios or SCENARIOS:
+        result = measure(name)
+        results[name] = result
+        print("%-15s %8d %12.1f %10.3f %10.3f %12.1f" % (
+            name, result["ticks"], result["ticks_per_sec"], result["p50_ms"],
+            result["p99_ms"], result["peak_memory_kb"]))
+    if options.profile:
+        for name in results:
+            profiler = TickProfiler()
+            run_scenario(name, profiler=profiler)
+            print("\n%s:\n%s" % (name, profiler.report()))
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file),
+                                           options.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
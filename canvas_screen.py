@@ -0,0 +1,216 @@
+import tkinter
+
+from input_queue import SCREEN_KEYS
+from screen import Screen, ShapesMaster, import_gui
+from shape_cache import RotatedShapeCache
+
+
+class CanvasScreen(Screen):
+    """
+    A Screen that draws the game shapes as polygon items of a plain
+    tkinter.Canvas, instead of using turtles. It has the same public methods
+    as Screen, and can be given to a GameRunner instead of it.
+    The drawings are done in update, once per frame, by moving every polygon
+    that changed with canvas.coords. The rotated points of the shapes are
+    taken from a RotatedShapeCache.
+    """
+
+    CANVAS_SIZE = 600
+    LIVES_CANVAS_WIDTH = 150
+    LIVES_CANVAS_HEIGHT = 40
+
+    def __init__(self, torpedo_pool_size=Screen.TORPEDO_POOL_SIZE,
+                 heading_resolution=RotatedShapeCache.RESOLUTION):
+        """
+        This inits the canvas graphics class.
+
+        :param torpedo_pool_size: The amount of torpedo polygons to create in
+            advance. Unregistered torpedo polygons are reused by new torpedos.
+        :type torpedo_pool_size: int
+        :param heading_resolution: The angular resolution (in degrees) of the
+            rotated shapes cache.
+        :type heading_resolution: float
+        """
+        # The methods inherited from Screen use its module's tkinter.
+        import_gui()
+        self._boundKeys = []
+        self._init_keys_values()
+        self._itemShapes = {}
+        self._shapeCache = RotatedShapeCache(heading_resolution)
+        for i in range(ShapesMaster.ASTEROIDS_TYPES):
+            self._shapeCache.add_shape(
+                ShapesMaster.ASTEROID_BASE_SHAPE % (i+1),
+                ShapesMaster.ASTEROIDS_LAYOUTS[i])
+        self._shapeCache.add_shape(ShapesMaster.SHIP_SHAPE,
+                                   ShapesMaster.SHIP_LAYOUT)
+        self._shapeCache.add_shape(ShapesMaster.TORPEDO_SHAPE,
+                                   ShapesMaster.TORPEDO_LAYOUT)
+        self._scale = CanvasScreen.CANVAS_SIZE / \
+            (Screen.SCREEN_MAX_X - Screen.SCREEN_MIN_X)
+        self._init_graphics()
+        self._init_torpedo_pool(torpedo_pool_size)
+        self._bind_keys()
+        self._cv.focus_set()
+
+        self._ship = self._get_ship_obj(self._cv)
+
+    def _init_graphics(self):
+        self._root = tkinter.Tk()
+        self._root.title("Asteroids!")
+        self._cv = tkinter.Canvas(self._root, width=CanvasScreen.CANVAS_SIZE,
+                                  height=CanvasScreen.CANVAS_SIZE, bg="white")
+        self._cv.pack(side=tkinter.LEFT)
+
+        frame = tkinter.Frame(self._root)
+        frame.pack(side=tkinter.RIGHT, fill=tkinter.BOTH)
+
+        # add scores frame
+        self._score_val = tkinter.StringVar()
+        self._score_val.set("0")
+        scoreTitle = tkinter.Label(frame, text="Score")
+        scoreTitle.pack()
+        scoreFrame = tkinter.Frame(frame, height=2, bd=1,
+                                   relief=tkinter.SUNKEN)
+        scoreFrame.pack()
+        score = tkinter.Label(scoreFrame, height=2, width=20,
+                              textvariable=self._score_val, fg="Yellow",
+                              bg="black")
+        score.pack()
+
+        # Add Lives Frame
+        livesTitle = tkinter.Label(frame, text="Extra Lives Remaining")
+        livesTitle.pack()
+        livesFrame = tkinter.Frame(frame, height=30, width=60,
+                                   relief=tkinter.SUNKEN)
+        livesFrame.pack()
+        livesCanvas = tkinter.Canvas(
+            livesFrame, width=CanvasScreen.LIVES_CANVAS_WIDTH,
+            height=CanvasScreen.LIVES_CANVAS_HEIGHT, bg="white")
+        livesCanvas.pack()
+        self._lives = []
+        for x in (-35, 0, 35):
+            life = livesCanvas.create_polygon(self._polygon_coords(
+                ShapesMaster.SHIP_SHAPE,
+                CanvasScreen.LIVES_CANVAS_WIDTH / 2 + x,
+                CanvasScreen.LIVES_CANVAS_HEIGHT / 2, 0),
+                fill="purple", outline="purple")
+            self._lives.append((livesCanvas, life))
+
+        quitButton = tkinter.Button(frame, text="Quit",
+                                    command=self._handle_exit)
+        quitButton.pack()
+
+    def ontimer(self, func, milli):
+        """
+        This method is used to create a repeating action in your game.
+
+        :param func: The function to repeat after **milli** milliseconds have
+            passed
+        :type func: function
+        :param milli: The amount of milliseconds to wait before starting the
+            given function
+        :type milli: int
+        """
+        self._root.after(milli, func)
+
+    def _bind_key(self, key, func):
+        if key not in self._boundKeys:
+            self._cv.bind("<KeyPress-%s>" % key, lambda event: func())
+            self._boundKeys.append(key)
+
+    def _bind_release(self, key):
+        self._cv.bind("<KeyRelease-%s>" % key,
+                      lambda event: self._inputQueue.release(
+                          SCREEN_KEYS[key]))
+
+    def update(self):
+        """
+        This is called to update our game (grphaics-wise).
+
+        .. warning::
+
+            **This method should not be called by you**
+        """
+        self._flush_draws()
+        self._root.update_idletasks()
+
+    def _polygon_coords(self, shape, center_x, center_y, heading):
+        """
+        Calculates the canvas coordinates of a shape, like turtle does: the
+        shape's y axis points to the heading.
+        :param shape: the name of the shape
+        :param center_x: the x canvas coordinate of the shape's center
+        :param center_y: the y canvas coordinate of the shape's center
+        :param heading: the heading in degrees
+        :return: a flat list of the polygon's canvas coordinates
+        """
+        points = self._shapeCache.get(shape, heading)
+        coords = list(points)
+        coords[0::2] = [center_x + x for x in points[0::2]]
+        coords[1::2] = [center_y + y for y in points[1::2]]
+        return coords
+
+    def _new_polygon(self, shape, color):
+        item = self._cv.create_polygon(
+            self._polygon_coords(shape, 0, 0, 0), fill=color, outline=color)
+        self._itemShapes[item] = shape
+        return item
+
+    def _get_ship_obj(self, canvas):
+        return self._new_polygon(ShapesMaster.SHIP_SHAPE, "purple")
+
+    def _get_asteroid_object(self, size):
+        return self._new_polygon(ShapesMaster.ASTEROID_BASE_SHAPE % size,
+                                 "black")
+
+    def _new_torpedo_object(self):
+        return self._new_polygon(ShapesMaster.TORPEDO_SHAPE, "blue")
+
+    def get_shape_cache_stats(self):
+        """
+        :returns: A tuple of the amount of hits, the amount of misses and the
+            memory size in bytes of the rotated shapes cache.
+        """
+        return self._shapeCache.get_stats()
+
+    def _get_torpedo_object(self):
+        if self._freeTorpedos:
+            torpedo = self._freeTorpedos.pop()
+            self._cv.itemconfigure(torpedo, state=tkinter.NORMAL)
+            return torpedo
+        return self._new_torpedo_object()
+
+    def _move_object(self, obj, x, y, heading=None):
+        center_x = (x - Screen.SCREEN_MIN_X) * self._scale
+        center_y = (Screen.SCREEN_MAX_Y - y) * self._scale
+        self._cv.coords(obj, self._polygon_coords(
+            self._itemShapes[obj], center_x, center_y, heading or 0))
+
+    def _remove_object(self, obj):
+        self._pendingDraws.pop(obj, None)
+        self._lastDrawn.pop(obj, None)
+        self._cv.itemconfigure(obj, state=tkinter.HIDDEN)
+
+    def unregister_asteroid(self, asteroid):
+        """
+        This is called to un-register an existing asteroid in our system
+
+        :param asteroid: This is your asteroid object
+        :type asteroid: Asteroid
+        """
+        asteroid_obj = self._asteroids.get(id(asteroid))
+        Screen.unregister_asteroid(self, asteroid)
+        # Asteroid polygons are not reused, so they are deleted.
+        self._cv.delete(asteroid_obj)
+        self._itemShapes.pop(asteroid_obj)
+
+    def remove_life(self):
+        """
+        Remove one icon of life (starts with 3 lives)
+        """
+        canvas, deadship = self._lives.pop()
+        canvas.itemconfigure(deadship, state=tkinter.HIDDEN)
+
+    def _clear_screen(self):
+        self._cv.delete('all')
+        self._itemShapes.clear()
@@ -0,0 +1,76 @@
+class EntityList:
+    """
+    Class of EntityList objects, a container of game objects (asteroids or
+    torpedos) with a value for every object (for example a life-time counter).
+    Adding, removing and finding an object take the same time no matter how
+    many objects are in the list: an object is removed by moving the last
+    object to its place, so the order of the objects may change.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new empty EntityList object.
+        """
+        self.__objects = []
+        self.__values = []
+        self.__indexes = {}
+
+    def __len__(self):
+        return len(self.__objects)
+
+    def __iter__(self):
+        return iter(self.__objects)
+
+    def __contains__(self, obj):
+        return obj in self.__indexes
+
+    def add(self, obj, value=None):
+        """
+        Adds the given object to the end of the list.
+        :param obj: the object to add
+        :param value: the value of the object
+        :return: None
+        """
+        self.__indexes[obj] = len(self.__objects)
+        self.__objects.append(obj)
+        self.__values.append(value)
+
+    def remove(self, obj):
+        """
+        Removes the given object from the list, by moving the last object in
+        the list to its place.
+        :param obj: an object in the list
+        :return: None
+        """
+        index = self.__indexes.pop(obj)
+        last_obj = self.__objects.pop()
+        last_value = self.__values.pop()
+        if last_obj is not obj:
+            self.__objects[index] = last_obj
+            self.__values[index] = last_value
+            self.__indexes[last_obj] = index
+
+    def index(self, obj):
+        """
+        :return: the current index of the given object in the list
+        """
+        return self.__indexes[obj]
+
+    def get(self, obj):
+        """
+        :return: the value of the given object
+        """
+        return self.__values[self.__indexes[obj]]
+
+    def set(self, obj, value):
+        """
+        Changes the value of the given object.
+        :return: None
+        """
+        self.__values[self.__indexes[obj]] = value
+
+    def items(self):
+        """
+        :return: an iterator of (object, value) tuples of all the objects.
+        """
+        return zip(self.__objects, self.__values)
@@ -0,0 +1,249 @@
+import numpy as np
+
+from asteroid import Asteroid
+from torpedo import Torpedo
+
+
+class EntityStore:
+    """
+    Class of EntityStore objects, keeps the attributes of many objects of the
+    same kind (asteroids or torpedos) in contiguous NumPy arrays, so all of
+    them can be moved together in one vectorized step.
+    Every object in the store is represented by a view object (StoreAsteroid
+    or StoreTorpedo) that reads and writes its own row of the arrays, so the
+    rest of the game can use it like a regular Asteroid or Torpedo.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, min_x, max_x, min_y, max_y):
+        """
+        Initialize a new empty EntityStore object.
+        :param min_x: the minimum x coordinate of the screen
+        :param max_x: the maximum x coordinate of the screen
+        :param min_y: the minimum y coordinate of the screen
+        :param max_y: the maximum y coordinate of the screen
+        """
+        self.__min_x = min_x
+        self.__min_y = min_y
+        self.__delta_x = max_x - min_x
+        self.__delta_y = max_y - min_y
+        self.__count = 0
+        self.__views = []
+        self.x = np.zeros(self.INITIAL_CAPACITY)
+        self.y = np.zeros(self.INITIAL_CAPACITY)
+        self.x_speed = np.zeros(self.INITIAL_CAPACITY)
+        self.y_speed = np.zeros(self.INITIAL_CAPACITY)
+        self.direction = np.zeros(self.INITIAL_CAPACITY)
+        self.radius = np.zeros(self.INITIAL_CAPACITY)
+        self.size = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+        self.life = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+
+    def __len__(self):
+        return self.__count
+
+    def __grow(self):
+        """
+        Doubles the capacity of all the arrays.
+        :return: None
+        """
+        capacity = 2 * len(self.x)
+        for name in ("x", "y", "x_speed", "y_speed", "direction", "radius",
+                     "size", "life"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.__count] = old[:self.__count]
+            setattr(self, name, new)
+
+    def __add_row(self, view, x, x_speed, y, y_speed, direction, radius,
+                  size):
+        """
+        Adds a new row to the arrays and connects it to the given view.
+        :return: the given view
+        """
+        if self.__count == len(self.x):
+            self.__grow()
+        i = self.__count
+        self.x[i], self.y[i] = x, y
+        self.x_speed[i], self.y_speed[i] = x_speed, y_speed
+        self.direction[i] = direction
+        self.radius[i] = radius
+        self.size[i] = size
+        self.life[i] = 0
+        view._store, view._index = self, i
+        self.__views.append(view)
+        self.__count += 1
+        return view
+
+    def add_asteroid(self, x_coor, x_speed, y_coor, y_speed, size):
+        """
+        Adds a new asteroid to the store.
+        :return: the StoreAsteroid view of the new asteroid.
+        """
+        return self.__add_row(StoreAsteroid(), x_coor, x_speed, y_coor,
+                              y_speed, 0, size * 10 - 5, size)
+
+    def add_torpedo(self, x_coor, x_speed, y_coor, y_speed, direction):
+        """
+        Adds a new torpedo to the store.
+        :return: the StoreTorpedo view of the new torpedo.
+        """
+        return self.__add_row(StoreTorpedo(), x_coor, x_speed, y_coor,
+                              y_speed, direction, Torpedo.TORPEDO_RADIUS, 0)
+
+    def remove(self, view):
+        """
+        Removes the given view's row from the store, by moving the last row to
+        its place.
+        :param view: a view that belongs to this store.
+        :return: None
+        """
+        i = view._index
+        last = self.__count - 1
+        if i != last:
+            for arr in (self.x, self.y, self.x_speed, self.y_speed,
+                        self.direction, self.radius, self.size, self.life):
+                arr[i] = arr[last]
+            moved = self.__views[last]
+            moved._index = i
+            self.__views[i] = moved
+        self.__views.pop()
+        self.__count -= 1
+        view._store = None
+
+    def advance(self):
+        """
+        Moves all the objects in the store by their speed, and wraps them
+        around the screen's edges like GameRunner does.
+        :return: None
+        """
+        n = self.__count
+        x, y = self.x[:n], self.y[:n]
+        x += self.x_speed[:n]
+        x -= self.__min_x
+        np.mod(x, self.__delta_x, out=x)
+        x += self.__min_x
+        y += self.y_speed[:n]
+        y -= self.__min_y
+        np.mod(y, self.__delta_y, out=y)
+        y += self.__min_y
+
+    def age(self, max_life):
+        """
+        Adds 1 to the life-time counter of every object, except the objects
+        whose counter already arrived to the given maximum.
+        :param max_life: the maximum life-time.
+        :return: a list of the views whose life-time arrived to the maximum.
+        """
+        n = self.__count
+        life = self.life[:n]
+        expired = np.flatnonzero(life >= max_life)
+        life += 1
+        return [self.__views[i] for i in expired]
+
+    def clear(self):
+        """
+        Removes all the objects from the store.
+        :return: None
+        """
+        for view in self.__views:
+            view._store = None
+        self.__views.clear()
+        self.__count = 0
+
+    def get_view(self, index):
+        """
+        :return: the view of the given row.
+        """
+        return self.__views[index]
+
+    def views(self):
+        """
+        :return: a list of all the views in the store.
+        """
+        return list(self.__views)
+
+
+class StoreAsteroid(Asteroid):
+    """
+    An Asteroid whose attributes are kept in a row of an EntityStore.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self):
+        # The attributes are set by the store that creates the view.
+        self._store = None
+        self._index = -1
+
+    def get_coor(self):
+        i = self._index
+        return float(self._store.x[i]), float(self._store.y[i])
+
+    def set_coor(self, new_coor):
+        i = self._index
+        self._store.x[i], self._store.y[i] = new_coor
+
+    def advance(self, x_range, y_range):
+        i = self._index
+        min_x, delta_x = x_range
+        min_y, delta_y = y_range
+        store = self._store
+        store.x[i] = (store.x_speed[i] + store.x[i] - min_x) % delta_x + min_x
+        store.y[i] = (store.y_speed[i] + store.y[i] - min_y) % delta_y + min_y
+
+    def get_speed(self):
+        i = self._index
+        return float(self._store.x_speed[i]), float(self._store.y_speed[i])
+
+    def get_size(self):
+        return int(self._store.size[self._index])
+
+    def get_radius(self):
+        return float(self._store.radius[self._index])
+
+
+class StoreTorpedo(Torpedo):
+    """
+    A Torpedo whose attributes are kept in a row of an EntityStore.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self):
+        # The attributes are set by the store that creates the view.
+        self._store = None
+        self._index = -1
+
+    def get_coor(self):
+        i = self._index
+        return float(self._store.x[i]), float(self._store.y[i])
+
+    def set_coor(self, new_coor):
+        i = self._index
+        self._store.x[i], self._store.y[i] = new_coor
+
+    def advance(self, x_range, y_range):
+        i = self._index
+        min_x, delta_x = x_range
+        min_y, delta_y = y_range
+        store = self._store
+        store.x[i] = (store.x_speed[i] + store.x[i] - min_x) % delta_x + min_x
+        store.y[i] = (store.y_speed[i] + store.y[i] - min_y) % delta_y + min_y
+
+    def set_speed(self, new_speed):
+        i = self._index
+        self._store.x_speed[i], self._store.y_speed[i] = new_speed
+
+    def set_direction(self, new_dir):
+        self._store.direction[self._index] = new_dir
+
+    def get_speed(self):
+        i = self._index
+        return float(self._store.x_speed[i]), float(self._store.y_speed[i])
+
+    def get_direction(self):
+        return float(self._store.direction[self._index])
+
+    def get_radius(self):
+        return float(self._store.radius[self._index])
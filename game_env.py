@@ -0,0 +1,158 @@
+import numpy as np
+
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM
+from headless_screen import HeadlessScreen
+
+# The keys an action is made of, in the order of their bits in the action
+# (the same order as GameRunner.KEYS, without the quit key).
+ACTION_KEYS = GameRunner.KEYS[:-1]
+ACTIONS_AMOUNT = 2 ** len(ACTION_KEYS)
+# The keys tuple (in the order of GameRunner.KEYS) of every action.
+ACTION_TABLE = tuple(tuple((action >> bit) & 1
+                           for bit in range(len(ACTION_KEYS))) + (0,)
+                     for action in range(ACTIONS_AMOUNT))
+
+# The columns of every row of the observation. The last column is the
+# direction of the ship and of the torpedos, and the size of the asteroids.
+# The "present" column is 0 in the padding rows.
+OBS_COLUMNS = ("present", "x", "y", "x_speed", "y_speed", "direction_size")
+
+
+class AsteroidsEnv:
+    """
+    Class of AsteroidsEnv objects, a Gym-style environment of a headless game:
+    the game is stepped from outside, one tick for every action, instead of
+    by the screen's timer.
+    The observation is a NumPy array with a row for the ship, MAX_ASTEROIDS
+    rows for the asteroids and MAX_TORPEDOS rows for the torpedos (regular and
+    then special), with the columns in OBS_COLUMNS. The array is created once
+    and is filled again in every step, so it should be copied if it needs to
+    be kept.
+    The game keeps its objects in NumPy entity stores, so every step copies
+    the stores' columns into the observation instead of going over the
+    objects.
+    """
+
+    MAX_ASTEROIDS = 64
+    MAX_TORPEDOS = GameRunner.TORPEDO_POOL_SIZE
+
+    def __init__(self, asteroids_amount=DEFAULT_ASTEROIDS_NUM,
+                 runner_class=GameRunner, max_asteroids=MAX_ASTEROIDS,
+                 max_torpedos=MAX_TORPEDOS):
+        """
+        Initialize a new AsteroidsEnv object. reset should be called before
+        the first step.
+        :param asteroids_amount: the amount of asteroids every game starts
+        with.
+        :param runner_class: the GameRunner class (or a subclass of it) of
+        the games.
+        :param max_asteroids: the amount of asteroids rows in the observation.
+        Asteroids above this amount are not observed.
+        :param max_torpedos: the amount of torpedos rows in the observation.
+        """
+        self.__asteroids_amount = asteroids_amount
+        self.__runner_class = runner_class
+        self.__observation = np.zeros((1 + max_asteroids + max_torpedos,
+                                       len(OBS_COLUMNS)), dtype=np.float32)
+        self.__max_asteroids = max_asteroids
+        self.__max_torpedos = max_torpedos
+        # The columns of the asteroids rows and of the torpedos rows, as
+        # views of the observation that are created once.
+        self.__asteroid_columns = self.__observation[
+            1:1 + max_asteroids].T
+        self.__torpedo_columns = self.__observation[1 + max_asteroids:].T
+        self.__keys = ACTION_TABLE[0]
+        self.__runner = None
+        self.__score = 0
+
+    def reset(self, seed=None):
+        """
+        Starts a new game.
+        :param seed: the seed of the new game (a random game if None).
+        :return: the first observation of the game
+        """
+        self.__runner = self.__runner_class(self.__asteroids_amount,
+                                            HeadlessScreen(), use_numpy=True,
+                                            seed=seed, replay=self)
+        self.__score = 0
+        return self.__observe()
+
+    def step(self, action):
+        """
+        Runs one tick of the game with the given action.
+        :param action: an integer between 0 and ACTIONS_AMOUNT - 1, whose
+        bits are the keys in ACTION_KEYS (bit 0 is "up", bit 1 is "right" and
+        so on). Every pressed key does what it does in the game's
+        __clicks_control.
+        :return: a tuple of the observation, the reward (the score earned in
+        this tick), True if the game has ended and a dictionary of the score
+        and the lives (a new dictionary in every step).
+        """
+        if self.__runner is None or self.__runner.is_game_over():
+            raise RuntimeError("reset must be called before step")
+        self.__keys = ACTION_TABLE[action]
+        self.__runner._game_loop()
+        score = self.__runner.get_score()
+        reward = score - self.__score
+        self.__score = score
+        info = {"score": score, "lives": self.__runner.get_lives()}
+        return self.__observe(), reward, self.__runner.is_game_over(), info
+
+    def next_keys(self):
+        """
+        Gives the keys of the current action to the game, like an InputReplay.
+        :return: a tuple of the keys states, in the order of GameRunner.KEYS
+        """
+        return self.__keys
+
+    def get_runner(self):
+        """
+        :return: the GameRunner object of the current game (or None before
+        the first reset).
+        """
+        return self.__runner
+
+    def __observe(self):
+        """
+        Fills the observation array with the current state of the game.
+        :return: the observation array
+        """
+        obs = self.__observation
+        ship = self.__runner.get_ship()
+        obs[0, 0] = 1
+        obs[0, 1], obs[0, 2] = ship.get_coor()
+        obs[0, 3], obs[0, 4] = ship.get_speed()
+        obs[0, 5] = ship.get_direction()
+
+        asteroids, torpedos, special = self.__runner.get_stores()
+        amount = min(len(asteroids), self.__max_asteroids)
+        self.__copy_store(self.__asteroid_columns, 0, asteroids, amount,
+                          asteroids.size)
+        self.__asteroid_columns[:, amount:].fill(0)
+
+        amount = min(len(torpedos), self.__max_torpedos)
+        self.__copy_store(self.__torpedo_columns, 0, torpedos, amount,
+                          torpedos.direction)
+        start = amount
+        amount = min(len(special), self.__max_torpedos - start)
+        self.__copy_store(self.__torpedo_columns, start, special, amount,
+                          special.direction)
+        self.__torpedo_columns[:, start + amount:].fill(0)
+        return obs
+
+    def __copy_store(self, columns, start, store, amount, last):
+        """
+        Copies the first rows of an entity store into observation rows.
+        :param columns: the columns of the observation rows
+        :param start: the first row to copy to
+        :param amount: the amount of rows to copy
+        :param last: the store's array of the last column
+        :return: None
+        """
+        end = start + amount
+        columns[0, start:end] = 1
+        columns[1, start:end] = store.x[:amount]
+        columns[2, start:end] = store.y[:amount]
+        columns[3, start:end] = store.x_speed[:amount]
+        columns[4, start:end] = store.y_speed[:amount]
+        columns[5, start:end] = last[:amount]
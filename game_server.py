@@ -0,0 +1,448 @@
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sys
+import tempfile
+import time
+
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM
+from headless_screen import HeadlessScreen
+
+# The keys a remote player can press (the quit key ends the game for
+# everyone, so it is not allowed).
+REMOTE_KEYS = GameRunner.KEYS[:-1]
+# The digits after the point of the coordinates that are sent.
+COOR_DIGITS = 1
+
+
+def apply_delta(base, message):
+    """
+    Builds a state from a base state and a message of the server.
+    :param base: the objects of the state the message's delta is from (a
+    dictionary of every object's id and its [kind, x, y, size] list), or None
+    if the message has the full state
+    :param message: the message's dictionary
+    :return: the objects of the new state
+    """
+    objects = dict(base) if base is not None else {}
+    for obj_id in message["removed"]:
+        del objects[obj_id]
+    for obj_id, kind, x, y, size in message["spawned"]:
+        objects[obj_id] = [kind, x, y, size]
+    for obj_id, x, y in message["moved"]:
+        objects[obj_id] = [objects[obj_id][0], x, y, objects[obj_id][3]]
+    return objects
+
+
+class GameServer:
+    """
+    Class of GameServer objects, runs one headless game and shares it with
+    remote players and spectators over a Unix or a TCP socket.
+    Every message is a line of JSON. After every tick the server sends every
+    client the score, the lives, the ship, and the objects (asteroids,
+    torpedos and special torpedos, each with an id) that were spawned, moved
+    or removed since the last tick the client acknowledged. A client that
+    didn't acknowledge any tick in the last HISTORY ticks gets the full
+    state. Clients that acknowledged the same tick get the same message,
+    which is encoded once.
+    A client sends {"ack": tick} after it applies a tick, and
+    {"keys": ["up", "space", ...]} to press keys. The keys of all the players
+    are pressed together in the next tick.
+    The tick never waits for the clients: a client whose socket buffer is
+    full skips ticks, and gets their changes in its next message.
+    When the game ends a new one starts, with the next seed.
+    """
+
+    HISTORY = 64
+    MAX_CLIENT_BUFFER = 2 ** 16
+    # The amount of the latest tick times that are kept.
+    TICK_TIMES = 4096
+
+    def __init__(self, asteroids_amount=DEFAULT_ASTEROIDS_NUM, seed=0,
+                 runner_class=GameRunner, tick_rate=GameRunner.TICK_RATE):
+        """
+        Initialize a new GameServer object.
+        :param asteroids_amount: the amount of asteroids every game starts
+        with
+        :param seed: the seed of the first game
+        :param runner_class: the GameRunner class (or a subclass of it) of
+        the games
+        :param tick_rate: the amount of ticks per second
+        """
+        self.__asteroids_amount = asteroids_amount
+        self.__seed = seed
+        self.__runner_class = runner_class
+        self.__tick_time = 1 / tick_rate
+        self.__runner = None
+        self.__tick = 0
+        self.__next_id = 0
+        self.__ids = {}
+        self.__history = {}
+        self.__keys = [0] * len(GameRunner.KEYS)
+        # Every client's writer and the last tick it acknowledged.
+        self.__clients = {}
+        self.__tick_times = collections.deque(maxlen=self.TICK_TIMES)
+        self.__new_game()
+
+    def __new_game(self):
+        """
+        Starts a new game, whose keys are given by the server.
+        :return: None
+        """
+        self.__runner = self.__runner_class(self.__asteroids_amount,
+                                            HeadlessScreen(),
+                                            seed=self.__seed, replay=self)
+        self.__seed += 1
+        # The objects of the old game are not in the new one, so the clients
+        # get the full state.
+        self.__history.clear()
+
+    def next_keys(self):
+        """
+        Gives the keys the players pressed since the last tick to the game,
+        like an InputReplay.
+        :return: a tuple of the keys states, in the order of GameRunner.KEYS
+        """
+        keys = tuple(self.__keys)
+        self.__keys = [0] * len(GameRunner.KEYS)
+        return keys
+
+    def get_runner(self):
+        """
+        :return: the GameRunner object of the current game.
+        """
+        return self.__runner
+
+    def get_tick(self):
+        """
+        :return: the amount of ticks the server has run.
+        """
+        return self.__tick
+
+    def get_state(self, tick):
+        """
+        :return: the objects of the given tick's state (like apply_delta
+        returns), if it is in the history.
+        """
+        return self.__history[tick][1]
+
+    def get_clients_amount(self):
+        return len(self.__clients)
+
+    def get_tick_times(self):
+        """
+        :return: a deque of the time every one of the latest TICK_TIMES
+        ticks took, with the messages to the clients, in seconds.
+        """
+        return self.__tick_times
+
+    def __capture(self):
+        """
+        Takes the current state of the game, and gives an id to every object.
+        A torpedo object that was removed and used again (by the torpedos
+        pool) gets a new id, because its life-time counter is restarted.
+        :return: a dictionary of every object's id and its (kind, x, y, size)
+        tuple
+        """
+        torpedos, special_torpedos = self.__runner.get_torpedos()
+        ids = {}
+        objects = {}
+        for kind, items in (
+                ("a", ((ast, 0) for ast in self.__runner.get_asteroids())),
+                ("t", torpedos.items()),
+                ("s", ((tor, info[0])
+                       for tor, info in special_torpedos.items()))):
+            for obj, life_time in items:
+                old = self.__ids.get(obj)
+                if old is None or life_time < old[1]:
+                    obj_id = self.__next_id
+                    self.__next_id += 1
+                else:
+                    obj_id = old[0]
+                ids[obj] = (obj_id, life_time)
+                x, y = obj.get_coor()
+                objects[obj_id] = (kind, round(x, COOR_DIGITS),
+                                   round(y, COOR_DIGITS),
+                                   obj.get_size() if kind == "a" else 0)
+        self.__ids = ids
+        return objects
+
+    def __encode(self, base, objects):
+        """
+        Encodes the message of the current tick for the clients that
+        acknowledged the given tick.
+        :param base: the acknowledged tick, or None for the full state
+        :param objects: the objects of the current tick
+        :return: the message's line, in bytes
+        """
+        ship = self.__runner.get_ship()
+        x, y = ship.get_coor()
+        message = {"tick": self.__tick, "base": base,
+                   "score": self.__runner.get_score(),
+                   "lives": self.__runner.get_lives(),
+                   "ship": [round(x, COOR_DIGITS), round(y, COOR_DIGITS),
+                            ship.get_direction()]}
+        base_objects = self.__history[base][1] if base is not None else {}
+        spawned, moved = [], []
+        for obj_id, (kind, x, y, size) in objects.items():
+            old = base_objects.get(obj_id)
+            if old is None:
+                spawned.append([obj_id, kind, x, y, size])
+            elif old[1] != x or old[2] != y:
+                moved.append([obj_id, x, y])
+        message["spawned"] = spawned
+        message["moved"] = moved
+        message["removed"] = [obj_id for obj_id in base_objects
+                              if obj_id not in objects]
+        return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+    def __broadcast(self, objects):
+        """
+        Sends the current tick to all the clients.
+        :return: None
+        """
+        messages = {}
+        for writer, acked in list(self.__clients.items()):
+            transport = writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > self.MAX_CLIENT_BUFFER:
+                continue
+            base = acked if acked in self.__history else None
+            message = messages.get(base)
+            if message is None:
+                message = messages[base] = self.__encode(base, objects)
+            writer.write(message)
+
+    def step(self):
+        """
+        Runs one tick of the game and sends it to the clients.
+        :return: None
+        """
+        start = time.perf_counter()
+        self.__runner._game_loop()
+        if self.__runner.is_game_over():
+            self.__new_game()
+        self.__tick += 1
+        objects = self.__capture()
+        self.__broadcast(objects)
+        self.__history[self.__tick] = (self.__tick, objects)
+        self.__history.pop(self.__tick - self.HISTORY, None)
+        self.__tick_times.append(time.perf_counter() - start)
+
+    async def run(self, ticks=None):
+        """
+        Runs the game's ticks in the server's rate.
+        :param ticks: the amount of ticks to run (forever if None)
+        :return: None
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while ticks is None or ticks > 0:
+            self.step()
+            if ticks is not None:
+                ticks -= 1
+            next_tick += self.__tick_time
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    async def handle_client(self, reader, writer):
+        """
+        Reads the messages of a client until it disconnects. A client that
+        sends a line longer than the reader's limit is disconnected.
+        :param reader: the client's asyncio StreamReader
+        :param writer: the client's asyncio StreamWriter
+        :return: None
+        """
+        self.__clients[writer] = None
+        try:
+            async for line in reader:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                # A line that isn't a message (like [] or 1), or whose keys
+                # aren't a list, is skipped.
+                if not isinstance(message, dict):
+                    continue
+                keys = message.get("keys", ())
+                if not isinstance(keys, (list, tuple)):
+                    continue
+                acked = message.get("ack")
+                if isinstance(acked, int) and \
+                        (self.__clients[writer] is None or
+                         acked > self.__clients[writer]):
+                    self.__clients[writer] = acked
+                for key in keys:
+                    if key in REMOTE_KEYS:
+                        self.__keys[GameRunner.KEYS.index(key)] = 1
+        except (ConnectionError, ValueError):
+            # The reader raises ValueError for a line that is too long.
+            pass
+        finally:
+            del self.__clients[writer]
+            writer.close()
+
+    async def start_unix(self, path):
+        """
+        Starts accepting clients on a Unix socket.
+        :return: the asyncio Server object
+        """
+        return await asyncio.start_unix_server(self.handle_client, path)
+
+    async def start_tcp(self, host="127.0.0.1", port=0):
+        """
+        Starts accepting clients on a TCP socket.
+        :return: the asyncio Server object
+        """
+        return await asyncio.start_server(self.handle_client, host, port)
+
+
+class GameClient:
+    """
+    Class of GameClient objects, a remote player or spectator of a
+    GameServer. It keeps the states of the last ticks it got, so it can apply
+    a delta from any tick it acknowledged.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Initialize a new GameClient object.
+        :param reader: the asyncio StreamReader of the connection
+        :param writer: the asyncio StreamWriter of the connection
+        """
+        self.__reader = reader
+        self.__writer = writer
+        self.__states = {}
+        self.tick = None
+        self.message = None
+        self.objects = {}
+
+    @staticmethod
+    async def connect_unix(path):
+        """
+        :return: a new GameClient connected to the given Unix socket.
+        """
+        return GameClient(*await asyncio.open_unix_connection(path))
+
+    @staticmethod
+    async def connect_tcp(host, port):
+        """
+        :return: a new GameClient connected to the given TCP socket.
+        """
+        return GameClient(*await asyncio.open_connection(host, port))
+
+    def press(self, *keys):
+        """
+        Presses keys in the server's next tick.
+        :param keys: names from REMOTE_KEYS
+        :return: None
+        """
+        self.__writer.write((json.dumps({"keys": keys}) + "\n").encode())
+
+    async def receive(self):
+        """
+        Waits for the next message of the server, applies it and
+        acknowledges its tick.
+        :return: False if the server closed the connection, and True
+        otherwise.
+        """
+        line = await self.__reader.readline()
+        if not line:
+            return False
+        message = json.loads(line)
+        base = message["base"]
+        self.objects = apply_delta(
+            self.__states[base] if base is not None else None, message)
+        self.tick = message["tick"]
+        self.message = message
+        self.__states[self.tick] = self.objects
+        self.__states.pop(self.tick - GameServer.HISTORY, None)
+        self.__writer.write((json.dumps({"ack": self.tick}) +
+                             "\n").encode())
+        return True
+
+    def close(self):
+        self.__writer.close()
+
+
+async def load_test(clients_amount, ticks, asteroids_amount, players=1):
+    """
+    Runs a server on a temporary Unix socket with many clients (a few of
+    them pressing keys), and checks that the clients' states are the same as
+    the server's.
+    :return: a tuple of the average and the maximum tick times (in seconds),
+    and the amount of clients whose last state is different from the
+    server's
+    """
+    server = GameServer(asteroids_amount)
+    path = os.path.join(tempfile.mkdtemp(), "game.sock")
+    listener = await server.start_unix(path)
+    clients = [await GameClient.connect_unix(path)
+               for i in range(clients_amount)]
+
+    async def follow(client, index):
+        while await client.receive():
+            if index < players and client.tick % 10 == 0:
+                client.press("space", "left")
+
+    tasks = [asyncio.ensure_future(follow(client, i))
+             for i, client in enumerate(clients)]
+    while server.get_clients_amount() < clients_amount:
+        await asyncio.sleep(0.01)
+    await server.run(ticks)
+    await asyncio.sleep(0.2)
+    different = sum(client.tick is None or
+                    client.objects != {
+                        obj_id: list(obj) for obj_id, obj in
+                        server.get_state(client.tick).items()}
+                    for client in clients)
+    for client in clients:
+        client.close()
+    listener.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    os.remove(path)
+    times = server.get_tick_times()
+    return sum(times) / len(times), max(times), different
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Runs a headless game server, or a load test of it.")
+    parser.add_argument("-a", "--asteroids", type=int,
+                        default=DEFAULT_ASTEROIDS_NUM)
+    parser.add_argument("-u", "--unix", help="a Unix socket path to listen "
+                                             "on (TCP on loopback if not "
+                                             "given)")
+    parser.add_argument("-p", "--port", type=int, default=0)
+    parser.add_argument("-l", "--load-test", type=int, metavar="CLIENTS",
+                        help="run a load test with the given amount of "
+                             "clients instead of serving")
+    parser.add_argument("-t", "--ticks", type=int, default=1000,
+                        help="the amount of ticks of the load test")
+    options = parser.parse_args(args)
+
+    if options.load_test is not None:
+        mean, worst, different = asyncio.run(load_test(
+            options.load_test, options.ticks, options.asteroids))
+        print("%d clients: tick %.3f ms on average, %.3f ms at most, %d "
+              "clients out of sync" % (options.load_test, mean * 1000,
+                                       worst * 1000, different))
+        return 0 if different == 0 else 1
+
+    async def serve():
+        server = GameServer(options.asteroids)
+        if options.unix:
+            listener = await server.start_unix(options.unix)
+        else:
+            listener = await server.start_tcp(port=options.port)
+        print("Listening on %s" % (listener.sockets[0].getsockname(),))
+        await server.run()
+
+    asyncio.run(serve())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
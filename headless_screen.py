@@ -0,0 +1,184 @@
+import sys
+import time
+
+from input_queue import QueuedInput, SCREEN_KEYS
+
+
+class HeadlessScreen(QueuedInput):
+    """
+    Class of HeadlessScreen objects, a display that draws nothing.
+    It has every method that GameRunner calls on the Screen class, so it can
+    be given to a GameRunner instead of a real Screen, and the game can run
+    without tkinter and turtle (for example on a server, or faster than the
+    GUI allows).
+    Key presses can be simulated with the press function.
+    """
+
+    SCREEN_MIN_X = -500
+    SCREEN_MIN_Y = -500
+    SCREEN_MAX_X = 500
+    SCREEN_MAX_Y = 500
+
+    def __init__(self):
+        """
+        Initialize a new HeadlessScreen object.
+        """
+        self._init_input()
+        self._lives = 3
+        self._score = 0
+        self._asteroids = set()
+        self._torpedos = set()
+        self._messages = []
+        self._drawCalls = 0
+
+    def press(self, key, timestamp=None):
+        """
+        Simulates a press on the given key, like the Screen's key bindings.
+        :param key: one of the names in SCREEN_KEYS.
+        :param timestamp: the time of the press, from time.perf_counter_ns
+        (the current time if None).
+        :return: None
+        """
+        if key not in SCREEN_KEYS:
+            raise ValueError("Unknown key: %s" % key)
+        if key == "q":
+            self._endGame = True
+        self._inputQueue.press(SCREEN_KEYS[key], timestamp)
+
+    def release(self, key, timestamp=None):
+        """
+        Simulates a release of the given key.
+        :param key: one of the names in SCREEN_KEYS.
+        :param timestamp: the time of the release (like in press).
+        :return: None
+        """
+        if key not in SCREEN_KEYS:
+            raise ValueError("Unknown key: %s" % key)
+        self._inputQueue.release(SCREEN_KEYS[key], timestamp)
+
+    def get_messages(self):
+        """
+        :return: a list of all the (title, message) tuples that were shown.
+        """
+        return self._messages
+
+    def ontimer(self, func, milli):
+        """
+        There is no timer without a GUI, so the function is not scheduled.
+        """
+        pass
+
+    def start_screen(self):
+        pass
+
+    def update(self):
+        pass
+
+    def set_score(self, val):
+        self._score = val
+
+    def remove_life(self):
+        self._lives -= 1
+
+    def register_asteroid(self, asteroid, size):
+        if size not in [1, 2, 3]:
+            print("Error: Wrong asteroid size: %d" % size)
+            sys.exit(0)
+        self._asteroids.add(id(asteroid))
+
+    def register_torpedo(self, torpedo):
+        self._torpedos.add(id(torpedo))
+
+    def register_objects(self, asteroids, torpedos):
+        self._asteroids.update(id(asteroid) for asteroid, size in asteroids)
+        self._torpedos.update(id(torpedo) for torpedo in torpedos)
+
+    def unregister_objects(self, asteroids, torpedos):
+        self._asteroids.difference_update(id(asteroid)
+                                          for asteroid in asteroids)
+        self._torpedos.difference_update(id(torpedo) for torpedo in torpedos)
+
+    def get_draw_stats(self):
+        """
+        :return: a tuple of the amount of draw calls and the amount of
+        objects that were moved on the canvas (always 0).
+        """
+        return self._drawCalls, 0
+
+    def draw_ship(self, x, y, heading):
+        self._drawCalls += 1
+
+    def draw_asteroid(self, asteroid, x, y):
+        self._drawCalls += 1
+
+    def draw_torpedo(self, torpedo, x, y, heading):
+        self._drawCalls += 1
+
+    def unregister_torpedo(self, torpedo):
+        self._torpedos.discard(id(torpedo))
+
+    def unregister_asteroid(self, asteroid):
+        self._asteroids.discard(id(asteroid))
+
+    def should_end(self):
+        return self._endGame
+
+    def is_left_pressed(self):
+        return self._take_press("Left")
+
+    def is_up_pressed(self):
+        return self._take_press("Up")
+
+    def is_right_pressed(self):
+        return self._take_press("Right")
+
+    def is_space_pressed(self):
+        return self._take_press("space")
+
+    def is_special_pressed(self):
+        return self._take_press("s")
+
+    def is_teleport_pressed(self):
+        return self._take_press("t")
+
+    def show_message(self, title, msg):
+        self._messages.append((str(title), str(msg)))
+
+    def end_game(self):
+        pass
+
+
+def run_headless(runner, max_ticks=None):
+    """
+    Runs the game loop of the given runner in a tight loop, without waiting
+    for any timer, until the game ends or until max_ticks ticks were run.
+    :param runner: a GameRunner object that was created with a headless
+    screen.
+    :param max_ticks: the maximum amount of ticks to run (None for no limit).
+    :return: a tuple of the amount of ticks that were run and the ticks per
+    second.
+    """
+    ticks = 0
+    start = time.perf_counter()
+    while not runner.is_game_over() and (max_ticks is None or
+                                         ticks < max_ticks):
+        runner._game_loop()
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    ticks_per_sec = ticks / elapsed if elapsed > 0 else float("inf")
+    return ticks, ticks_per_sec
+
+
+def main(amount, max_ticks):
+    # Imported here so the HeadlessScreen can be imported on its own.
+    from asteroids_main import GameRunner
+    runner = GameRunner(amount, HeadlessScreen())
+    ticks, ticks_per_sec = run_headless(runner, max_ticks)
+    print("Ran %d ticks (%.1f ticks/s)" % (ticks, ticks_per_sec))
+
+
+if __name__ == "__main__":
+    # Usage: python headless_screen.py [asteroids amount] [ticks]
+    asteroids_amount = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    ticks_amount = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    main(asteroids_amount, ticks_amount)
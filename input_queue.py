@@ -0,0 +1,212 @@
+import array
+import time
+
+from instrumentation import percentile
+
+# The game's keys, in the order of the tuples drain returns (the same order
+# as GameRunner.KEYS).
+KEYS = ("up", "right", "left", "teleport", "space", "special", "quit")
+# The key of every key name the screens bind.
+SCREEN_KEYS = {"Up": 0, "Right": 1, "Left": 2, "t": 3, "space": 4, "s": 5,
+               "q": 6}
+
+PRESS = 1
+RELEASE = 0
+
+
+class InputQueue:
+    """
+    Class of InputQueue objects, a ring buffer of timestamped key events.
+    The screen adds an event for every press and release of a key (from the
+    GUI's callbacks), and the game drains all the events since the last tick
+    once per tick, so a burst of presses (like a key's auto-repeat) is
+    applied in one tick instead of one press in every tick.
+    The queue also keeps which keys are held (pressed and not released yet),
+    and the time from every press to the tick that drained it (the input
+    latency).
+    If the buffer is full, the oldest events are dropped.
+    """
+
+    CAPACITY = 256
+    LATENCY_SAMPLES = 1024
+
+    def __init__(self, capacity=CAPACITY):
+        """
+        Initialize a new empty InputQueue object.
+        :param capacity: the maximum amount of events that wait to be drained
+        """
+        self.__keys = [0] * capacity
+        self.__kinds = [0] * capacity
+        # The times and latencies are kept in arrays, so they are not kept
+        # as int objects.
+        self.__times = array.array("q", bytes(8 * capacity))
+        self.__capacity = capacity
+        # The index of the oldest event and the amount of events.
+        self.__first = 0
+        self.__count = 0
+        self.__held = [0] * len(KEYS)
+        self.__dropped = 0
+        # A ring of the latest latencies, in nanoseconds.
+        self.__latencies = array.array("q", bytes(8 * self.LATENCY_SAMPLES))
+        self.__latencies_count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def add(self, key, kind, timestamp=None):
+        """
+        Adds an event to the queue.
+        :param key: the index of the key in KEYS
+        :param kind: PRESS or RELEASE
+        :param timestamp: the time of the event, from time.perf_counter_ns
+        (the current time if None)
+        :return: None
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        if self.__count == self.__capacity:
+            self.__first = (self.__first + 1) % self.__capacity
+            self.__count -= 1
+            self.__dropped += 1
+        index = (self.__first + self.__count) % self.__capacity
+        self.__keys[index] = key
+        self.__kinds[index] = kind
+        self.__times[index] = timestamp
+        self.__count += 1
+
+    def press(self, key, timestamp=None):
+        """
+        Adds a press event of the given key to the queue.
+        :param key: the index of the key in KEYS
+        :param timestamp: the time of the press (like in add)
+        :return: None
+        """
+        self.add(key, PRESS, timestamp)
+
+    def release(self, key, timestamp=None):
+        """
+        Adds a release event of the given key to the queue.
+        :param key: the index of the key in KEYS
+        :param timestamp: the time of the release (like in add)
+        :return: None
+        """
+        self.add(key, RELEASE, timestamp)
+
+    def drain(self, now=None):
+        """
+        Takes all the events out of the queue, updates the held keys and
+        measures the latency of every press.
+        :param now: the time the events are applied, from
+        time.perf_counter_ns (the current time if None)
+        :return: a tuple of the amount of presses of every key since the last
+        drain, in the order of KEYS
+        """
+        counts = [0] * len(KEYS)
+        if not self.__count:
+            return tuple(counts)
+        if now is None:
+            now = time.perf_counter_ns()
+        latencies = self.__latencies
+        samples = len(latencies)
+        index = self.__first
+        for i in range(self.__count):
+            key = self.__keys[index]
+            if self.__kinds[index] == PRESS:
+                counts[key] += 1
+                self.__held[key] = 1
+                latencies[self.__latencies_count % samples] = \
+                    now - self.__times[index]
+                self.__latencies_count += 1
+            else:
+                self.__held[key] = 0
+            index = (index + 1) % self.__capacity
+        self.__first = index
+        self.__count = 0
+        return tuple(counts)
+
+    def get_held(self):
+        """
+        :return: a tuple of the held keys after the last drain (1 if the key
+        is held and 0 if it isn't), in the order of KEYS
+        """
+        return tuple(self.__held)
+
+    def get_dropped(self):
+        """
+        :return: the amount of events that were dropped because the queue was
+        full.
+        """
+        return self.__dropped
+
+    def get_latency_stats(self):
+        """
+        :return: a dictionary of the amount of presses that were drained, and
+        the median, the 99th percentile and the maximum of the latency (in
+        milliseconds) of the latest LATENCY_SAMPLES presses
+        """
+        samples = sorted(self.__latencies[:min(self.__latencies_count,
+                                               len(self.__latencies))])
+        if not samples:
+            return {"presses": 0, "p50_ms": 0.0, "p99_ms": 0.0,
+                    "max_ms": 0.0}
+        return {
+            "presses": self.__latencies_count,
+            "p50_ms": percentile(samples, 50) / 10 ** 6,
+            "p99_ms": percentile(samples, 99) / 10 ** 6,
+            "max_ms": samples[-1] / 10 ** 6,
+        }
+
+
+class QueuedInput:
+    """
+    A mixin of the screens (Screen and HeadlessScreen), that reads the key
+    presses from an InputQueue. The game takes all the presses of a tick
+    with drain_keys, and the is_*_pressed methods take one press at a time
+    with _take_press, so every press is used only once.
+    The screen calls _init_input in its __init__, and sets _endGame to True
+    when the game should end.
+    """
+
+    def _init_input(self):
+        """
+        Creates the input queue and the presses that wait to be used.
+        :return: None
+        """
+        self._endGame = False
+        self._inputQueue = InputQueue()
+        # Presses that the is_*_pressed methods took out of the input queue
+        # and didn't use yet.
+        self._pendingPresses = [0] * len(SCREEN_KEYS)
+
+    def drain_keys(self):
+        """
+        Takes all the key presses since the last call out of the input queue,
+        with the presses _take_press took out and didn't use.
+        :return: a tuple of the amount of presses of every key, in the order
+        of GameRunner.KEYS (the last one, quit, is 1 if the game should end)
+        """
+        counts = [pending + count for pending, count
+                  in zip(self._pendingPresses, self._inputQueue.drain())]
+        self._pendingPresses = [0] * len(SCREEN_KEYS)
+        return tuple(counts[:-1]) + (int(self._endGame),)
+
+    def _take_press(self, key):
+        """
+        Takes one press of the given key out of the input queue.
+        :param key: one of the names in SCREEN_KEYS
+        :return: True if the key was pressed, and False otherwise
+        """
+        for index, count in enumerate(self._inputQueue.drain()):
+            self._pendingPresses[index] += count
+        index = SCREEN_KEYS[key]
+        if not self._pendingPresses[index]:
+            return False
+        self._pendingPresses[index] -= 1
+        return True
+
+    def get_input_queue(self):
+        """
+        :return: the InputQueue of the key events (for its held keys and its
+        latency stats)
+        """
+        return self._inputQueue
@@ -0,0 +1,147 @@
+from collections import deque
+
+# The phases of a tick, in the order they run.
+PHASES = ("move_ship", "move_asteroids", "move_torpedos",
+          "move_special_torpedos", "clicks_control", "ship_hit_asteroid",
+          "torpedo_hit_asteroid", "despawn", "screen_update")
+
+# The counters of a tick.
+COUNTERS = ("collision_pairs", "entities_moved", "draw_calls")
+
+
+def percentile(sorted_values, part):
+    """
+    :param sorted_values: a sorted list of numbers
+    :param part: the percentile (between 0 and 100)
+    :return: the value at the given percentile (nearest rank)
+    """
+    index = max(0, min(len(sorted_values) - 1,
+                       round(part / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class TickProfiler:
+    """
+    Class of TickProfiler objects, collects the time of every phase of the
+    game's ticks (in nanoseconds) and a few counters of every tick.
+    The profiler keeps the samples of the last ticks (a rolling window), and
+    calculates percentiles and histograms from them. Subscribers are called
+    with the samples of every tick.
+    A profiler is given to GameRunner's set_profiler. Without a profiler the
+    game doesn't measure anything.
+    """
+
+    WINDOW = 1000
+
+    def __init__(self, window=WINDOW):
+        """
+        Initialize a new TickProfiler object.
+        :param window: the amount of last ticks to keep the samples of.
+        """
+        self.__samples = {name: deque(maxlen=window)
+                          for name in PHASES + COUNTERS}
+        self.__totals = dict.fromkeys(COUNTERS, 0)
+        self.__subscribers = []
+        self.__ticks = 0
+
+    def subscribe(self, callback):
+        """
+        Adds a subscriber, that is called after every tick with a dictionary
+        of the tick's phases times and counters.
+        :param callback: a function that gets one dictionary argument.
+        :return: None
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """
+        Removes a subscriber that was added with subscribe.
+        :return: None
+        """
+        self.__subscribers.remove(callback)
+
+    def record_tick(self, samples):
+        """
+        Adds the samples of a tick.
+        :param samples: a dictionary of phases times (in nanoseconds) and
+        counters, by the names in PHASES and COUNTERS.
+        :return: None
+        """
+        self.__ticks += 1
+        for name, value in samples.items():
+            self.__samples[name].append(value)
+            if name in self.__totals:
+                self.__totals[name] += value
+        for callback in self.__subscribers:
+            callback(samples)
+
+    def record_phase(self, name, duration):
+        """
+        Adds a time sample of a single phase (for phases that run outside of
+        the game's tick, like the screen update).
+        :param name: the name of the phase
+        :param duration: the time in nanoseconds
+        :return: None
+        """
+        self.__samples[name].append(duration)
+
+    def get_ticks(self):
+        """
+        :return: the amount of recorded ticks.
+        """
+        return self.__ticks
+
+    def get_totals(self):
+        """
+        :return: a dictionary of the sums of every counter since the profiler
+        was created.
+        """
+        return dict(self.__totals)
+
+    def get_percentile(self, name, part):
+        """
+        :param name: the name of a phase or a counter
+        :param part: the percentile (between 0 and 100)
+        :return: the value at the given percentile in the rolling window, or
+        None if there are no samples.
+        """
+        samples = sorted(self.__samples[name])
+        if not samples:
+            return None
+        return percentile(samples, part)
+
+    def get_histogram(self, name):
+        """
+        Builds a histogram of the samples in the rolling window, with
+        power-of-two buckets.
+        :param name: the name of a phase or a counter
+        :return: a list of (upper bound, amount) tuples, for every bucket
+        from 1 up to the biggest sample.
+        """
+        buckets = {}
+        for value in self.__samples[name]:
+            bucket = max(int(value), 1).bit_length()
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        if not buckets:
+            return []
+        return [(2 ** bucket, buckets.get(bucket, 0))
+                for bucket in range(1, max(buckets) + 1)]
+
+    def report(self):
+        """
+        :return: a text table of the p50 and p99 of every phase (in
+        microseconds) and of every counter.
+        """
+        lines = ["%-22s %10s %10s" % ("phase", "p50 (us)", "p99 (us)")]
+        for name in PHASES:
+            if self.__samples[name]:
+                lines.append("%-22s %10.2f %10.2f" % (
+                    name, self.get_percentile(name, 50) / 1000,
+                    self.get_percentile(name, 99) / 1000))
+        lines.append("%-22s %10s %10s" % ("counter", "p50", "p99"))
+        for name in COUNTERS:
+            if self.__samples[name]:
+                lines.append("%-22s %10d %10d" % (
+                    name, self.get_percentile(name, 50),
+                    self.get_percentile(name, 99)))
+        return "\n".join(lines)
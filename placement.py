@@ -0,0 +1,194 @@
+import math
+
+# The amount of random coordinates that are tried before the occupancy grid
+# is built. They are all drawn together, so a game and a VectorGameEngine
+# (that checks them together) take the same random numbers.
+SAMPLES = 4
+
+
+class Placement:
+    """
+    Class of Placement objects, finds random integer coordinates on the
+    screen that are far enough from a group of blocked circles, in a bounded
+    time. The distances are measured around the screen's edges, like
+    SpatialHash.find_intersections measures them, so a placed object doesn't
+    collide in the next tick.
+    First SAMPLES random coordinates are tried, and the first free one is
+    taken. If none of them is free, an occupancy grid of the screen is built:
+    a cell that no circle reaches is free, so any coordinates in it are
+    valid, and random coordinates are taken from the free cells (a cell is
+    picked by its area, so all the free coordinates have the same chance). If
+    no cell is free the placement fails, instead of trying forever.
+    One Placement object can be used for many placements.
+    """
+
+    CELL_SIZE = 25
+    MARGIN = 1e-9
+
+    def __init__(self, min_x, max_x, min_y, max_y, cell_size=CELL_SIZE):
+        """
+        Initialize a new Placement object.
+        :param min_x: the minimum x coordinate of the screen
+        :param max_x: the maximum x coordinate of the screen
+        :param min_y: the minimum y coordinate of the screen
+        :param max_y: the maximum y coordinate of the screen
+        :param cell_size: the width and height of every cell of the grid
+        """
+        self.__min_x = min_x
+        self.__max_x = max_x
+        self.__min_y = min_y
+        self.__max_y = max_y
+        # The size of the screen around its edges, like in SpatialHash.
+        self.__width = max_x - min_x
+        self.__height = max_y - min_y
+        self.__cell_size = cell_size
+        # The coordinates are integers from the minimum to the maximum, both
+        # included, so the last column and row may be narrower.
+        self.__cols = math.ceil((max_x - min_x + 1) / cell_size)
+        self.__rows = math.ceil((max_y - min_y + 1) / cell_size)
+        # 1 for every cell that a circle reaches, created once and cleared
+        # before every use.
+        self.__grid = bytearray(self.__cols * self.__rows)
+        self.__empty = bytes(len(self.__grid))
+        self.__blocked = b"\x01" * self.__cols
+        # The amount of coordinates in every cell.
+        self.__areas = []
+        for index in range(len(self.__grid)):
+            min_x, max_x, min_y, max_y = self.__cell_bounds(index)
+            self.__areas.append((max_x - min_x + 1) * (max_y - min_y + 1))
+
+    def sample(self, rand):
+        """
+        Draws the random coordinates that are tried first.
+        :param rand: the random.Random object to take the coordinates from
+        :return: a list of SAMPLES tuples of integer coordinates
+        """
+        return [(rand.randint(self.__min_x, self.__max_x),
+                 rand.randint(self.__min_y, self.__max_y))
+                for _ in range(SAMPLES)]
+
+    def is_clear(self, x, y, circles):
+        """
+        :param circles: a sequence of (x, y, distance) tuples of the blocked
+        circles
+        :return: True if the given coordinates are farther than the distance
+        from the center of every circle, around the screen's edges.
+        """
+        for circle_x, circle_y, distance in circles:
+            delta_x = abs(circle_x - x) % self.__width
+            delta_y = abs(circle_y - y) % self.__height
+            delta_x = min(delta_x, self.__width - delta_x)
+            delta_y = min(delta_y, self.__height - delta_y)
+            if delta_x * delta_x + delta_y * delta_y <= distance * distance:
+                return False
+        return True
+
+    def find(self, rand, is_free, circles):
+        """
+        Finds random coordinates that are not blocked.
+        :param rand: the random.Random object to take the coordinates from
+        :param is_free: a function that gets coordinates and returns True if
+        they are not blocked
+        :param circles: a function that returns the blocked circles (like in
+        find_in_grid). It is called only if no sample is free.
+        :return: a tuple of integer coordinates, or None if no free
+        coordinates were found
+        """
+        for x, y in self.sample(rand):
+            if is_free(x, y):
+                return x, y
+        return self.find_in_grid(rand, circles())
+
+    def find_in_grid(self, rand, circles):
+        """
+        Finds random coordinates in the cells that no blocked circle reaches.
+        :param rand: the random.Random object to take the coordinates from
+        :param circles: an iterable of (x, y, distance) tuples of the blocked
+        circles: all the coordinates whose distance from the center is the
+        distance or less are blocked
+        :return: a tuple of integer coordinates, or None if no cell is free
+        """
+        self.__grid[:] = self.__empty
+        for x, y, distance in circles:
+            # A circle near an edge reaches the other side of the screen too.
+            shifts_x = [0]
+            if x - distance < self.__min_x:
+                shifts_x.append(self.__width)
+            if x + distance > self.__max_x:
+                shifts_x.append(-self.__width)
+            shifts_y = [0]
+            if y - distance < self.__min_y:
+                shifts_y.append(self.__height)
+            if y + distance > self.__max_y:
+                shifts_y.append(-self.__height)
+            for shift_x in shifts_x:
+                for shift_y in shifts_y:
+                    self.__block(x + shift_x, y + shift_y, distance)
+            if self.__grid.find(0) == -1:
+                # The screen is full, the rest of the circles can't matter.
+                return None
+        free = []
+        total = 0
+        index = self.__grid.find(0)
+        while index != -1:
+            total += self.__areas[index]
+            free.append((total, index))
+            index = self.__grid.find(0, index + 1)
+        if not free:
+            return None
+        # The first cell whose total area reaches the random point.
+        point = rand.randrange(total)
+        low, high = 0, len(free) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if free[middle][0] > point:
+                high = middle
+            else:
+                low = middle + 1
+        min_x, max_x, min_y, max_y = self.__cell_bounds(free[low][1])
+        return rand.randint(min_x, max_x), rand.randint(min_y, max_y)
+
+    def __cell_bounds(self, index):
+        """
+        :return: a tuple of the minimum and the maximum x and y coordinates
+        in the cell of the given index.
+        """
+        x = self.__min_x + index % self.__cols * self.__cell_size
+        y = self.__min_y + index // self.__cols * self.__cell_size
+        return x, min(x + self.__cell_size - 1, self.__max_x), \
+            y, min(y + self.__cell_size - 1, self.__max_y)
+
+    def __block(self, x, y, distance):
+        """
+        Marks the cells that have coordinates whose distance from the given
+        center is the given distance or less (without wrapping).
+        :return: None
+        """
+        size = self.__cell_size
+        first_col = max(0, math.floor((x - distance - self.__min_x) / size))
+        last_col = min(self.__cols - 1,
+                       math.floor((x + distance - self.__min_x) / size))
+        first_row = max(0, math.floor((y - distance - self.__min_y) / size))
+        last_row = min(self.__rows - 1,
+                       math.floor((y + distance - self.__min_y) / size))
+        max_dist = distance * distance
+        grid = self.__grid
+        cols = self.__cols
+        for row in range(first_row, last_row + 1):
+            # The closest y coordinate of the row's cells to the center.
+            cell_y = self.__min_y + row * size
+            near_y = min(max(y, cell_y), cell_y + size - 1, self.__max_y)
+            max_dx = max_dist - (near_y - y) ** 2
+            if max_dx < 0:
+                continue
+            # The integer x coordinates in the circle in this row (a little
+            # wider, so the square root's rounding never misses one).
+            reach = math.sqrt(max_dx) + self.MARGIN
+            first = max(first_col,
+                        (math.ceil(x - reach) - self.__min_x) // size)
+            last = min(last_col,
+                       (math.floor(x + reach) - self.__min_x) // size)
+            if first <= last:
+                start = row * cols
+                grid[start + first:start + last + 1] = \
+                    self.__blocked[:last - first + 1]
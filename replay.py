@@ -0,0 +1,262 @@
+import array
+import struct
+import sys
+
+import trig
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM
+from headless_screen import HeadlessScreen
+
+MAGIC = b"AREC"
+# magic, seed, asteroids amount, ticks amount, use_numpy, trig tables mode
+HEADER = struct.Struct("<4sqqq??")
+
+
+class InputRecorder:
+    """
+    Class of InputRecorder objects, a recording of a game: the seed and the
+    amount of asteroids it started with, the game's use_numpy option and trig
+    mode, the keys of every tick and a digest of the game's state after every
+    tick.
+    The keys of a tick are the amount of times every key was pressed in it
+    (an unsigned 32 bits integer per key), and the quit key is 1 if the game
+    should end.
+    A recorder is given to a GameRunner to record a game, and can be saved to
+    a file and loaded from it.
+    """
+
+    def __init__(self, seed, asteroids_amount=DEFAULT_ASTEROIDS_NUM,
+                 use_numpy=False, trig_tables=False):
+        """
+        Initialize a new empty InputRecorder object. The use_numpy option and
+        the trig mode are taken from the game when it starts (see start).
+        :param seed: the seed of the recorded game (an integer)
+        :param asteroids_amount: the amount of asteroids the game starts with
+        :param use_numpy: the use_numpy option of the game
+        :param trig_tables: True if the game uses the integer-degree heading
+        mode (see trig.use_tables)
+        """
+        self.__seed = seed
+        self.__asteroids_amount = asteroids_amount
+        self.__use_numpy = use_numpy
+        self.__trig_tables = trig_tables
+        self.__keys = array.array("I")
+        self.__digests = array.array("I")
+
+    def start(self, runner):
+        """
+        Keeps the use_numpy option and the trig mode of the recorded game.
+        Called by the GameRunner when it is created.
+        :param runner: the GameRunner of the recorded game
+        :return: None
+        """
+        self.__use_numpy = runner.get_use_numpy()
+        self.__trig_tables = trig.is_using_tables()
+
+    def record(self, keys):
+        """
+        Adds the keys of a tick to the recording.
+        :param keys: a tuple of the amount of presses of every key, in the
+        order of GameRunner.KEYS
+        :return: None
+        """
+        if any(key > 0xFFFFFFFF for key in keys):
+            raise OverflowError("too many presses in one tick: %s" % (keys,))
+        self.__keys.extend(keys)
+
+    def record_state(self, digest):
+        """
+        Adds the state digest after a tick to the recording.
+        :param digest: the state digest of the game (GameRunner's
+        get_state_digest)
+        :return: None
+        """
+        self.__digests.append(digest)
+
+    def get_seed(self):
+        return self.__seed
+
+    def get_asteroids_amount(self):
+        return self.__asteroids_amount
+
+    def get_use_numpy(self):
+        return self.__use_numpy
+
+    def get_trig_tables(self):
+        return self.__trig_tables
+
+    def get_ticks(self):
+        """
+        :return: the amount of recorded ticks.
+        """
+        return len(self.__digests)
+
+    def get_keys(self, tick):
+        """
+        :return: a tuple of the amount of presses of every key in the given
+        tick.
+        """
+        keys_amount = len(GameRunner.KEYS)
+        return tuple(self.__keys[tick * keys_amount:
+                                 (tick + 1) * keys_amount])
+
+    def get_digest(self, tick):
+        """
+        :return: the state digest after the given tick.
+        """
+        return self.__digests[tick]
+
+    def save(self, path):
+        """
+        Saves the recording to the given file.
+        :return: None
+        """
+        with open(path, "wb") as rec_file:
+            rec_file.write(HEADER.pack(MAGIC, self.__seed,
+                                       self.__asteroids_amount,
+                                       self.get_ticks(), self.__use_numpy,
+                                       self.__trig_tables))
+            self.__keys[:self.get_ticks() * len(GameRunner.KEYS)].tofile(
+                rec_file)
+            self.__digests.tofile(rec_file)
+
+    @staticmethod
+    def load(path):
+        """
+        Loads a recording from the given file.
+        :return: the InputRecorder object of the recording
+        """
+        with open(path, "rb") as rec_file:
+            header = rec_file.read(HEADER.size)
+            if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+                raise ValueError("%s is not a recording file" % path)
+            magic, seed, asteroids_amount, ticks, use_numpy, trig_tables = \
+                HEADER.unpack(header)
+            recorder = InputRecorder(seed, asteroids_amount, use_numpy,
+                                     trig_tables)
+            recorder.__keys.fromfile(rec_file, ticks * len(GameRunner.KEYS))
+            recorder.__digests.fromfile(rec_file, ticks)
+        return recorder
+
+
+class InputReplay:
+    """
+    Class of InputReplay objects, gives the recorded keys of every tick to a
+    GameRunner, instead of its screen: the amount of presses of every key,
+    that the game applies that many times (like the presses it drains from
+    its screen). After the last recorded tick no key is pressed.
+    """
+
+    def __init__(self, recording):
+        """
+        Initialize a new InputReplay object.
+        :param recording: an InputRecorder object
+        """
+        self.__recording = recording
+        self.__tick = 0
+
+    def next_keys(self):
+        """
+        :return: a tuple of the amount of presses of every key in the next
+        tick.
+        """
+        tick = self.__tick
+        self.__tick += 1
+        if tick < self.__recording.get_ticks():
+            return self.__recording.get_keys(tick)
+        return (0,) * len(GameRunner.KEYS)
+
+    def get_tick(self):
+        """
+        :return: the amount of ticks that were replayed.
+        """
+        return self.__tick
+
+
+def replay_headless(recording):
+    """
+    Replays a recording without a GUI, with the use_numpy option and the trig
+    mode of the recorded game, and checks after every tick that the game's
+    state is the same as in the recording.
+    :param recording: an InputRecorder object
+    :return: the first tick whose state is different from the recording, or
+    None if all the ticks are the same.
+    """
+    trig_tables = trig.is_using_tables()
+    trig.use_tables(recording.get_trig_tables())
+    try:
+        runner = GameRunner(recording.get_asteroids_amount(),
+                            HeadlessScreen(),
+                            use_numpy=recording.get_use_numpy(),
+                            seed=recording.get_seed(),
+                            replay=InputReplay(recording))
+        for tick in range(recording.get_ticks()):
+            runner._game_loop()
+            if runner.get_state_digest() != recording.get_digest(tick):
+                return tick
+            if runner.is_game_over():
+                break
+        return None
+    finally:
+        trig.use_tables(trig_tables)
+
+
+def record_game(path, asteroids_amount, seed):
+    """
+    Runs a GUI game with the given seed, and saves its recording to the given
+    file when the game ends.
+    :return: None
+    """
+    recorder = InputRecorder(seed, asteroids_amount)
+    runner = GameRunner(asteroids_amount, seed=seed, recorder=recorder)
+    try:
+        runner.run()
+    finally:
+        recorder.save(path)
+
+
+def play_game(path):
+    """
+    Replays the recording in the given file with the GUI, with the use_numpy
+    option and the trig mode of the recorded game. The quit key and the Exit
+    button still end the game.
+    :return: None
+    """
+    recording = InputRecorder.load(path)
+    trig.use_tables(recording.get_trig_tables())
+    runner = GameRunner(recording.get_asteroids_amount(),
+                        use_numpy=recording.get_use_numpy(),
+                        seed=recording.get_seed(),
+                        replay=InputReplay(recording))
+    runner.run()
+
+
+def main(args):
+    usage = "Usage: python replay.py record <file> [asteroids] [seed]\n" \
+            "       python replay.py play <file>\n" \
+            "       python replay.py check <file>"
+    if len(args) < 2:
+        print(usage)
+        return 1
+    command, path = args[0], args[1]
+    if command == "record":
+        asteroids_amount = int(args[2]) if len(args) > 2 else \
+            DEFAULT_ASTEROIDS_NUM
+        seed = int(args[3]) if len(args) > 3 else 0
+        record_game(path, asteroids_amount, seed)
+    elif command == "play":
+        play_game(path)
+    elif command == "check":
+        bad_tick = replay_headless(InputRecorder.load(path))
+        if bad_tick is not None:
+            print("The replay is different from the recording in tick %d" %
+                  bad_tick)
+            return 1
+        print("The replay is the same as the recording")
+    else:
+        print(usage)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,518 @@
+import array
+import bisect
+import mmap
+import queue
+import random
+import struct
+import sys
+import threading
+
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM, \
+    SNAPSHOT_HEADER, ASTEROID_COLUMNS, TORPEDO_COLUMNS, SPECIAL_COLUMNS, \
+    snapshot_columns
+from headless_screen import HeadlessScreen
+
+MAGIC = b"ASTR"
+INDEX_MAGIC = b"AIDX"
+# magic, keyframe interval, positions scale, screen min x, min y, width,
+# height
+FILE_HEADER = struct.Struct("<4sIIdddd")
+# record kind, tick, payload size
+RECORD_HEADER = struct.Struct("<BqI")
+KEYFRAME, DELTA = 1, 2
+# score, lives, ship's x, y, x speed, y speed and direction, the amounts of
+# asteroids, torpedos and special torpedos, and the amount of asteroids
+# whose size changed
+DELTA_HEADER = struct.Struct("<qq5dIIII")
+# the amount of keyframes and the index magic, at the end of the file
+INDEX_FOOTER = struct.Struct("<q4s")
+
+# The positions in the deltas are in 1/POSITION_SCALE pixels, so a delta
+# of up to 2047 pixels fits in 16 bits.
+POSITION_SCALE = 16
+
+
+class ReplayState:
+    """
+    Class of ReplayState objects, the state of a recorded game in one tick:
+    the score, the lives, the ship, and the coordinates of all the asteroids
+    and torpedos (and the asteroids sizes), in the game's lists order.
+    The coordinates are exact in the keyframes' ticks, and are rounded to
+    1/POSITION_SCALE pixels in the other ticks.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new empty ReplayState object.
+        """
+        self.tick = 0
+        self.score = 0
+        self.lives = 0
+        # x, y, x speed, y speed, direction
+        self.ship = (0.0, 0.0, 0.0, 0.0, 0.0)
+        # Flat lists of x and y coordinates: x1, y1, x2, y2, ...
+        self.asteroids = []
+        self.torpedos = []
+        self.special_torpedos = []
+        self.sizes = []
+
+    def load_snapshot(self, view):
+        """
+        Sets the state from a GameRunner snapshot.
+        :param view: a memoryview of the snapshot
+        :return: None
+        """
+        magic, self.score, self.lives, asteroids_amount, torpedos_amount, \
+            special_amount, *self.ship = SNAPSHOT_HEADER.unpack_from(view)
+        self.ship = tuple(self.ship)
+        pos = SNAPSHOT_HEADER.size
+        lists = []
+        for amount, formats in ((asteroids_amount, ASTEROID_COLUMNS),
+                                (torpedos_amount, TORPEDO_COLUMNS),
+                                (special_amount, SPECIAL_COLUMNS)):
+            columns, pos = snapshot_columns(view, pos, amount, formats)
+            coors = [0.0] * (2 * amount)
+            coors[0::2] = columns[0]
+            coors[1::2] = columns[1]
+            lists.append(coors)
+            if formats is ASTEROID_COLUMNS:
+                self.sizes = columns[4].tolist()
+        self.asteroids, self.torpedos, self.special_torpedos = lists
+
+
+class DeltaCoder:
+    """
+    Class of DeltaCoder objects, turns coordinates into 16 bit deltas from the
+    coordinates of the previous tick and back. The writer and the reader of a
+    replay stream both keep a DeltaCoder, so the writer's deltas are from the
+    coordinates the reader has (and the rounding errors don't add up).
+    The deltas are taken around the screen's edges.
+    """
+
+    def __init__(self, min_x, min_y, width, height, scale=POSITION_SCALE):
+        """
+        Initialize a new DeltaCoder object.
+        :param min_x: the minimum x coordinate of the screen
+        :param min_y: the minimum y coordinate of the screen
+        :param width: the width of the screen
+        :param height: the height of the screen
+        :param scale: the amount of delta units in one pixel
+        """
+        if max(width, height) * scale / 2 >= 2 ** 15:
+            raise ValueError("The screen is too big for 16 bit deltas")
+        self.__mins = (min_x, min_y)
+        self.__sizes = (width, height)
+        self.__scale = scale
+
+    def encode(self, coors, previous, deltas):
+        """
+        Adds the deltas of the given coordinates to an array, and changes the
+        previous coordinates to the coordinates the decoder will get.
+        :param coors: a flat sequence of the new coordinates (x1, y1, ...)
+        :param previous: a flat list of the previous coordinates that the
+        decoder has, which is changed to the new ones (new objects start from
+        0)
+        :param deltas: an array("h") to add the deltas to
+        :return: None
+        """
+        del previous[len(coors):]
+        previous.extend([0.0] * (len(coors) - len(previous)))
+        scale = self.__scale
+        for i, coor in enumerate(coors):
+            size = self.__sizes[i & 1]
+            delta = (coor - previous[i] + size / 2) % size - size / 2
+            step = round(delta * scale)
+            deltas.append(step)
+            previous[i] = self.__wrap(previous[i] + step / scale, i & 1)
+
+    def decode(self, deltas, previous):
+        """
+        Applies deltas to the previous coordinates, like encode.
+        :param deltas: a sequence of the deltas
+        :param previous: a flat list of the previous coordinates, which is
+        changed to the new ones
+        :return: None
+        """
+        del previous[len(deltas):]
+        previous.extend([0.0] * (len(deltas) - len(previous)))
+        scale = self.__scale
+        for i, step in enumerate(deltas):
+            previous[i] = self.__wrap(previous[i] + step / scale, i & 1)
+
+    def __wrap(self, coor, axis):
+        """
+        :return: the coordinate moved onto the screen
+        """
+        return (coor - self.__mins[axis]) % self.__sizes[axis] + \
+            self.__mins[axis]
+
+
+class ReplayStreamWriter:
+    """
+    Class of ReplayStreamWriter objects, writes a game to a replay stream file
+    while it runs: a keyframe (a full GameRunner snapshot) every
+    keyframe_interval ticks, and the deltas of the coordinates in the other
+    ticks, with the objects that were added and removed.
+    The records are encoded in the game's thread and written to the file by a
+    background thread, so the game doesn't wait for the disk. When the stream
+    is closed, an index of the keyframes is written at the end of the file.
+    A writer can be given to a GameRunner as its recorder, and then every
+    tick is recorded after it runs (the GameRunner calls start).
+    If writing to the file fails, the error is raised by the next record
+    and by close.
+    """
+
+    KEYFRAME_INTERVAL = 1000
+    QUEUE_SIZE = 1024
+    # The stream has the state itself, so the GameRunner doesn't compute a
+    # state digest for it.
+    NEEDS_DIGEST = False
+
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL,
+                 screen_class=HeadlessScreen):
+        """
+        Initialize a new ReplayStreamWriter object, and starts its writing
+        thread.
+        :param path: the path of the file
+        :param keyframe_interval: the amount of ticks between keyframes
+        :param screen_class: the screen class whose bounds the game uses
+        """
+        self.__keyframe_interval = keyframe_interval
+        min_x, min_y = screen_class.SCREEN_MIN_X, screen_class.SCREEN_MIN_Y
+        width = screen_class.SCREEN_MAX_X - min_x
+        height = screen_class.SCREEN_MAX_Y - min_y
+        self.__coder = DeltaCoder(min_x, min_y, width, height)
+        self.__runner = None
+        self.__tick = 0
+        self.__offset = 0
+        self.__index = array.array("q")
+        self.__previous = ([], [], [])
+        self.__sizes = []
+        self.__queue = queue.Queue(self.QUEUE_SIZE)
+        # The exception the writing thread got, if writing failed.
+        self.__error = None
+        self.__file = open(path, "wb", buffering=2 ** 20)
+        self.__thread = threading.Thread(target=self.__write_records,
+                                         daemon=True)
+        self.__thread.start()
+        self.__put(FILE_HEADER.pack(MAGIC, keyframe_interval, POSITION_SCALE,
+                                    min_x, min_y, width, height))
+
+    def start(self, runner):
+        """
+        Sets the game to record. The first recorded tick is a keyframe of the
+        game's current state. A GameRunner whose recorder is this writer
+        calls it when it is created.
+        :param runner: a GameRunner object
+        :return: None
+        """
+        self.__runner = runner
+        self.__tick = 0
+
+    def record(self, keys):
+        # The keys are not recorded, only the state.
+        pass
+
+    def record_state(self, digest):
+        # Called by the GameRunner after every tick, with None instead of the
+        # digest (see NEEDS_DIGEST).
+        self.record_tick()
+
+    def record_tick(self):
+        """
+        Records the current state of the game, as a keyframe or as deltas.
+        :return: None
+        """
+        if self.__runner is None:
+            raise RuntimeError("The writer has no game, start wasn't called")
+        snapshot = self.__runner.snapshot()
+        if self.__tick % self.__keyframe_interval == 0:
+            self.__write_keyframe(snapshot)
+        else:
+            self.__write_delta(memoryview(snapshot))
+        self.__tick += 1
+
+    def __put(self, data):
+        """
+        Gives data to the writing thread, or raises the error of the thread
+        if writing failed.
+        :return: None
+        """
+        if self.__error is not None:
+            raise self.__error
+        self.__queue.put(data)
+        self.__offset += len(data)
+
+    def __write_records(self):
+        """
+        The writing thread: writes the data from the queue to the file, until
+        it gets None. If writing fails the error is kept, and the rest of the
+        data is taken out of the queue without writing it, so the game never
+        waits for a full queue.
+        :return: None
+        """
+        data = self.__queue.get()
+        while data is not None:
+            if self.__error is None:
+                try:
+                    self.__file.write(data)
+                except Exception as error:
+                    self.__error = error
+            data = self.__queue.get()
+
+    def __write_keyframe(self, snapshot):
+        """
+        Writes a keyframe record, adds it to the index, and starts the deltas
+        from its exact coordinates.
+        :return: None
+        """
+        self.__index.extend((self.__tick, self.__offset))
+        state = ReplayState()
+        state.load_snapshot(memoryview(snapshot))
+        self.__previous = (state.asteroids, state.torpedos,
+                           state.special_torpedos)
+        self.__sizes = state.sizes
+        self.__put(RECORD_HEADER.pack(KEYFRAME, self.__tick, len(snapshot)) +
+                   snapshot)
+
+    def __write_delta(self, view):
+        """
+        Writes a delta record of the given snapshot: the header, the deltas
+        of all the coordinates, and the indexes and sizes of the asteroids
+        whose size changed (new asteroids, or asteroids that took the place
+        of removed ones).
+        :return: None
+        """
+        score, lives, *ship_and_amounts = SNAPSHOT_HEADER.unpack_from(view)[1:]
+        amounts = ship_and_amounts[:3]
+        deltas = array.array("h")
+        pos = SNAPSHOT_HEADER.size
+        new_sizes = None
+        for amount, formats, previous in zip(
+                amounts, (ASTEROID_COLUMNS, TORPEDO_COLUMNS,
+                          SPECIAL_COLUMNS), self.__previous):
+            columns, pos = snapshot_columns(view, pos, amount, formats)
+            coors = [0.0] * (2 * amount)
+            coors[0::2] = columns[0]
+            coors[1::2] = columns[1]
+            self.__coder.encode(coors, previous, deltas)
+            if new_sizes is None:
+                new_sizes = columns[4]
+        changed = array.array("I")
+        changed_sizes = array.array("B")
+        sizes = self.__sizes
+        del sizes[len(new_sizes):]
+        for i, size in enumerate(new_sizes):
+            if i >= len(sizes):
+                sizes.append(size)
+            elif sizes[i] == size:
+                continue
+            sizes[i] = size
+            changed.append(i)
+            changed_sizes.append(size)
+        header = DELTA_HEADER.pack(score, lives, *ship_and_amounts[3:],
+                                   *amounts, len(changed))
+        payload = header + deltas.tobytes() + changed.tobytes() + \
+            changed_sizes.tobytes()
+        self.__put(RECORD_HEADER.pack(DELTA, self.__tick, len(payload)) +
+                   payload)
+
+    def close(self):
+        """
+        Waits for the writing thread to write all the records, writes the
+        index of the keyframes (pairs of tick and offset) and closes the file.
+        :return: None
+        """
+        self.__queue.put(None)
+        self.__thread.join()
+        try:
+            if self.__error is not None:
+                raise self.__error
+            self.__file.write(self.__index.tobytes())
+            self.__file.write(INDEX_FOOTER.pack(len(self.__index) // 2,
+                                                INDEX_MAGIC))
+        finally:
+            self.__file.close()
+
+
+class ReplayStreamReader:
+    """
+    Class of ReplayStreamReader objects, reads a replay stream file through
+    mmap. Any tick can be read by jumping to the last keyframe before it
+    through the index, and applying the deltas of the ticks after the
+    keyframe.
+    A file that wasn't closed (for example after a crash) has no index, and
+    the index is built by going over the records.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize a new ReplayStreamReader object.
+        :param path: the path of the file
+        """
+        with open(path, "rb") as stream_file:
+            self.__map = mmap.mmap(stream_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        self.__view = memoryview(self.__map)
+        magic, self.__keyframe_interval, scale, min_x, min_y, width, \
+            height = FILE_HEADER.unpack_from(self.__view)
+        if magic != MAGIC:
+            raise ValueError("%s is not a replay stream file" % path)
+        self.__coder = DeltaCoder(min_x, min_y, width, height, scale)
+        self.__key_ticks, self.__key_offsets, self.__end = self.__load_index()
+
+    def __load_index(self):
+        """
+        :return: a tuple of the keyframes ticks, their offsets and the offset
+        of the end of the records.
+        """
+        view = self.__view
+        if len(view) >= FILE_HEADER.size + INDEX_FOOTER.size:
+            amount, magic = INDEX_FOOTER.unpack_from(
+                view, len(view) - INDEX_FOOTER.size)
+            if magic == INDEX_MAGIC:
+                end = len(view) - INDEX_FOOTER.size - 16 * amount
+                index = view[end:len(view) - INDEX_FOOTER.size].cast("q")
+                return index[0::2].tolist(), index[1::2].tolist(), end
+        key_ticks, key_offsets = [], []
+        offset = FILE_HEADER.size
+        while offset + RECORD_HEADER.size <= len(view):
+            kind, tick, size = RECORD_HEADER.unpack_from(view, offset)
+            if offset + RECORD_HEADER.size + size > len(view):
+                break
+            if kind == KEYFRAME:
+                key_ticks.append(tick)
+                key_offsets.append(offset)
+            offset += RECORD_HEADER.size + size
+        return key_ticks, key_offsets, offset
+
+    def get_keyframe_ticks(self):
+        """
+        :return: a list of the ticks that have a keyframe.
+        """
+        return list(self.__key_ticks)
+
+    def get_keyframe(self, tick):
+        """
+        :return: a tuple of the tick of the last keyframe at or before the
+        given tick, and a memoryview of its snapshot (that can be given to
+        GameRunner.restore).
+        """
+        i = bisect.bisect_right(self.__key_ticks, tick) - 1
+        if i < 0:
+            raise IndexError("No keyframe before tick %d" % tick)
+        offset = self.__key_offsets[i]
+        kind, key_tick, size = RECORD_HEADER.unpack_from(self.__view, offset)
+        start = offset + RECORD_HEADER.size
+        return key_tick, self.__view[start:start + size]
+
+    def get_state(self, tick):
+        """
+        :param tick: the tick to read
+        :return: a ReplayState of the game after the given tick
+        """
+        key_tick, snapshot = self.get_keyframe(tick)
+        state = ReplayState()
+        state.load_snapshot(snapshot)
+        offset = self.__key_offsets[
+            bisect.bisect_right(self.__key_ticks, tick) - 1]
+        offset += RECORD_HEADER.size + len(snapshot)
+        state.tick = key_tick
+        while state.tick < tick:
+            if offset >= self.__end:
+                raise IndexError("Tick %d was not recorded" % tick)
+            kind, record_tick, size = RECORD_HEADER.unpack_from(self.__view,
+                                                                offset)
+            offset += RECORD_HEADER.size
+            self.__apply_delta(state, self.__view[offset:offset + size])
+            state.tick = record_tick
+            offset += size
+        return state
+
+    def __apply_delta(self, state, view):
+        """
+        Changes a state by a delta record.
+        :return: None
+        """
+        state.score, state.lives, *values = DELTA_HEADER.unpack_from(view)
+        state.ship = tuple(values[:5])
+        amounts = values[5:8]
+        changed_amount = values[8]
+        pos = DELTA_HEADER.size
+        for amount, coors in zip(amounts, (state.asteroids, state.torpedos,
+                                           state.special_torpedos)):
+            self.__coder.decode(view[pos:pos + 4 * amount].cast("h"), coors)
+            pos += 4 * amount
+        changed = view[pos:pos + 4 * changed_amount].cast("I")
+        pos += 4 * changed_amount
+        sizes = state.sizes
+        del sizes[amounts[0]:]
+        sizes.extend([0] * (amounts[0] - len(sizes)))
+        for i, size in zip(changed, view[pos:pos + changed_amount]):
+            sizes[i] = size
+
+    def close(self):
+        """
+        Closes the file.
+        :return: None
+        """
+        self.__view.release()
+        self.__map.close()
+
+
+def record_headless(path, asteroids_amount, seed, ticks,
+                    keyframe_interval=ReplayStreamWriter.KEYFRAME_INTERVAL):
+    """
+    Records a headless game, whose keys are pressed randomly by the seed, to a
+    replay stream file.
+    :return: the amount of recorded ticks
+    """
+    writer = ReplayStreamWriter(path, keyframe_interval)
+    screen = HeadlessScreen()
+    runner = GameRunner(asteroids_amount, screen, seed=seed, recorder=writer)
+    player = random.Random(seed)
+    tick = 0
+    try:
+        while tick < ticks and not runner.is_game_over():
+            for key in ("space", "Left", "Up"):
+                if player.random() < 0.1:
+                    screen.press(key)
+            runner._game_loop()
+            tick += 1
+    finally:
+        writer.close()
+    return tick
+
+
+def main(args):
+    usage = "Usage: python replay_stream.py record <file> [asteroids] " \
+            "[seed] [ticks]\n" \
+            "       python replay_stream.py show <file> <tick>"
+    if len(args) < 2:
+        print(usage)
+        return 1
+    command, path = args[0], args[1]
+    if command == "record":
+        asteroids_amount = int(args[2]) if len(args) > 2 else \
+            DEFAULT_ASTEROIDS_NUM
+        seed = int(args[3]) if len(args) > 3 else 0
+        ticks = int(args[4]) if len(args) > 4 else 10000
+        print("Recorded %d ticks" % record_headless(path, asteroids_amount,
+                                                    seed, ticks))
+    elif command == "show" and len(args) > 2:
+        reader = ReplayStreamReader(path)
+        state = reader.get_state(int(args[2]))
+        print("tick %d: score %d, lives %d, ship at (%.1f, %.1f), %d "
+              "asteroids, %d torpedos, %d special torpedos" % (
+                  state.tick, state.score, state.lives, state.ship[0],
+                  state.ship[1], len(state.asteroids) // 2,
+                  len(state.torpedos) // 2, len(state.special_torpedos) // 2))
+        reader.close()
+    else:
+        print(usage)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
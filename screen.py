@@ -1,8 +1,27 @@
 import sys
-import tkinter
-import tkinter.messagebox
 
-from turtle import *
+from input_queue import QueuedInput, SCREEN_KEYS
+
+# tkinter and turtle are imported by import_gui when the first screen is
+# created, so importing this module (for example for its constants) doesn't
+# load the GUI stack.
+tkinter = None
+RawTurtle = None
+ScrolledCanvas = None
+
+
+def import_gui():
+    """
+    Imports tkinter and the turtle classes the screens use, into this
+    module's names. Does nothing if they were imported already.
+    :return: None
+    """
+    global tkinter, RawTurtle, ScrolledCanvas
+    if tkinter is not None:
+        return
+    import tkinter.messagebox
+    from turtle import RawTurtle, ScrolledCanvas
+
 
 class ShapesMaster:
     ASTEROID_BASE_SHAPE = "asteroid%d"
@@ -58,37 +77,47 @@ class ShapesMaster:
         return self._shapes
 
 
-class Screen:
+class Screen(QueuedInput):
 
     SCREEN_MIN_X = -500
     SCREEN_MIN_Y = -500
     SCREEN_MAX_X = 500
     SCREEN_MAX_Y = 500
 
-    def __init__(self):
+    TORPEDO_POOL_SIZE = 50
+
+    # An object is moved on the canvas only if it moved at least this
+    # distance (in game coordinates) since it was last drawn.
+    DRAW_THRESHOLD = 1
+
+    def __init__(self, torpedo_pool_size=TORPEDO_POOL_SIZE):
         """
         This inits our graphics class.
+
+        :param torpedo_pool_size: The amount of torpedo turtles to create in
+            advance. Unregistered torpedo turtles are reused by new torpedos.
+        :type torpedo_pool_size: int
         """
 
+        import_gui()
         self._boundKeys = []
         self._init_keys_values()
         self._init_graphics()
+        self._init_torpedo_pool(torpedo_pool_size)
         self._bind_keys()
         self._screen.listen()
 
         self._ship = self._get_ship_obj(self._cv)
 
     def _init_keys_values(self):
-        self._specialTorpedFired = 0
-        self._rightClicks = 0
-        self._leftClicks = 0
-        self._upClicks = 0
-        self._fireClicks = 0
-        self._teleportClicks = 0
-        self._endGame = False
+        self._init_input()
         self._lives = []
         self._asteroids = {}
         self._torpedos = {}
+        self._pendingDraws = {}
+        self._lastDrawn = {}
+        self._drawCalls = 0
+        self._canvasMoves = 0
 
     def _init_graphics(self):
         self._root = tkinter.Tk()
@@ -159,9 +188,9 @@ class Screen:
         life2 = self._get_ship_obj(livesCanvas) #SpaceShip(livesCanvas,0,0,0,0)
         life3 = self._get_ship_obj(livesCanvas) #SpaceShip(livesCanvas,35,0,0,0)
 
-        self._draw_object(life1,-35,0)
-        self._draw_object(life2,0,0)
-        self._draw_object(life3,35,0)
+        self._move_object(life1,-35,0)
+        self._move_object(life2,0,0)
+        self._move_object(life3,35,0)
 
         self._lives = [life1, life2, life3]
 
@@ -213,28 +242,38 @@ class Screen:
         self._bind_key("q", self._handle_exit)
         self._bind_key("s", self._handle_special_torpedo)
         self._bind_key("t", self._handle_teleport)
+        for key in SCREEN_KEYS:
+            self._bind_release(key)
 
+    def _bind_release(self, key):
+        """
+        Binds the release of the given key to a release event in the input
+        queue.
+        """
+        self._screen.onkeyrelease(
+            lambda: self._inputQueue.release(SCREEN_KEYS[key]), key)
 
     def _handle_special_torpedo(self):
-        self._specialTorpedFired += 1
+        self._inputQueue.press(SCREEN_KEYS["s"])
 
     def _handle_exit(self):
         self._endGame = True
+        self._inputQueue.press(SCREEN_KEYS["q"])
 
     def _handle_left(self):
-        self._leftClicks += 1
+        self._inputQueue.press(SCREEN_KEYS["Left"])
 
     def _handle_right(self):
-        self._rightClicks += 1
+        self._inputQueue.press(SCREEN_KEYS["Right"])
 
     def _handle_up(self):
-        self._upClicks += 1
+        self._inputQueue.press(SCREEN_KEYS["Up"])
 
     def _handle_space(self):
-        self._fireClicks += 1
+        self._inputQueue.press(SCREEN_KEYS["space"])
 
     def _handle_teleport(self):
-        self._teleportClicks += 1
+        self._inputQueue.press(SCREEN_KEYS["t"])
 
     def start_screen(self):
         """
@@ -254,6 +293,7 @@ class Screen:
 
             **This method should not be called by you**
         """
+        self._flush_draws()
         self._screen.update()
 
     def set_score(self, val):
@@ -276,19 +316,67 @@ class Screen:
         asteroid.shape(ShapesMaster.ASTEROID_BASE_SHAPE%size)
         return asteroid
 
-    def _get_torpedo_object(self):
+    def _init_torpedo_pool(self, size):
+        self._freeTorpedos = []
+        for i in range(size):
+            torpedo = self._new_torpedo_object()
+            self._remove_object(torpedo)
+            self._freeTorpedos.append(torpedo)
+
+    def _new_torpedo_object(self):
         torpedo = RawTurtle(self._cv)
         torpedo.shape(ShapesMaster.TORPEDO_SHAPE)
         torpedo.color("blue")
         return torpedo
 
-    def _draw_object(self,obj,x,y,heading=None):
+    def _get_torpedo_object(self):
+        if self._freeTorpedos:
+            torpedo = self._freeTorpedos.pop()
+            torpedo.st()
+            return torpedo
+        return self._new_torpedo_object()
+
+    def _move_object(self,obj,x,y,heading=None):
         obj.penup()
         obj.goto(x,y)
-        if heading:
+        if heading is not None:
             obj.setheading(heading)
         obj.pendown()
 
+    def _draw_object(self,obj,x,y,heading=None):
+        # The drawing is done in the next update, so only the last drawing of
+        # every object in a frame is done.
+        self._drawCalls += 1
+        self._pendingDraws[obj] = (x, y, heading)
+
+    def _flush_draws(self):
+        """
+        Moves on the canvas every object that was drawn since the last update,
+        if it moved more than DRAW_THRESHOLD or turned since it was last
+        moved on the canvas.
+        """
+        for obj, (x, y, heading) in self._pendingDraws.items():
+            last = self._lastDrawn.get(obj)
+            if last is not None and \
+                    abs(x - last[0]) < Screen.DRAW_THRESHOLD and \
+                    abs(y - last[1]) < Screen.DRAW_THRESHOLD and \
+                    (heading is None or heading == last[2]):
+                continue
+            if heading is None and last is not None:
+                heading = last[2]
+            self._move_object(obj, x, y, heading)
+            self._lastDrawn[obj] = (x, y, heading)
+            self._canvasMoves += 1
+        self._pendingDraws.clear()
+
+    def get_draw_stats(self):
+        """
+        :returns: A tuple of the amount of draw calls and the amount of
+            objects that were actually moved on the canvas, since the game
+            started.
+        """
+        return self._drawCalls, self._canvasMoves
+
     def remove_life(self):
         """
         Remove one icon of life (starts with 3 lives)
@@ -329,6 +417,35 @@ class Screen:
         torpedo_obj = self._get_torpedo_object()
         self._torpedos[ id(torpedo) ] = torpedo_obj
 
+    def register_objects(self, asteroids, torpedos):
+        """
+        This is called to register many asteroids and torpedos at once (for
+        example when a saved game is restored)
+
+        :param asteroids: A list of (asteroid, size) tuples
+        :type asteroids: list
+        :param torpedos: A list of torpedo objects
+        :type torpedos: list
+        """
+        for asteroid, size in asteroids:
+            self._asteroids[id(asteroid)] = self._get_asteroid_object(size)
+        for torpedo in torpedos:
+            self._torpedos[id(torpedo)] = self._get_torpedo_object()
+
+    def unregister_objects(self, asteroids, torpedos):
+        """
+        This is called to un-register many asteroids and torpedos at once
+
+        :param asteroids: A list of asteroid objects
+        :type asteroids: list
+        :param torpedos: A list of torpedo objects
+        :type torpedos: list
+        """
+        for asteroid in asteroids:
+            self.unregister_asteroid(asteroid)
+        for torpedo in torpedos:
+            self.unregister_torpedo(torpedo)
+
     def draw_ship(self,x,y, heading):
         """
         Draw the ship at the given coordinates with the given heading
@@ -385,6 +502,8 @@ class Screen:
         self._draw_object(self._torpedos[torpedo_id], x, y, heading)
 
     def _remove_object(self, obj):
+        self._pendingDraws.pop(obj, None)
+        self._lastDrawn.pop(obj, None)
         obj.penup()
         obj.ht()
         obj.goto(Screen.SCREEN_MAX_X, Screen.SCREEN_MAX_Y*2)
@@ -405,6 +524,7 @@ class Screen:
         torpedo_obj = self._torpedos[ torpedo_id ]
         self._remove_object( torpedo_obj )
         self._torpedos.pop( torpedo_id )
+        self._freeTorpedos.append( torpedo_obj )
 
 
     def unregister_asteroid(self, asteroid):
@@ -433,54 +553,41 @@ class Screen:
         """
         return self._endGame
 
-
     def is_left_pressed(self):
         """
         :returns: True if the left key was pressed, else False
         """
-        res = self._leftClicks > 0
-        self._leftClicks -= 1 if res else 0
-        return res
+        return self._take_press("Left")
 
     def is_up_pressed(self):
         """
         :returns: True if the up key was pressed, else False
         """
-        res = self._upClicks > 0
-        self._upClicks -= 1 if res else 0
-        return res
+        return self._take_press("Up")
 
     def is_right_pressed(self):
         """
         :returns: True if the right key was pressed, else False
         """
-        res = self._rightClicks > 0
-        self._rightClicks -= 1 if res else 0
-        return res
+        return self._take_press("Right")
 
     def is_space_pressed(self):
         """
         :returns: True if the fire key was pressed, else False
         """
-        res = self._fireClicks > 0
-        self._fireClicks -= 1 if res else 0
-        return res
+        return self._take_press("space")
 
     def is_special_pressed(self):
         """
         :returns: True if the fire key was pressed, else False
         """
-        res = self._specialTorpedFired > 0
-        self._specialTorpedFired -= 1 if res else 0
-        return res
+        return self._take_press("s")
 
     def is_teleport_pressed(self):
         """
         :return: True if the teleport key was pressed, else False
         """
-        res = self._teleportClicks > 0
-        self._teleportClicks -= 1 if res else 0
-        return res
+        return self._take_press("t")
 
     def show_message(self,title, msg):
         """
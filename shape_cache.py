@@ -0,0 +1,95 @@
+import math
+import sys
+
+
+class RotatedShapeCache:
+    """
+    Class of RotatedShapeCache objects, keeps the rotated points of every
+    shape for every heading, so a shape is rotated only once for each heading.
+    The headings are rounded to a given resolution (in degrees), so there are
+    360 / resolution rotations of every shape at most.
+    The points are rotated like turtle does: the shape's y axis points to the
+    heading, and the y axis of the result points down, like on a canvas.
+    """
+
+    RESOLUTION = 1
+
+    def __init__(self, resolution=RESOLUTION):
+        """
+        Initialize a new empty RotatedShapeCache object.
+        :param resolution: the angular resolution, in degrees.
+        """
+        self.__resolution = resolution
+        self.__steps = max(1, round(360 / resolution))
+        self.__layouts = {}
+        self.__rotations = {}
+        self.__hits = 0
+        self.__misses = 0
+
+    def add_shape(self, name, layout):
+        """
+        Adds a shape to the cache.
+        :param name: the name of the shape
+        :param layout: a tuple of the shape's (x, y) points
+        :return: None
+        """
+        self.__layouts[name] = layout
+        self.__rotations[name] = [None] * self.__steps
+
+    def get(self, name, heading):
+        """
+        :param name: the name of a shape in the cache
+        :param heading: the heading in degrees
+        :return: a tuple of the shape's rotated points, flat (x1, y1, x2, ...)
+        """
+        step = round(heading / self.__resolution) % self.__steps
+        rotations = self.__rotations[name]
+        points = rotations[step]
+        if points is None:
+            self.__misses += 1
+            points = self.__rotate(self.__layouts[name],
+                                   step * self.__resolution)
+            rotations[step] = points
+        else:
+            self.__hits += 1
+        return points
+
+    def __rotate(self, layout, heading):
+        """
+        :return: a flat tuple of the layout's points rotated to the heading.
+        """
+        rad = math.radians(heading)
+        cos_h, sin_h = math.cos(rad), math.sin(rad)
+        points = []
+        for x, y in layout:
+            points.append(sin_h * x + cos_h * y)
+            points.append(cos_h * x - sin_h * y)
+        return tuple(points)
+
+    def get_hit_rate(self):
+        """
+        :return: the part of the get calls that found the rotation in the
+        cache (between 0 and 1).
+        """
+        calls = self.__hits + self.__misses
+        return self.__hits / calls if calls else 0.0
+
+    def get_memory_size(self):
+        """
+        :return: the approximate amount of bytes the cached rotations take.
+        """
+        size = 0
+        for rotations in self.__rotations.values():
+            size += sys.getsizeof(rotations)
+            for points in rotations:
+                if points is not None:
+                    size += sys.getsizeof(points) + \
+                        sum(sys.getsizeof(p) for p in points)
+        return size
+
+    def get_stats(self):
+        """
+        :return: a tuple of the amount of hits, the amount of misses and the
+        memory size in bytes of the cache.
+        """
+        return self.__hits, self.__misses, self.get_memory_size()
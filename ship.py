@@ -1,4 +1,4 @@
-import math
+import trig
 
 
 class Ship:
@@ -9,6 +9,9 @@ class Ship:
     and functions that change the ship's attributes if needed.
     """
 
+    __slots__ = ("__x_coor", "__x_speed", "__y_coor", "__y_speed",
+                 "__direction", "__radius")
+
     TURN_SHIP = 7
     SHIP_RADIUS = 1
 
@@ -21,10 +24,10 @@ class Ship:
         :param y_speed: y axis speed
         :param direction: the direction in degrees
         """
-        self.__x_coor = x_coor
-        self.__x_speed = x_speed
-        self.__y_coor = y_coor
-        self.__y_speed = y_speed
+        self.__x_coor = float(x_coor)
+        self.__x_speed = float(x_speed)
+        self.__y_coor = float(y_coor)
+        self.__y_speed = float(y_speed)
         self.__direction = direction
         self.__radius = self.SHIP_RADIUS
 
@@ -41,7 +44,25 @@ class Ship:
         ship coordinates to.
         :return: None
         """
-        self.__x_coor, self.__y_coor = new_coor
+        x_coor, y_coor = new_coor
+        self.__x_coor = float(x_coor)
+        self.__y_coor = float(y_coor)
+
+    def advance(self, x_range, y_range):
+        """
+        Moves the ship by its speed, around the screen's edges.
+        :param x_range: a tuple of the minimum x coordinate of the screen and
+        the screen's width
+        :param y_range: a tuple of the minimum y coordinate of the screen and
+        the screen's height
+        :return: None
+        """
+        min_x, delta_x = x_range
+        min_y, delta_y = y_range
+        self.__x_coor = (self.__x_speed + self.__x_coor - min_x) % delta_x + \
+            min_x
+        self.__y_coor = (self.__y_speed + self.__y_coor - min_y) % delta_y + \
+            min_y
 
     def get_speed(self):
         """
@@ -80,8 +101,5 @@ class Ship:
         Accelerates the ship's speed in both axises.
         :return: None
         """
-        new_speed_x = self.get_speed()[0] + \
-                      math.cos(math.radians(self.__direction))
-        new_speed_y = self.get_speed()[1] + \
-                      math.sin(math.radians(self.__direction))
-        self.__x_speed, self.__y_speed = new_speed_x, new_speed_y
+        self.__x_speed += trig.cos_deg(self.__direction)
+        self.__y_speed += trig.sin_deg(self.__direction)
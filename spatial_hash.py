@@ -0,0 +1,151 @@
+import math
+
+
+class SpatialHash:
+    """
+    Class of SpatialHash objects, a uniform grid over the screen that keeps
+    every object in the cell its center is in. The screen wraps around its
+    edges, so the grid does too: the cells on one edge are neighbours of the
+    cells on the opposite edge.
+    The grid lets the game check a torpedo or the ship only against the
+    objects that are near it, instead of against all the objects.
+    """
+
+    CELL_SIZE = 50
+
+    def __init__(self, min_x, max_x, min_y, max_y, cell_size=CELL_SIZE):
+        """
+        Initialize a new empty SpatialHash object.
+        :param min_x: the minimum x coordinate of the screen
+        :param max_x: the maximum x coordinate of the screen
+        :param min_y: the minimum y coordinate of the screen
+        :param max_y: the maximum y coordinate of the screen
+        :param cell_size: the width and height of every cell
+        """
+        self.__min_x = min_x
+        self.__min_y = min_y
+        self.__width = max_x - min_x
+        self.__height = max_y - min_y
+        self.__cell_size = cell_size
+        self.__cols = math.ceil(self.__width / cell_size)
+        self.__rows = math.ceil(self.__height / cell_size)
+        # Every cell is a dictionary (used as an ordered set) of the objects
+        # in it, so the order of the checks doesn't depend on the objects ids.
+        self.__cells = [{} for _ in range(self.__cols * self.__rows)]
+        self.__obj_cell = {}
+        self.__max_radius = 0
+        self.pairs_tested = 0
+
+    def __len__(self):
+        return len(self.__obj_cell)
+
+    def __cell_index(self, x, y):
+        """
+        :return: the index of the cell that contains the given coordinates.
+        """
+        col = int((x - self.__min_x) // self.__cell_size) % self.__cols
+        row = int((y - self.__min_y) // self.__cell_size) % self.__rows
+        return row * self.__cols + col
+
+    def insert(self, obj):
+        """
+        Adds the given object to the grid.
+        :param obj: an object with get_coor and get_radius functions.
+        :return: None
+        """
+        x, y = obj.get_coor()
+        index = self.__cell_index(x, y)
+        self.__cells[index][obj] = None
+        self.__obj_cell[obj] = index
+        self.__max_radius = max(self.__max_radius, obj.get_radius())
+
+    def remove(self, obj):
+        """
+        Removes the given object from the grid.
+        :param obj: an object that was inserted to the grid.
+        :return: None
+        """
+        index = self.__obj_cell.pop(obj)
+        del self.__cells[index][obj]
+
+    def move(self, obj):
+        """
+        Updates the cell of the given object after its coordinates changed.
+        The object is moved between cells only if it left its cell.
+        :param obj: an object that was inserted to the grid.
+        :return: None
+        """
+        x, y = obj.get_coor()
+        index = self.__cell_index(x, y)
+        old_index = self.__obj_cell[obj]
+        if index != old_index:
+            del self.__cells[old_index][obj]
+            self.__cells[index][obj] = None
+            self.__obj_cell[obj] = index
+
+    def query(self, x, y, radius):
+        """
+        Finds the objects whose cells may hold an object that is up to the
+        given radius (plus the biggest radius in the grid) from the given
+        coordinates.
+        :return: a list of the candidate objects.
+        """
+        reach = radius + self.__max_radius
+        first_col = int((x - reach - self.__min_x) // self.__cell_size)
+        last_col = int((x + reach - self.__min_x) // self.__cell_size)
+        first_row = int((y - reach - self.__min_y) // self.__cell_size)
+        last_row = int((y + reach - self.__min_y) // self.__cell_size)
+        # A small grid may be covered more than once, so the columns and
+        # the rows are taken only once each after wrapping.
+        cols = dict.fromkeys(col % self.__cols for col in
+                             range(first_col, min(last_col, first_col +
+                                                  self.__cols - 1) + 1))
+        rows = dict.fromkeys(row % self.__rows for row in
+                             range(first_row, min(last_row, first_row +
+                                                  self.__rows - 1) + 1))
+        candidates = []
+        for row in rows:
+            for col in cols:
+                candidates.extend(self.__cells[row * self.__cols + col])
+        return candidates
+
+    def find_intersections(self, obj):
+        """
+        Finds all the objects in the grid that intersect the given object.
+        The distance is measured around the screen's edges as well.
+        :param obj: an object with get_coor and get_radius functions.
+        :return: a list of the intersecting objects in the grid.
+        """
+        x, y = obj.get_coor()
+        radius = obj.get_radius()
+        hits = []
+        for other in self.query(x, y, radius):
+            self.pairs_tested += 1
+            other_x, other_y = other.get_coor()
+            delta_x = abs(other_x - x) % self.__width
+            delta_y = abs(other_y - y) % self.__height
+            delta_x = min(delta_x, self.__width - delta_x)
+            delta_y = min(delta_y, self.__height - delta_y)
+            max_dist = radius + other.get_radius()
+            if delta_x * delta_x + delta_y * delta_y <= max_dist * max_dist:
+                hits.append(other)
+        return hits
+
+    def is_free(self, x, y, radius):
+        """
+        Checks if an object of the given radius in the given coordinates
+        would intersect any object in the grid (like find_intersections).
+        :return: True if it wouldn't intersect any object, and False
+        otherwise.
+        """
+        for other in self.query(x, y, radius):
+            self.pairs_tested += 1
+            other_x, other_y = other.get_coor()
+            delta_x = abs(other_x - x) % self.__width
+            delta_y = abs(other_y - y) % self.__height
+            delta_x = min(delta_x, self.__width - delta_x)
+            delta_y = min(delta_y, self.__height - delta_y)
+            max_dist = radius + other.get_radius()
+            if delta_x * delta_x + delta_y * delta_y <= max_dist * max_dist:
+                return False
+        return True
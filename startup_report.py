@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# The modules whose cold start is measured by default: the game's entry
+# point and the modules the headless tools import.
+ENTRY_MODULES = ("asteroids_main", "headless_screen", "screen")
+# Modules that are slow to import, and that a headless start shouldn't need.
+HEAVY_MODULES = ("numpy", "tkinter", "turtle")
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 10
+DEFAULT_TOLERANCE = 0.2
+# Cold start changes below this amount of milliseconds are noise of the
+# process start, and are not regressions.
+NOISE_MS = 5
+
+
+def run_python(code, *options):
+    """
+    Runs Python code in a new interpreter, in this file's directory.
+    :param code: the code to run
+    :param options: interpreter options to add (like "-X", "importtime")
+    :return: the subprocess.CompletedProcess object of the run
+    """
+    return subprocess.run(
+        [sys.executable, *options, "-c", code], capture_output=True,
+        text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(code):
+    """
+    Runs Python code in a new interpreter with -X importtime.
+    :param code: the code to run
+    :return: a list of (name, self time, cumulative time, depth) tuples of
+    every imported module, in the order -X importtime reports them (a module
+    after the modules it imported). The times are in microseconds.
+    """
+    stderr = run_python(code, "-X", "importtime").stderr
+    times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            # The title line.
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((name.strip(), int(self_time), int(cumulative), depth))
+    return times
+
+
+def module_import_times(module):
+    """
+    :return: the import_times of importing the given module, without the
+    modules the interpreter imports when it starts.
+    """
+    startup = {entry[0] for entry in import_times("pass")}
+    return [entry for entry in import_times("import " + module)
+            if entry[0] not in startup]
+
+
+# The code that times an import inside a new interpreter, so the time of
+# the interpreter's own start isn't measured.
+COLD_START_CODE = "import time\n" \
+                  "start = time.perf_counter()\n" \
+                  "import %s\n" \
+                  "print(time.perf_counter() - start)"
+
+
+def cold_start(module, runs):
+    """
+    Measures the time a new interpreter takes to import a module. The import
+    is timed inside the interpreter, and is measured in a few interpreters.
+    :param module: the name of the module
+    :param runs: the amount of interpreters to measure in
+    :return: a tuple of the shortest time and the difference between the
+    longest and the shortest time, in milliseconds
+    """
+    times = [float(run_python(COLD_START_CODE % module).stdout) * 1000
+             for run in range(runs)]
+    return min(times), max(times) - min(times)
+
+
+def measure(module, runs, top):
+    """
+    :return: a dictionary of the startup results of the given module
+    """
+    times = module_import_times(module)
+    by_self = sorted(times, key=lambda entry: entry[1], reverse=True)
+    names = {entry[0] for entry in times}
+    cold_start_ms, spread_ms = cold_start(module, runs)
+    return {
+        "cold_start_ms": cold_start_ms,
+        "cold_start_spread_ms": spread_ms,
+        "import_ms": sum(entry[2] for entry in times
+                         if entry[3] == 0) / 1000,
+        "modules": len(times),
+        "heavy_modules": [name for name in HEAVY_MODULES if name in names],
+        "top_self_ms": [[name, self_time / 1000, cumulative / 1000]
+                        for name, self_time, cumulative, depth
+                        in by_self[:top]],
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Compares results to a baseline. A module regressed if its cold start is
+    longer by more than the tolerance (and NOISE_MS), or if it imports a
+    heavy module it didn't import before.
+    :param results: a dictionary of modules results
+    :param baseline: a dictionary of modules results to compare to
+    :param tolerance: the allowed relative change (0.1 is 10%)
+    :return: a list of messages, one for every regression
+    """
+    regressions = []
+    for module, result in results.items():
+        if module not in baseline:
+            continue
+        base = baseline[module]
+        if result["cold_start_ms"] > \
+                base["cold_start_ms"] * (1 + tolerance) + NOISE_MS:
+            regressions.append("%s: cold start %.1f ms -> %.1f ms" % (
+                module, base["cold_start_ms"], result["cold_start_ms"]))
+        for name in result["heavy_modules"]:
+            if name not in base["heavy_modules"]:
+                regressions.append("%s: now imports %s" % (module, name))
+    return regressions
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Reports the import time of the game's modules in a new "
+                    "interpreter.")
+    parser.add_argument("-m", "--module", action="append", dest="modules",
+                        help="a module to measure (can be given a few times, "
+                             "the modules in ENTRY_MODULES are measured if "
+                             "none is given)")
+    parser.add_argument("-n", "--runs", type=int, default=DEFAULT_RUNS,
+                        help="the amount of cold starts to take the shortest "
+                             "of")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help="the amount of slowest imports to show")
+    parser.add_argument("-o", "--output", help="a JSON file to save the "
+                                               "results to")
+    parser.add_argument("-b", "--baseline", help="a JSON file of results to "
+                                                 "compare to")
+    parser.add_argument("-t", "--tolerance", type=float,
+                        default=DEFAULT_TOLERANCE,
+                        help="the allowed relative change from the baseline")
+    options = parser.parse_args(args)
+
+    results = {}
+    for module in options.modules or ENTRY_MODULES:
+        result = measure(module, options.runs, options.top)
+        results[module] = result
+        print("%s: cold start %.1f ms (spread %.1f ms), imports %.1f ms, %d "
+              "modules, heavy: %s" % (
+                  module, result["cold_start_ms"],
+                  result["cold_start_spread_ms"], result["import_ms"],
+                  result["modules"],
+                  ", ".join(result["heavy_modules"]) or "none"))
+        print("  %-40s %10s %10s" % ("slowest imports", "self (ms)",
+                                     "total (ms)"))
+        for name, self_time, cumulative in result["top_self_ms"]:
+            print("  %-40s %10.2f %10.2f" % (name, self_time, cumulative))
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file),
+                                           options.tolerance)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
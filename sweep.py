@@ -0,0 +1,282 @@
+import argparse
+import array
+import concurrent.futures
+import itertools
+import json
+import os
+import random
+import struct
+import sys
+import time
+
+from asteroids_main import GameRunner, DEFAULT_ASTEROIDS_NUM
+from headless_screen import HeadlessScreen
+
+# The GameRunner constants a sweep can change, and the name of the starting
+# asteroids amount.
+PARAMETERS = ("AST_MAX_SPEED", "AST_MIN_SPEED", "MAX_TORPEDOS",
+              "MAX_LIFE_TIME", "SPECIAL_TORPEDOS_AMOUNT")
+ASTEROIDS_PARAMETER = "ASTEROIDS"
+
+# The result columns of every game, with their array type codes.
+RESULT_COLUMNS = (("seed", "q"), ("score", "q"), ("survival_ticks", "q"),
+                  ("tick_ns", "d"))
+
+MAGIC = b"ACOL"
+CHUNK_ROWS = 1024
+# The amount of games submitted to every worker before waiting for results.
+MAX_PENDING = 4
+# The chance of every key to be pressed in a tick by the sweep's player.
+KEYS_CHANCES = (("space", 0.3), ("Left", 0.1), ("Right", 0.1), ("Up", 0.05),
+                ("s", 0.01), ("t", 0.002))
+
+
+def runner_class(constants):
+    """
+    Makes a GameRunner class with the given constants. The torpedos pool
+    size is computed again from the torpedos limits, like GameRunner's.
+    :param constants: a dictionary of GameRunner constants to change
+    :return: the new class
+    """
+    constants = dict(constants)
+    limits = {name: constants.get(name, getattr(GameRunner, name))
+              for name in ("MAX_TORPEDOS", "MAX_SPECIAL_TORPEDOS",
+                           "SPECIAL_TORPEDOS_AMOUNT")}
+    constants["TORPEDO_POOL_SIZE"] = limits["MAX_TORPEDOS"] + \
+        limits["MAX_SPECIAL_TORPEDOS"] * limits["SPECIAL_TORPEDOS_AMOUNT"]
+    return type("SweepGameRunner", (GameRunner,), constants)
+
+
+def check_overrides(overrides):
+    """
+    Checks if a game can be played with the given constants.
+    :param overrides: a dictionary of GameRunner constants to change (and
+    maybe the ASTEROIDS_PARAMETER)
+    :return: a message of what is wrong with the constants, or None if
+    nothing is wrong
+    """
+    for name, value in overrides.items():
+        if value < 0:
+            return "%s is negative" % name
+    if overrides.get("AST_MIN_SPEED", GameRunner.AST_MIN_SPEED) > \
+            overrides.get("AST_MAX_SPEED", GameRunner.AST_MAX_SPEED):
+        return "AST_MIN_SPEED is more than AST_MAX_SPEED"
+    return None
+
+
+def play_game(overrides, seed, max_ticks):
+    """
+    Plays a headless game with the given constants, where the keys are
+    pressed randomly by the seed.
+    :param overrides: a dictionary of GameRunner constants to change (and
+    maybe the ASTEROIDS_PARAMETER)
+    :param seed: the seed of the game and of its player
+    :param max_ticks: the maximum amount of ticks to play
+    :return: a tuple of the seed, the score, the amount of ticks the game
+    lasted and the average tick time in nanoseconds
+    """
+    constants = dict(overrides)
+    asteroids_amount = constants.pop(ASTEROIDS_PARAMETER,
+                                     DEFAULT_ASTEROIDS_NUM)
+    screen = HeadlessScreen()
+    runner = runner_class(constants)(asteroids_amount, screen, seed=seed)
+    player = random.Random(seed)
+    ticks = 0
+    start = time.perf_counter_ns()
+    while ticks < max_ticks and not runner.is_game_over():
+        for key, chance in KEYS_CHANCES:
+            if player.random() < chance:
+                screen.press(key)
+        runner._game_loop()
+        ticks += 1
+    elapsed = time.perf_counter_ns() - start
+    return seed, runner.get_score(), ticks, elapsed / max(ticks, 1)
+
+
+class ColumnWriter:
+    """
+    Class of ColumnWriter objects, writes rows to a columnar file. The rows
+    are kept until there are CHUNK_ROWS of them, and then they are written
+    as a chunk with every column in one binary array.
+    The file starts with a header of the columns names and types.
+    """
+
+    def __init__(self, path, columns):
+        """
+        Initialize a new ColumnWriter object, and writes the file's header.
+        :param path: the path of the file
+        :param columns: a tuple of (name, array type code) tuples
+        """
+        self.__file = open(path, "wb")
+        self.__arrays = [array.array(code) for name, code in columns]
+        header = json.dumps(columns).encode()
+        self.__file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write_row(self, row):
+        """
+        Adds a row, and writes a chunk if there are enough rows.
+        :param row: a tuple of the row's values, in the columns' order
+        :return: None
+        """
+        for column, value in zip(self.__arrays, row):
+            column.append(value)
+        if len(self.__arrays[0]) >= CHUNK_ROWS:
+            self.__write_chunk()
+
+    def __write_chunk(self):
+        """
+        Writes the kept rows as a chunk: the amount of rows, and then every
+        column's array.
+        :return: None
+        """
+        rows = len(self.__arrays[0])
+        if rows == 0:
+            return
+        self.__file.write(struct.pack("<I", rows))
+        for column in self.__arrays:
+            column.tofile(self.__file)
+            del column[:]
+
+    def close(self):
+        """
+        Writes the rows left and closes the file.
+        :return: None
+        """
+        self.__write_chunk()
+        self.__file.close()
+
+
+def read_columns(path):
+    """
+    Reads a file that was written by a ColumnWriter.
+    :param path: the path of the file
+    :return: a dictionary of every column's name and its array of values
+    """
+    with open(path, "rb") as col_file:
+        if col_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("%s is not a columns file" % path)
+        header_size = struct.unpack("<I", col_file.read(4))[0]
+        columns = json.loads(col_file.read(header_size))
+        arrays = [array.array(code) for name, code in columns]
+        rows_bytes = col_file.read(4)
+        while rows_bytes:
+            rows = struct.unpack("<I", rows_bytes)[0]
+            for column in arrays:
+                column.fromfile(col_file, rows)
+            rows_bytes = col_file.read(4)
+    return {name: column for (name, code), column in zip(columns, arrays)}
+
+
+def parse_parameter(text):
+    """
+    Parses a parameter option like "MAX_TORPEDOS=5,10,20".
+    :return: a tuple of the parameter's name and a list of its values
+    """
+    name, values = text.split("=", 1)
+    if name not in PARAMETERS and name != ASTEROIDS_PARAMETER:
+        raise argparse.ArgumentTypeError("unknown parameter %s" % name)
+    return name, [int(value) for value in values.split(",")]
+
+
+def write_results(writer, names, running, return_when):
+    """
+    Waits for running games, and writes the results of the games that ended.
+    :param writer: a ColumnWriter object
+    :param names: the names of the swept parameters
+    :param running: a dictionary of the running games' futures and constants,
+    the ended games are removed from it
+    :param return_when: when to stop waiting (like concurrent.futures.wait)
+    :return: the amount of written results
+    """
+    done = concurrent.futures.wait(running, return_when=return_when)[0]
+    for future in done:
+        overrides = running.pop(future)
+        writer.write_row(tuple(overrides[name] for name in names) +
+                         future.result())
+    return len(done)
+
+
+def run_sweep(parameters, seeds, max_ticks, path, workers=None):
+    """
+    Plays a game for every combination of the parameters' values and every
+    seed, in parallel on all the cores, and writes the results to a columnar
+    file as they arrive (not in order). Combinations that a game can't be
+    played with (see check_overrides) are skipped.
+    :param parameters: a list of (name, values list) tuples
+    :param seeds: the amount of seeds to play every combination with
+    :param max_ticks: the maximum amount of ticks of every game
+    :param path: the path of the results file
+    :param workers: the amount of processes (all the cores if None)
+    :return: a tuple of the amount of games that were played, and a list of
+    (constants dictionary, message) tuples of the skipped combinations
+    """
+    names = [name for name, values in parameters]
+    combinations = []
+    skipped = []
+    for values in itertools.product(*[values for name, values in
+                                      parameters]):
+        overrides = dict(zip(names, values))
+        message = check_overrides(overrides)
+        if message is None:
+            combinations.append(overrides)
+        else:
+            skipped.append((overrides, message))
+    games = ((overrides, seed) for overrides in combinations
+             for seed in range(seeds))
+    workers = workers or os.cpu_count()
+    writer = ColumnWriter(path, tuple((name, "q") for name in names) +
+                          RESULT_COLUMNS)
+    played = 0
+    try:
+        with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            running = {}
+            for overrides, seed in games:
+                # Only a few games are submitted at once, so a big sweep
+                # doesn't keep all of its games in memory.
+                if len(running) >= MAX_PENDING * workers:
+                    played += write_results(
+                        writer, names, running,
+                        concurrent.futures.FIRST_COMPLETED)
+                future = executor.submit(play_game, overrides, seed,
+                                         max_ticks)
+                running[future] = overrides
+            played += write_results(writer, names, running,
+                                    concurrent.futures.ALL_COMPLETED)
+    finally:
+        writer.close()
+    return played, skipped
+
+
+def main(args):
+    parser = argparse.ArgumentParser(
+        description="Plays many headless games with different GameRunner "
+                    "constants, and saves the results to a columnar file.")
+    parser.add_argument("-p", "--param", action="append", default=[],
+                        type=parse_parameter, dest="parameters",
+                        help="a constant and its values, like "
+                             "MAX_TORPEDOS=5,10,20 (one of %s or %s)" % (
+                                 ", ".join(PARAMETERS), ASTEROIDS_PARAMETER))
+    parser.add_argument("-n", "--seeds", type=int, default=10,
+                        help="the amount of seeds of every combination")
+    parser.add_argument("-t", "--ticks", type=int, default=5000,
+                        help="the maximum amount of ticks of every game")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="the amount of processes (all the cores by "
+                             "default)")
+    parser.add_argument("-o", "--output", default="sweep.col",
+                        help="the results file")
+    options = parser.parse_args(args)
+
+    start = time.perf_counter()
+    played, skipped = run_sweep(options.parameters, options.seeds,
+                                options.ticks, options.output,
+                                options.workers)
+    for overrides, message in skipped:
+        print("Skipped %s: %s" % (overrides, message))
+    print("Played %d games in %.1f seconds, the results are in %s" % (
+        played, time.perf_counter() - start, options.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from asteroid import Asteroid, find_intersections
+from spatial_hash import SpatialHash
+from torpedo import Torpedo
+
+
+def random_objects(rand, amount, radius):
+    return [(rand.uniform(-500, 500), rand.uniform(-500, 500), radius)
+            for _ in range(amount)]
+
+
+def columns(objects):
+    return [[obj[i] for obj in objects] for i in range(3)]
+
+
+def test_pairs_are_sorted():
+    pairs = find_intersections([0, 100], [0, 0], [4, 4],
+                               [300, 5, 95, 0], [0, 0, 0, 8], [10, 2, 10, 5])
+    assert pairs == [(0, 1), (0, 3), (1, 2)]
+
+
+@pytest.mark.parametrize("asteroids_amount", [3, 2000])
+def test_same_pairs_as_has_intersection(asteroids_amount):
+    # The small groups are checked in Python, and the big ones with NumPy.
+    rand = random.Random(asteroids_amount)
+    torpedos = [Torpedo(rand.uniform(-500, 500), 0, rand.uniform(-500, 500),
+                        0, 0) for _ in range(20)]
+    asteroids = [Asteroid(rand.uniform(-500, 500), 0,
+                          rand.uniform(-500, 500), 0, rand.randint(1, 3))
+                 for _ in range(asteroids_amount)]
+    expected = [(i, j) for i, tor in enumerate(torpedos)
+                for j, ast in enumerate(asteroids)
+                if ast.has_intersection(tor)]
+    assert find_intersections(
+        [tor.get_coor()[0] for tor in torpedos],
+        [tor.get_coor()[1] for tor in torpedos],
+        [tor.get_radius() for tor in torpedos],
+        [ast.get_coor()[0] for ast in asteroids],
+        [ast.get_coor()[1] for ast in asteroids],
+        [ast.get_radius() for ast in asteroids]) == expected
+
+
+def test_has_intersection_touching_objects():
+    asteroid = Asteroid(0, 0, 0, 0, 2)
+    radius = asteroid.get_radius() + Torpedo(0, 0, 0, 0, 0).get_radius()
+    assert asteroid.has_intersection(Torpedo(radius, 0, 0, 0, 0))
+    assert not asteroid.has_intersection(Torpedo(radius + 0.5, 0, 0, 0, 0))
+
+
+def test_distance_wraps_around_the_edges():
+    pairs = find_intersections([495, 0], [0, -499], [4, 4],
+                               [-495, 0, 300], [0, 499, 300], [10, 2, 10],
+                               1000, 1000)
+    assert pairs == [(0, 0), (1, 1)]
+    # Without the screen's size the distance doesn't wrap.
+    assert find_intersections([495], [0], [4], [-495], [0], [10]) == []
+
+
+@pytest.mark.parametrize("asteroids_amount", [3, 2000])
+def test_same_pairs_as_the_spatial_hash(asteroids_amount):
+    # The small groups are checked in Python, and the big ones with NumPy.
+    rand = random.Random(asteroids_amount)
+    torpedos = random_objects(rand, 20, Torpedo.TORPEDO_RADIUS)
+    asteroids = [Asteroid(x, 0, y, 0, rand.randint(1, 3))
+                 for x, y, radius in random_objects(rand, asteroids_amount, 0)]
+    grid = SpatialHash(-500, 500, -500, 500)
+    for ast in asteroids:
+        grid.insert(ast)
+    expected = []
+    for i, (x, y, radius) in enumerate(torpedos):
+        hits = grid.find_intersections(Torpedo(x, 0, y, 0, 0))
+        expected.extend(sorted((i, asteroids.index(ast)) for ast in hits))
+    ast_columns = columns([ast.get_coor() + (ast.get_radius(),)
+                           for ast in asteroids])
+    assert find_intersections(*columns(torpedos), *ast_columns,
+                              1000, 1000) == expected
+
+
+def test_has_intersection_wraps_around_the_edges():
+    asteroid = Asteroid(-495, 0, 0, 0, 2)
+    torpedo = Torpedo(495, 0, 0, 0, 0)
+    assert asteroid.has_intersection(torpedo, 1000, 1000)
+    assert not asteroid.has_intersection(torpedo)
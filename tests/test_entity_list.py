@@ -0,0 +1,36 @@
+import random
+
+from entity_list import EntityList
+
+
+def test_remove_moves_the_last_object():
+    a, b, c, d, e = objects = [object() for i in range(5)]
+    entities = EntityList()
+    for value, obj in enumerate(objects):
+        entities.add(obj, value)
+    entities.remove(b)
+    assert list(entities) == [a, e, c, d]
+    assert entities.get(e) == 4
+    entities.remove(d)
+    assert list(entities) == [a, e, c]
+    assert d not in entities and b not in entities
+    assert len(entities) == 3
+
+
+def test_values_stay_with_their_objects():
+    rand = random.Random(0)
+    entities = EntityList()
+    expected = []
+    for step in range(2000):
+        if expected and rand.random() < 0.4:
+            obj = rand.choice(expected)
+            entities.remove(obj)
+            expected.remove(obj)
+        else:
+            obj = object()
+            entities.add(obj, step)
+            expected.append(obj)
+            entities.set(obj, id(obj))
+    assert sorted(map(id, entities)) == sorted(map(id, expected))
+    for obj, value in entities.items():
+        assert entities.get(obj) == value == id(obj)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+from game_server import GameServer, GameClient
+
+
+async def start(tmp_path, clients_amount):
+    """
+    Starts a server on a temporary Unix socket and connects clients to it.
+    :return: a tuple of the server, its listener and the clients
+    """
+    server = GameServer(10, seed=1)
+    path = os.path.join(str(tmp_path), "game.sock")
+    listener = await server.start_unix(path)
+    clients = [await GameClient.connect_unix(path)
+               for i in range(clients_amount)]
+    while server.get_clients_amount() < clients_amount:
+        await asyncio.sleep(0.01)
+    return server, listener, clients
+
+
+async def stop(server, listener, clients, tasks):
+    for client in clients:
+        client.close()
+    # The server's handlers end when they see the clients are gone.
+    while server.get_clients_amount():
+        await asyncio.sleep(0.01)
+    listener.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_clients_get_the_same_states(tmp_path):
+    async def run():
+        server, listener, clients = await start(tmp_path, 2)
+        bases = [[], []]
+
+        async def follow(client, index):
+            while await client.receive():
+                bases[index].append(client.message["base"])
+                if index == 0 and client.tick % 5 == 0:
+                    client.press("space", "left")
+
+        tasks = [asyncio.ensure_future(follow(client, i))
+                 for i, client in enumerate(clients)]
+        for tick in range(100):
+            server.step()
+            await asyncio.sleep(0.002)
+        await asyncio.sleep(0.1)
+        states = [(client.tick, client.objects) for client in clients]
+        await stop(server, listener, clients, tasks)
+        return server, states, bases
+
+    server, states, bases = asyncio.run(run())
+    # Both clients applied the last tick, and have the server's state.
+    assert states[0] == states[1]
+    tick, objects = states[0]
+    assert tick == server.get_tick()
+    assert objects == {obj_id: list(obj) for obj_id, obj in
+                       server.get_state(tick).items()}
+    # The first message has the full state, and the acks make the next
+    # ones deltas.
+    for client_bases in bases:
+        assert client_bases[0] is None
+        assert any(base is not None for base in client_bases[1:])
+    # The player's keys were pressed.
+    assert server.get_runner().get_torpedos()[0] or \
+        server.get_runner().get_score() > 0
+
+
+def test_bad_lines_are_skipped(tmp_path):
+    async def run():
+        server, listener, clients = await start(tmp_path, 1)
+        reader, writer = await asyncio.open_unix_connection(
+            os.path.join(str(tmp_path), "game.sock"))
+        writer.write(b'[]\n1\n{"keys": 5}\nnot json\n{"keys": ["up"]}\n')
+        await writer.drain()
+        await asyncio.sleep(0.1)
+        clients_amount = server.get_clients_amount()
+        keys = server.next_keys()
+        writer.close()
+        await stop(server, listener, clients, [])
+        return clients_amount, keys
+
+    clients_amount, keys = asyncio.run(run())
+    assert clients_amount == 2
+    assert keys[0] == 1
+
+
+def test_long_line_drops_the_client(tmp_path):
+    errors = []
+
+    async def run():
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context))
+        server, listener, clients = await start(tmp_path, 1)
+        reader, writer = await asyncio.open_unix_connection(
+            os.path.join(str(tmp_path), "game.sock"))
+        while server.get_clients_amount() < 2:
+            await asyncio.sleep(0.01)
+        writer.write(b"x" * 2 ** 17 + b"\n")
+        await writer.drain()
+        await asyncio.sleep(0.1)
+        clients_amount = server.get_clients_amount()
+        writer.close()
+        await stop(server, listener, clients, [])
+        return clients_amount
+
+    assert asyncio.run(run()) == 1
+    assert errors == []
+
+
+def test_tick_times_are_bounded():
+    server = GameServer(5)
+    for tick in range(GameServer.TICK_TIMES + 10):
+        server.step()
+    assert len(server.get_tick_times()) == GameServer.TICK_TIMES
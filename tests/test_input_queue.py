@@ -0,0 +1,84 @@
+from headless_screen import HeadlessScreen
+from input_queue import InputQueue, KEYS, SCREEN_KEYS
+from instrumentation import percentile
+
+UP = KEYS.index("up")
+SPACE = KEYS.index("space")
+
+
+def test_drain_counts_the_presses():
+    queue = InputQueue()
+    for i in range(3):
+        queue.press(SPACE, 0)
+        queue.release(SPACE, 0)
+    queue.press(UP, 0)
+    counts = queue.drain(0)
+    assert counts[SPACE] == 3 and counts[UP] == 1
+    assert sum(counts) == 4
+    assert len(queue) == 0
+    assert queue.get_held()[UP] == 1 and queue.get_held()[SPACE] == 0
+    assert queue.drain(0) == (0,) * len(KEYS)
+
+
+def test_full_buffer_drops_the_oldest_events():
+    queue = InputQueue(capacity=4)
+    # The events go around the ring a few times.
+    for i in range(3):
+        queue.press(UP, 0)
+        assert queue.drain(0)[UP] == 1
+    for i in range(6):
+        queue.press(SPACE if i < 2 else UP, 0)
+    assert len(queue) == 4
+    assert queue.get_dropped() == 2
+    counts = queue.drain(0)
+    assert counts[UP] == 4 and counts[SPACE] == 0
+
+
+def test_latency_stats():
+    queue = InputQueue()
+    assert queue.get_latency_stats()["presses"] == 0
+    # Presses 1 to 100 milliseconds before the drain.
+    for delay in range(1, 101):
+        queue.press(UP, (100 - delay) * 10 ** 6)
+    queue.drain(100 * 10 ** 6)
+    stats = queue.get_latency_stats()
+    assert stats["presses"] == 100
+    assert stats["p50_ms"] == 50
+    assert stats["p99_ms"] == 99
+    assert stats["max_ms"] == 100
+
+
+def test_latency_samples_are_the_latest():
+    queue = InputQueue()
+    for i in range(InputQueue.LATENCY_SAMPLES):
+        queue.press(UP, 0)
+        queue.drain(10 ** 9)
+    for i in range(InputQueue.LATENCY_SAMPLES):
+        queue.press(UP, 0)
+        queue.drain(10 ** 6)
+    stats = queue.get_latency_stats()
+    assert stats["presses"] == 2 * InputQueue.LATENCY_SAMPLES
+    assert stats["max_ms"] == 1
+
+
+def test_percentile():
+    values = list(range(1, 11))
+    assert percentile(values, 50) == 5
+    assert percentile(values, 99) == 10
+    assert percentile(values, 0) == 1
+    assert percentile([7], 99) == 7
+
+
+def test_screen_uses_every_press_once():
+    screen = HeadlessScreen()
+    for i in range(3):
+        screen.press("Up")
+    screen.press("space")
+    assert screen.is_up_pressed()
+    keys = screen.drain_keys()
+    assert keys[SCREEN_KEYS["Up"]] == 2
+    assert keys[SCREEN_KEYS["space"]] == 1
+    assert not screen.is_up_pressed()
+    assert screen.drain_keys()[-1] == 0
+    screen.press("q")
+    assert screen.drain_keys()[-1] == 1
@@ -0,0 +1,90 @@
+import random
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from placement import Placement
+
+
+def new_placement():
+    return Placement(-500, 500, -500, 500)
+
+
+def random_circles(rand, amount, min_distance=10, max_distance=60):
+    return [(rand.uniform(-500, 500), rand.uniform(-500, 500),
+             rand.uniform(min_distance, max_distance))
+            for _ in range(amount)]
+
+
+def test_distance_wraps_around_the_edges():
+    placement = new_placement()
+    assert not placement.is_clear(495, 0, [(-495, 0, 26)])
+    assert not placement.is_clear(0, -499, [(0, 499, 5)])
+    assert not placement.is_clear(500, 500, [(-500, -500, 1)])
+    assert placement.is_clear(470, 0, [(-495, 0, 26)])
+
+
+def test_grid_coordinates_are_clear():
+    placement = new_placement()
+    rand = random.Random(0)
+    for trial in range(100):
+        circles = random_circles(rand, rand.randint(1, 200))
+        coor = placement.find_in_grid(rand, circles)
+        assert coor is not None
+        assert placement.is_clear(*coor, circles)
+
+
+def test_circles_on_the_edges_block_the_other_side():
+    placement = new_placement()
+    rand = random.Random(1)
+    circles = [(-500, y, 60) for y in range(-500, 501, 40)]
+    for trial in range(200):
+        x, y = placement.find_in_grid(rand, circles)
+        assert -440 < x < 440
+
+
+def test_full_screen_fails():
+    placement = new_placement()
+    circles = [(x, y, 40) for x in range(-500, 500, 50)
+               for y in range(-500, 500, 50)]
+    assert placement.find_in_grid(random.Random(2), circles) is None
+    assert placement.find(random.Random(2), lambda x, y: False,
+                          lambda: circles) is None
+
+
+def test_grid_is_uniform():
+    # The last column and row hold one coordinate, so they should be picked
+    # about once in 1000 times, like any other coordinate.
+    placement = new_placement()
+    rand = random.Random(3)
+    edges = 0
+    picks = 5000
+    for pick in range(picks):
+        x, y = placement.find_in_grid(rand, ())
+        edges += x == 500
+    assert edges < picks * 0.005
+
+
+def test_samples_come_first():
+    placement = new_placement()
+    rand = random.Random(4)
+    expected = new_placement().sample(random.Random(4))
+    tried = []
+
+    def is_free(x, y):
+        tried.append((x, y))
+        return len(tried) == 2
+
+    assert placement.find(rand, is_free, lambda: []) == expected[1]
+    assert tried == expected[:2]
+
+
+def test_teleport_is_clear():
+    # The collisions are checked right after the teleport in the same tick,
+    # so a ship that teleports in every tick is never hit.
+    screen = HeadlessScreen()
+    runner = GameRunner(150, screen, seed=5)
+    lives = runner.get_lives()
+    for tick in range(300):
+        screen.press("t")
+        runner._game_loop()
+        assert runner.get_lives() == lives
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import trig
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from replay import InputRecorder, InputReplay, replay_headless
+
+KEYS = ("Left", "Right", "Up", "space", "s", "t")
+
+
+def record(seed, ticks=300, asteroids_amount=5, use_numpy=False):
+    """
+    Records a headless game whose keys are pressed randomly by the seed,
+    sometimes a few times in one tick.
+    :return: the InputRecorder of the game
+    """
+    recorder = InputRecorder(seed, asteroids_amount)
+    screen = HeadlessScreen()
+    runner = GameRunner(asteroids_amount, screen, use_numpy=use_numpy,
+                        seed=seed, recorder=recorder)
+    player = random.Random(seed)
+    for tick in range(ticks):
+        for press in range(player.randint(0, 3)):
+            screen.press(player.choice(KEYS))
+        runner._game_loop()
+        if runner.is_game_over():
+            break
+    return recorder
+
+
+def test_replay_matches_recording():
+    for seed in range(4):
+        recorder = record(seed)
+        assert recorder.get_ticks() > 0
+        assert replay_headless(recorder) is None
+
+
+def test_recording_keeps_press_counts():
+    recorder = InputRecorder(0)
+    recorder.record((3, 0, 300, 1, 0, 70000, 0))
+    assert recorder.get_keys(0) == (3, 0, 300, 1, 0, 70000, 0)
+    with pytest.raises(OverflowError):
+        recorder.record((2 ** 32, 0, 0, 0, 0, 0, 0))
+    assert recorder.get_keys(0) == (3, 0, 300, 1, 0, 70000, 0)
+
+
+def test_saved_recording_replays(tmp_path):
+    recorder = record(7)
+    path = str(tmp_path / "game.rec")
+    recorder.save(path)
+    loaded = InputRecorder.load(path)
+    assert loaded.get_seed() == 7
+    assert loaded.get_ticks() == recorder.get_ticks()
+    assert replay_headless(loaded) is None
+
+
+def test_saved_recording_keeps_the_game_modes(tmp_path):
+    pytest.importorskip("numpy")
+    trig.use_tables(True)
+    try:
+        recorder = record(3, use_numpy=True)
+    finally:
+        trig.use_tables(False)
+    path = str(tmp_path / "game.rec")
+    recorder.save(path)
+    loaded = InputRecorder.load(path)
+    assert loaded.get_use_numpy() and loaded.get_trig_tables()
+    assert replay_headless(loaded) is None
+    assert not trig.is_using_tables()
+
+
+def test_quit_key_ends_a_replay():
+    recorder = record(5)
+    screen = HeadlessScreen()
+    runner = GameRunner(5, screen, seed=5, replay=InputReplay(recorder))
+    runner._game_loop()
+    screen.press("q")
+    runner._game_loop()
+    assert runner.is_game_over()
@@ -0,0 +1,122 @@
+import os
+import random
+
+import pytest
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+from replay_stream import ReplayStreamReader, ReplayStreamWriter, \
+    ReplayState, POSITION_SCALE
+
+KEYS = ("Left", "Up", "space", "s")
+SCREEN_SIZE = HeadlessScreen.SCREEN_MAX_X - HeadlessScreen.SCREEN_MIN_X
+
+
+class LongGameRunner(GameRunner):
+    """
+    A GameRunner whose ship never runs out of lives.
+    """
+    SHIP_LIFE = 10 ** 9
+
+
+def play(ticks, recorder=None, on_tick=None):
+    """
+    Plays a seeded headless game whose keys are pressed randomly.
+    :param recorder: the recorder of the game
+    :param on_tick: a function that gets the tick and the runner after
+    every tick
+    :return: None
+    """
+    screen = HeadlessScreen()
+    runner = LongGameRunner(20, screen, seed=2, recorder=recorder)
+    player = random.Random(2)
+    for tick in range(ticks):
+        for key in KEYS:
+            if player.random() < 0.2:
+                screen.press(key)
+        runner._game_loop()
+        if on_tick is not None:
+            on_tick(tick, runner)
+
+
+def assert_close(coors, expected):
+    assert len(coors) == len(expected)
+    for coor, other in zip(coors, expected):
+        delta = abs(coor - other) % SCREEN_SIZE
+        assert min(delta, SCREEN_SIZE - delta) <= 1 / POSITION_SCALE
+
+
+def test_states_match_the_game(tmp_path):
+    path = str(tmp_path / "game.astr")
+    writer = ReplayStreamWriter(path, keyframe_interval=50)
+    play(300, recorder=writer)
+    writer.close()
+
+    ticks = (0, 1, 49, 50, 51, 123, 250, 299)
+    snapshots = {}
+
+    def keep(tick, runner):
+        if tick in ticks:
+            snapshots[tick] = runner.snapshot()
+
+    play(300, on_tick=keep)
+    reader = ReplayStreamReader(path)
+    try:
+        assert reader.get_keyframe_ticks() == list(range(0, 300, 50))
+        for tick in ticks:
+            expected = ReplayState()
+            expected.load_snapshot(memoryview(snapshots[tick]))
+            state = reader.get_state(tick)
+            assert state.tick == tick
+            assert state.score == expected.score
+            assert state.lives == expected.lives
+            assert state.ship == expected.ship
+            assert state.sizes == expected.sizes
+            assert_close(state.asteroids, expected.asteroids)
+            assert_close(state.torpedos, expected.torpedos)
+            assert_close(state.special_torpedos, expected.special_torpedos)
+            if tick % 50 == 0:
+                assert state.asteroids == expected.asteroids
+        with pytest.raises(IndexError):
+            reader.get_state(300)
+    finally:
+        reader.close()
+
+
+def test_keyframe_restores_the_game(tmp_path):
+    path = str(tmp_path / "game.astr")
+    writer = ReplayStreamWriter(path, keyframe_interval=40)
+    play(100, recorder=writer)
+    writer.close()
+    snapshots = {}
+    play(100, on_tick=lambda tick, runner: snapshots.setdefault(
+        tick, runner.snapshot()))
+
+    reader = ReplayStreamReader(path)
+    try:
+        key_tick, snapshot = reader.get_keyframe(95)
+        assert key_tick == 80
+        runner = GameRunner(0, HeadlessScreen(), seed=0)
+        runner.restore(snapshot)
+        del snapshot
+        assert runner.snapshot() == snapshots[80]
+    finally:
+        reader.close()
+
+
+@pytest.mark.skipif(not os.path.exists("/dev/full"), reason="no /dev/full")
+def test_write_error_is_raised():
+    # Every write to /dev/full fails, and the game must not wait forever for
+    # the writing thread.
+    writer = ReplayStreamWriter("/dev/full", keyframe_interval=1)
+    with pytest.raises(OSError):
+        play(2000, recorder=writer)
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def test_record_without_a_game(tmp_path):
+    writer = ReplayStreamWriter(str(tmp_path / "game.astr"))
+    with pytest.raises(RuntimeError):
+        writer.record_tick()
+    writer.close()
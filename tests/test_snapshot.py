@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from asteroids_main import GameRunner
+from headless_screen import HeadlessScreen
+
+# No teleport, so the games don't take random numbers after they start.
+KEYS = ("Left", "Right", "Up", "space", "s")
+
+
+class LongGameRunner(GameRunner):
+    """
+    A GameRunner whose ship never runs out of lives.
+    """
+    SHIP_LIFE = 10 ** 9
+
+
+def play(runner, screen, player, ticks):
+    """
+    Runs ticks of a game with keys pressed randomly by the player.
+    :return: a list of the state digests after every tick
+    """
+    digests = []
+    for tick in range(ticks):
+        for key in KEYS:
+            if player.random() < 0.2:
+                screen.press(key)
+        runner._game_loop()
+        digests.append(runner.get_state_digest())
+    return digests
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_restored_game_continues_the_same(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    screen = HeadlessScreen()
+    runner = LongGameRunner(20, screen, use_numpy=use_numpy, seed=3)
+    play(runner, screen, random.Random(0), 200)
+    snapshot = runner.snapshot()
+    expected = play(runner, screen, random.Random(1), 200)
+
+    other_screen = HeadlessScreen()
+    other = LongGameRunner(20, other_screen, use_numpy=use_numpy, seed=3)
+    other.restore(snapshot)
+    assert other.snapshot() == snapshot
+    assert play(other, other_screen, random.Random(1), 200) == expected
+
+
+def test_snapshot_at_offset():
+    screen = HeadlessScreen()
+    runner = LongGameRunner(10, screen, seed=5)
+    play(runner, screen, random.Random(2), 100)
+    size = runner.get_snapshot_size()
+    buffer = bytearray(size + 16)
+    assert runner.write_snapshot(buffer, 16) == size
+    assert bytes(buffer[16:]) == bytes(runner.snapshot())
+
+    other = LongGameRunner(10, HeadlessScreen(), seed=6)
+    other.restore(buffer, 16)
+    assert other.get_state_digest() == runner.get_state_digest()
+    assert other.get_score() == runner.get_score()
+
+
+def test_restore_rejects_other_data():
+    runner = LongGameRunner(5, HeadlessScreen(), seed=0)
+    with pytest.raises(ValueError):
+        runner.restore(bytes(runner.get_snapshot_size()))
+
+
+def test_restore_rejects_a_cut_snapshot():
+    screen = HeadlessScreen()
+    runner = LongGameRunner(10, screen, seed=4)
+    play(runner, screen, random.Random(3), 50)
+    snapshot = runner.snapshot()
+    other = LongGameRunner(3, HeadlessScreen(), seed=0)
+    before = other.snapshot()
+    for size in (len(snapshot) - 1, len(snapshot) - 8, 20):
+        with pytest.raises(ValueError):
+            other.restore(snapshot[:size])
+        assert other.snapshot() == before
+    # A buffer with more data after the snapshot is fine.
+    other.restore(snapshot + bytes(16))
+    assert other.snapshot() == snapshot
@@ -0,0 +1,62 @@
+import pytest
+
+import sweep
+from asteroids_main import GameRunner
+from sweep import ColumnWriter, read_columns, run_sweep
+
+COLUMNS = (("a", "q"), ("b", "d"))
+
+
+def test_columns_round_trip(tmp_path):
+    path = str(tmp_path / "results.col")
+    rows = [(i, i / 2) for i in range(sweep.CHUNK_ROWS * 2 + 10)]
+    writer = ColumnWriter(path, COLUMNS)
+    for row in rows:
+        writer.write_row(row)
+    writer.close()
+    columns = read_columns(path)
+    assert list(columns) == ["a", "b"]
+    assert columns["a"].tolist() == [a for a, b in rows]
+    assert columns["b"].tolist() == [b for a, b in rows]
+
+
+def test_empty_columns_file(tmp_path):
+    path = str(tmp_path / "results.col")
+    ColumnWriter(path, COLUMNS).close()
+    columns = read_columns(path)
+    assert [(name, column.typecode, len(column))
+            for name, column in columns.items()] == [("a", "q", 0),
+                                                     ("b", "d", 0)]
+
+
+def test_not_a_columns_file(tmp_path):
+    path = tmp_path / "results.col"
+    path.write_bytes(b"something else")
+    with pytest.raises(ValueError):
+        read_columns(str(path))
+
+
+def test_torpedo_pool_follows_the_limits():
+    runner_class = sweep.runner_class({"MAX_TORPEDOS": 30,
+                                       "SPECIAL_TORPEDOS_AMOUNT": 2})
+    assert runner_class.TORPEDO_POOL_SIZE == \
+        30 + GameRunner.MAX_SPECIAL_TORPEDOS * 2
+    assert GameRunner.TORPEDO_POOL_SIZE == GameRunner.MAX_TORPEDOS + \
+        GameRunner.MAX_SPECIAL_TORPEDOS * GameRunner.SPECIAL_TORPEDOS_AMOUNT
+
+
+def test_sweep_skips_bad_combinations(tmp_path):
+    path = str(tmp_path / "results.col")
+    played, skipped = run_sweep([("AST_MIN_SPEED", [1, 3]),
+                                 ("AST_MAX_SPEED", [2, 4])], 2, 50, path,
+                                workers=2)
+    assert played == 6
+    assert [overrides for overrides, message in skipped] == \
+        [{"AST_MIN_SPEED": 3, "AST_MAX_SPEED": 2}]
+    columns = read_columns(path)
+    assert len(columns["seed"]) == 6
+    assert sorted(zip(columns["AST_MIN_SPEED"], columns["AST_MAX_SPEED"],
+                      columns["seed"])) == \
+        sorted((low, high, seed) for low, high in ((1, 2), (1, 4), (3, 4))
+               for seed in range(2))
+    assert all(0 < ticks <= 50 for ticks in columns["survival_ticks"])
@@ -0,0 +1,32 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from game_env import ACTIONS_AMOUNT  # noqa: E402
+from vector_engine import VectorGameEngine, compare_with_runner  # noqa: E402
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_engine_matches_runner(seed):
+    assert compare_with_runner(seed, 1500, actions_seed=seed) is None
+
+
+@pytest.mark.parametrize("asteroids_amount", [50, 400])
+def test_engine_matches_runner_with_many_asteroids(asteroids_amount):
+    # A crowded screen makes the teleports use the placement's grid.
+    for seed in range(2):
+        assert compare_with_runner(seed, 200, asteroids_amount,
+                                   actions_seed=seed) is None
+
+
+def test_games_are_independent():
+    engine = VectorGameEngine(3)
+    engine.reset([4, 5, 6])
+    single = VectorGameEngine(1)
+    single.reset([5])
+    actions = np.random.default_rng(0)
+    for tick in range(300):
+        step = actions.integers(ACTIONS_AMOUNT, size=3)
+        engine.step(step)
+        single.step(step[1:2])
+        assert engine.get_state_digest(1) == single.get_state_digest(0)
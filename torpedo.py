@@ -6,6 +6,9 @@ class Torpedo:
     and functions that change the torpedo's attributes if needed.
     """
 
+    __slots__ = ("__x_coor", "__x_speed", "__y_coor", "__y_speed",
+                 "__direction", "__radius")
+
     TORPEDO_RADIUS = 4
 
     def __init__(self, x_coor, x_speed, y_coor, y_speed, direction):
@@ -17,13 +20,30 @@ class Torpedo:
         :param y_speed: y axis speed
         :param direction: the direction in degrees
         """
-        self.__x_coor = x_coor
-        self.__x_speed = x_speed
-        self.__y_coor = y_coor
-        self.__y_speed = y_speed
+        self.__x_coor = float(x_coor)
+        self.__x_speed = float(x_speed)
+        self.__y_coor = float(y_coor)
+        self.__y_speed = float(y_speed)
         self.__direction = direction
         self.__radius = self.TORPEDO_RADIUS
 
+    def reset(self, x_coor, x_speed, y_coor, y_speed, direction):
+        """
+        Gives the torpedo new attributes, so a torpedo that was removed from
+        the game can be used again as a new torpedo.
+        :param x_coor: x axis coordinate
+        :param x_speed: x axis speed
+        :param y_coor: y axis coordinate
+        :param y_speed: y axis speed
+        :param direction: the direction in degrees
+        :return: None
+        """
+        self.__x_coor = float(x_coor)
+        self.__x_speed = float(x_speed)
+        self.__y_coor = float(y_coor)
+        self.__y_speed = float(y_speed)
+        self.__direction = direction
+
     def get_coor(self):
         """
         :return: a tuple of the ship's coordinates
@@ -37,7 +57,25 @@ class Torpedo:
         torpedo coordinates to.
         :return: None
         """
-        self.__x_coor, self.__y_coor = new_coor
+        x_coor, y_coor = new_coor
+        self.__x_coor = float(x_coor)
+        self.__y_coor = float(y_coor)
+
+    def advance(self, x_range, y_range):
+        """
+        Moves the torpedo by its speed, around the screen's edges.
+        :param x_range: a tuple of the minimum x coordinate of the screen and
+        the screen's width
+        :param y_range: a tuple of the minimum y coordinate of the screen and
+        the screen's height
+        :return: None
+        """
+        min_x, delta_x = x_range
+        min_y, delta_y = y_range
+        self.__x_coor = (self.__x_speed + self.__x_coor - min_x) % delta_x + \
+            min_x
+        self.__y_coor = (self.__y_speed + self.__y_coor - min_y) % delta_y + \
+            min_y
 
     def set_speed(self, new_speed):
         """
@@ -0,0 +1,53 @@
+from torpedo import Torpedo
+
+
+class TorpedoPool:
+    """
+    Class of TorpedoPool objects, keeps torpedo objects that are not in the
+    game, so new torpedos can reuse them instead of creating new objects.
+    The pool starts with a given amount of torpedos. If more torpedos are
+    needed at once, new ones are created, and they join the pool when they
+    are released.
+    """
+
+    def __init__(self, size):
+        """
+        Initialize a new TorpedoPool object.
+        :param size: the amount of torpedos to create in advance.
+        """
+        self.__free = [Torpedo(0, 0, 0, 0, 0) for _ in range(size)]
+        self.__created = size
+
+    def acquire(self, x_coor, x_speed, y_coor, y_speed, direction):
+        """
+        Takes a torpedo from the pool (or creates one if the pool is empty)
+        and gives it the given attributes.
+        :return: the torpedo object
+        """
+        if self.__free:
+            tor = self.__free.pop()
+            tor.reset(x_coor, x_speed, y_coor, y_speed, direction)
+            return tor
+        self.__created += 1
+        return Torpedo(x_coor, x_speed, y_coor, y_speed, direction)
+
+    def release(self, tor):
+        """
+        Returns the given torpedo to the pool, after it was removed from the
+        game.
+        :param tor: a torpedo that was acquired from the pool.
+        :return: None
+        """
+        self.__free.append(tor)
+
+    def get_free_amount(self):
+        """
+        :return: the amount of torpedos in the pool.
+        """
+        return len(self.__free)
+
+    def get_created_amount(self):
+        """
+        :return: the amount of torpedo objects the pool has created.
+        """
+        return self.__created
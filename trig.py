@@ -0,0 +1,67 @@
+import math
+
+# The sin and cos of every integer direction in degrees.
+SIN_TABLE = tuple(math.sin(math.radians(deg)) for deg in range(360))
+COS_TABLE = tuple(math.cos(math.radians(deg)) for deg in range(360))
+
+
+def exact_cos_deg(direction):
+    """
+    :param direction: a direction in degrees
+    :return: the cos of the direction
+    """
+    return math.cos(math.radians(direction))
+
+
+def exact_sin_deg(direction):
+    """
+    :param direction: a direction in degrees
+    :return: the sin of the direction
+    """
+    return math.sin(math.radians(direction))
+
+
+def table_cos_deg(direction):
+    """
+    :param direction: a direction in degrees
+    :return: the cos of the direction rounded to an integer amount of degrees
+    """
+    return COS_TABLE[round(direction) % 360]
+
+
+def table_sin_deg(direction):
+    """
+    :param direction: a direction in degrees
+    :return: the sin of the direction rounded to an integer amount of degrees
+    """
+    return SIN_TABLE[round(direction) % 360]
+
+
+# The functions the game uses. They are changed by use_tables, so they should
+# be called as trig.cos_deg and trig.sin_deg.
+cos_deg = exact_cos_deg
+sin_deg = exact_sin_deg
+
+
+def is_using_tables():
+    """
+    :return: True if the integer-degree heading mode is on (see use_tables),
+    and False otherwise.
+    """
+    return cos_deg is table_cos_deg
+
+
+def use_tables(enabled):
+    """
+    Turns the integer-degree heading mode on or off for all the modules of
+    the game. In this mode every direction is rounded to an integer amount of
+    degrees, and its sin and cos are taken from tables instead of being
+    calculated.
+    :param enabled: True to use the tables, False to calculate exactly.
+    :return: None
+    """
+    global cos_deg, sin_deg
+    if enabled:
+        cos_deg, sin_deg = table_cos_deg, table_sin_deg
+    else:
+        cos_deg, sin_deg = exact_cos_deg, exact_sin_deg
@@ -0,0 +1,616 @@
+import math
+import random
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+import trig
+from asteroids_main import GameRunner, DEF_AST_SIZE, DEFAULT_ASTEROIDS_NUM
+from game_env import ACTION_KEYS, ACTIONS_AMOUNT
+from headless_screen import HeadlessScreen
+from placement import Placement, SAMPLES
+from ship import Ship
+from torpedo import Torpedo
+
+# The bit of every key in an action (like in game_env).
+UP, RIGHT, LEFT, TELEPORT, SPACE, SPECIAL = \
+    (1 << bit for bit in range(len(ACTION_KEYS)))
+
+COS_TABLE = np.array(trig.COS_TABLE)
+SIN_TABLE = np.array(trig.SIN_TABLE)
+
+
+def asteroid_radius(size):
+    """
+    :return: the radius of an asteroid of the given size (like
+    Asteroid.get_radius).
+    """
+    return size * 10 - 5
+
+
+class VectorGameEngine:
+    """
+    Class of VectorGameEngine objects, runs many independent headless games
+    together. The attributes of the ships, the asteroids and the torpedos of
+    all the games are kept in NumPy arrays with a row for every game, and
+    every tick of all the games is one vectorized step.
+    The rules are the same as in GameRunner: every step runs the phases of
+    GameRunner._game_loop in the same order, and the objects of every game
+    are kept in the same order as in the GameRunner's lists (a removed object
+    is replaced by the last one), so a game of the engine and a GameRunner
+    with the same seed and the same keys are the same, tick after tick.
+    The few events of a tick (new asteroids, removed objects, teleports and
+    new games) are handled game by game, and the rest is vectorized.
+    The directions are taken from the trig tables, so the engine agrees with
+    GameRunners in the integer-degree heading mode (trig.use_tables(True)).
+    A game that ends is started again right away with its next seed.
+    """
+
+    def __init__(self, envs, asteroids_amount=DEFAULT_ASTEROIDS_NUM,
+                 runner_class=GameRunner, screen_class=HeadlessScreen):
+        """
+        Initialize a new VectorGameEngine object. reset should be called
+        before the first step.
+        :param envs: the amount of games
+        :param asteroids_amount: the amount of asteroids every game starts
+        with
+        :param runner_class: the GameRunner class (or a subclass of it) whose
+        constants the games use
+        :param screen_class: the screen class whose bounds the games use
+        """
+        self.__envs = envs
+        self.__asteroids_amount = asteroids_amount
+        self.__runner = runner_class
+        self.__min_x = screen_class.SCREEN_MIN_X
+        self.__min_y = screen_class.SCREEN_MIN_Y
+        self.__max_x = screen_class.SCREEN_MAX_X
+        self.__max_y = screen_class.SCREEN_MAX_Y
+        self.__delta_x = self.__max_x - self.__min_x
+        self.__delta_y = self.__max_y - self.__min_y
+        self.__max_special = runner_class.MAX_SPECIAL_TORPEDOS * \
+            runner_class.SPECIAL_TORPEDOS_AMOUNT
+        self.__score_table = np.zeros(DEF_AST_SIZE + 1, dtype=np.int64)
+        for size, score in runner_class.SCORE.items():
+            self.__score_table[size] = score
+
+        # Every asteroid breaks into 4 of the smallest size at most, and the
+        # lists may hold the objects that are removed at the end of the tick
+        # as well as new ones.
+        ast_capacity = max(1, asteroids_amount) * 2 ** DEF_AST_SIZE
+        tor_capacity = 2 * runner_class.MAX_TORPEDOS
+        special_capacity = 2 * self.__max_special + \
+            runner_class.SPECIAL_TORPEDOS_AMOUNT
+
+        self.ship_x = np.zeros(envs)
+        self.ship_y = np.zeros(envs)
+        self.ship_x_speed = np.zeros(envs)
+        self.ship_y_speed = np.zeros(envs)
+        self.ship_direction = np.zeros(envs)
+        self.lives = np.zeros(envs, dtype=np.int64)
+        self.score = np.zeros(envs, dtype=np.int64)
+
+        self.ast_x = np.zeros((envs, ast_capacity))
+        self.ast_y = np.zeros((envs, ast_capacity))
+        self.ast_x_speed = np.zeros((envs, ast_capacity))
+        self.ast_y_speed = np.zeros((envs, ast_capacity))
+        self.ast_size = np.zeros((envs, ast_capacity), dtype=np.int64)
+        self.ast_count = np.zeros(envs, dtype=np.int64)
+
+        self.tor_x = np.zeros((envs, tor_capacity))
+        self.tor_y = np.zeros((envs, tor_capacity))
+        self.tor_x_speed = np.zeros((envs, tor_capacity))
+        self.tor_y_speed = np.zeros((envs, tor_capacity))
+        self.tor_direction = np.zeros((envs, tor_capacity))
+        self.tor_life = np.zeros((envs, tor_capacity), dtype=np.int64)
+        self.tor_count = np.zeros(envs, dtype=np.int64)
+
+        self.special_x = np.zeros((envs, special_capacity))
+        self.special_y = np.zeros((envs, special_capacity))
+        self.special_x_speed = np.zeros((envs, special_capacity))
+        self.special_y_speed = np.zeros((envs, special_capacity))
+        self.special_direction = np.zeros((envs, special_capacity))
+        self.special_cos = np.zeros((envs, special_capacity))
+        self.special_sin = np.zeros((envs, special_capacity))
+        self.special_life = np.zeros((envs, special_capacity),
+                                     dtype=np.int64)
+        self.special_count = np.zeros(envs, dtype=np.int64)
+
+        self.__ast_arrays = (self.ast_x, self.ast_y, self.ast_x_speed,
+                             self.ast_y_speed, self.ast_size)
+        self.__tor_arrays = (self.tor_x, self.tor_y, self.tor_x_speed,
+                             self.tor_y_speed, self.tor_direction,
+                             self.tor_life)
+        self.__special_arrays = (self.special_x, self.special_y,
+                                 self.special_x_speed, self.special_y_speed,
+                                 self.special_direction, self.special_cos,
+                                 self.special_sin, self.special_life)
+
+        self.__placement = Placement(self.__min_x, self.__max_x,
+                                     self.__min_y, self.__max_y)
+        self.__seeds = [None] * envs
+        self.__randoms = [None] * envs
+
+    def __len__(self):
+        return self.__envs
+
+    def reset(self, seeds):
+        """
+        Starts a new game in every environment.
+        :param seeds: a sequence of the seeds of the games, one for every
+        environment. When a game ends, the next game of its environment gets
+        the seed plus the amount of environments.
+        :return: None
+        """
+        for env in range(self.__envs):
+            self.__reset_env(env, seeds[env])
+
+    def __random_coor(self, env):
+        """
+        :return: a tuple of random integer coordinates on the screen, from the
+        game's random numbers generator (like GameRunner.__random_coor).
+        """
+        rand = self.__randoms[env]
+        return rand.randint(self.__min_x, self.__max_x), \
+            rand.randint(self.__min_y, self.__max_y)
+
+    def __reset_env(self, env, seed):
+        """
+        Starts a new game in the given environment, with the same random
+        numbers as a new GameRunner with the same seed.
+        :return: None
+        """
+        self.__seeds[env] = seed
+        rand = self.__randoms[env] = random.Random(seed)
+        runner = self.__runner
+        self.ship_x[env], self.ship_y[env] = self.__random_coor(env)
+        self.ship_x_speed[env] = self.ship_y_speed[env] = 0
+        self.ship_direction[env] = 0
+        self.lives[env] = runner.SHIP_LIFE
+        self.score[env] = 0
+        self.ast_count[env] = 0
+        self.tor_count[env] = 0
+        self.special_count[env] = 0
+        placement = self.__placement
+        circles = ((float(self.ship_x[env]), float(self.ship_y[env]),
+                    Ship.SHIP_RADIUS + asteroid_radius(DEF_AST_SIZE)),)
+
+        def is_free(x_coor, y_coor):
+            return placement.is_clear(x_coor, y_coor, circles)
+
+        for ast in range(self.__asteroids_amount):
+            coor = placement.find(rand, is_free, lambda: circles)
+            if coor is None:
+                break
+            x, y = coor
+            x_speed = rand.randint(runner.AST_MIN_SPEED, runner.AST_MAX_SPEED)
+            y_speed = rand.randint(runner.AST_MIN_SPEED, runner.AST_MAX_SPEED)
+            self.__add_asteroid(env, x, x_speed, y, y_speed, DEF_AST_SIZE)
+
+    def __add_asteroid(self, env, x, x_speed, y, y_speed, size):
+        """
+        Adds an asteroid to the end of the given game's asteroids.
+        :return: None
+        """
+        index = self.ast_count[env]
+        for array, value in zip(self.__ast_arrays,
+                                (x, y, x_speed, y_speed, size)):
+            array[env, index] = value
+        self.ast_count[env] = index + 1
+
+    def __wrap(self, coor, speed, minimum, delta):
+        """
+        Moves coordinates by their speeds, around the screen's edges (like
+        GameRunner.__move_object), in place.
+        :return: None
+        """
+        np.add(speed, coor, out=coor)
+        coor -= minimum
+        np.remainder(coor, delta, out=coor)
+        coor += minimum
+
+    def __move(self, x, y, x_speed, y_speed):
+        """
+        Moves the objects in the given arrays.
+        :return: None
+        """
+        self.__wrap(x, x_speed, self.__min_x, self.__delta_x)
+        self.__wrap(y, y_speed, self.__min_y, self.__delta_y)
+
+    def __age(self, life, count, max_life):
+        """
+        Adds 1 to the life-time counters of the torpedos, except those that
+        arrived to the maximum.
+        :return: a boolean array of the torpedos that arrived to the maximum
+        """
+        valid = np.arange(life.shape[1]) < count[:, None]
+        expired = valid & (life == max_life)
+        life[valid & ~expired] += 1
+        return expired
+
+    def __overlaps(self, envs, xs, ys, radius):
+        """
+        Finds which asteroids intersect every one of a group of objects (of
+        all the games), around the screen's edges (like
+        SpatialHash.find_intersections).
+        :param envs: an array of the game of every object
+        :param xs: an array of the x coordinates of the objects
+        :param ys: an array of the y coordinates of the objects
+        :param radius: the radius of the objects
+        :return: a boolean array with a row for every object, that tells which
+        asteroids of its game (by their indexes) it intersects
+        """
+        # All the coordinates are on the screen, so the distances are never
+        # more than the screen's size, and the modulo SpatialHash takes
+        # wouldn't change them.
+        used = self.ast_count.max()
+        delta_x = np.abs(self.ast_x[envs, :used] - xs[:, None])
+        np.minimum(delta_x, self.__delta_x - delta_x, out=delta_x)
+        delta_y = np.abs(self.ast_y[envs, :used] - ys[:, None])
+        np.minimum(delta_y, self.__delta_y - delta_y, out=delta_y)
+        delta_x *= delta_x
+        delta_y *= delta_y
+        delta_x += delta_y
+        max_dist = asteroid_radius(self.ast_size[envs, :used]) + radius
+        max_dist *= max_dist
+        return (delta_x <= max_dist) & \
+            (np.arange(used) < self.ast_count[envs, None])
+
+    def step(self, actions):
+        """
+        Runs one tick of all the games.
+        :param actions: an integer array with an action for every game, whose
+        bits are the keys in game_env.ACTION_KEYS
+        :return: a tuple of an array of the score every game earned in this
+        tick, and a boolean array of the games that ended in this tick (and
+        were started again)
+        """
+        runner = self.__runner
+        actions = np.asarray(actions)
+        old_score = self.score.copy()
+
+        # The ship, the asteroids and the torpedos move.
+        self.__move(self.ship_x, self.ship_y, self.ship_x_speed,
+                    self.ship_y_speed)
+        self.__move(self.ast_x, self.ast_y, self.ast_x_speed,
+                    self.ast_y_speed)
+        self.__move(self.tor_x, self.tor_y, self.tor_x_speed,
+                    self.tor_y_speed)
+        expired_tor = self.__age(self.tor_life, self.tor_count,
+                                 runner.MAX_LIFE_TIME)
+        np.add(self.ship_x_speed[:, None], 2 * self.special_cos,
+               out=self.special_x_speed)
+        np.add(self.ship_y_speed[:, None], 2 * self.special_sin,
+               out=self.special_y_speed)
+        self.__move(self.special_x, self.special_y, self.special_x_speed,
+                    self.special_y_speed)
+        self.special_direction += 5
+        expired_special = self.__age(self.special_life, self.special_count,
+                                     runner.SPECIAL_MAX_LIFE_TIME)
+
+        # The keys, like GameRunner.__clicks_control.
+        up = (actions & UP) != 0
+        degrees = np.rint(self.ship_direction).astype(np.int64) % 360
+        np.add(self.ship_x_speed, COS_TABLE[degrees], out=self.ship_x_speed,
+               where=up)
+        np.add(self.ship_y_speed, SIN_TABLE[degrees], out=self.ship_y_speed,
+               where=up)
+        self.ship_direction[(actions & RIGHT) != 0] -= Ship.TURN_SHIP
+        self.ship_direction[(actions & LEFT) != 0] += Ship.TURN_SHIP
+        self.__teleport(np.flatnonzero(actions & TELEPORT))
+        space = ((actions & SPACE) != 0) & \
+            (self.tor_count - expired_tor.sum(1) < runner.MAX_TORPEDOS)
+        self.__add_torpedos(np.flatnonzero(space))
+        special = ((actions & SPECIAL) != 0) & \
+            (self.special_count - expired_special.sum(1) <
+             self.__max_special)
+        self.__add_special_torpedos(np.flatnonzero(special))
+
+        dead_ast = {}
+        self.__ship_hit_asteroid(dead_ast)
+        hit_tor = np.zeros(expired_tor.shape, bool)
+        hit_special = np.zeros(expired_special.shape, bool)
+        self.__torpedo_hit_asteroid(expired_tor, expired_special, hit_tor,
+                                    hit_special, dead_ast)
+        self.__despawn(dead_ast)
+        self.__despawn_torpedos(self.__tor_arrays, self.tor_count,
+                                expired_tor, hit_tor)
+        self.__despawn_torpedos(self.__special_arrays, self.special_count,
+                                expired_special, hit_special)
+
+        rewards = self.score - old_score
+        dones = (self.ast_count == 0) | (self.lives == 0)
+        for env in np.flatnonzero(dones):
+            self.__reset_env(env, self.__seeds[env] + self.__envs)
+        return rewards, dones
+
+    def __teleport(self, envs):
+        """
+        Teleports the ships of the given games, like
+        GameRunner.__ship_teleport. The random coordinates every game tries
+        first are checked against the asteroids of all the games together,
+        and only a game that none of them is free in builds the grid of its
+        Placement.
+        :param envs: an array of the games whose ships teleport
+        :return: None
+        """
+        if not len(envs):
+            return
+        placement = self.__placement
+        samples = [placement.sample(self.__randoms[env]) for env in envs]
+        coors = np.array(samples, float)
+        hits = self.__overlaps(np.repeat(envs, SAMPLES),
+                               coors[:, :, 0].ravel(), coors[:, :, 1].ravel(),
+                               Ship.SHIP_RADIUS).any(1)
+        free = ~hits.reshape(len(envs), SAMPLES)
+        found = free.any(1)
+        first = free.argmax(1)[found]
+        self.ship_x[envs[found]] = coors[found, first, 0]
+        self.ship_y[envs[found]] = coors[found, first, 1]
+        for env in envs[~found]:
+            circles = [(float(self.ast_x[env, ast]),
+                        float(self.ast_y[env, ast]),
+                        Ship.SHIP_RADIUS +
+                        asteroid_radius(int(self.ast_size[env, ast])))
+                       for ast in range(self.ast_count[env])]
+            coor = placement.find_in_grid(self.__randoms[env], circles)
+            if coor is not None:
+                self.ship_x[env], self.ship_y[env] = coor
+
+    def __add_torpedos(self, envs):
+        """
+        Adds a torpedo to the end of the torpedos of every given game, like
+        GameRunner.__add_torpedo.
+        :param envs: an array of the games' indexes
+        :return: None
+        """
+        index = self.tor_count[envs]
+        direction = self.ship_direction[envs]
+        degrees = np.rint(direction).astype(np.int64) % 360
+        self.tor_x[envs, index] = self.ship_x[envs]
+        self.tor_y[envs, index] = self.ship_y[envs]
+        self.tor_x_speed[envs, index] = self.ship_x_speed[envs] + \
+            2 * COS_TABLE[degrees]
+        self.tor_y_speed[envs, index] = self.ship_y_speed[envs] + \
+            2 * SIN_TABLE[degrees]
+        self.tor_direction[envs, index] = direction
+        self.tor_life[envs, index] = 0
+        self.tor_count[envs] += 1
+
+    def __add_special_torpedos(self, envs):
+        """
+        Adds the torpedos of a special torpedo to the end of the special
+        torpedos of every given game, like GameRunner.__add_special_torpedo.
+        :param envs: an array of the games' indexes
+        :return: None
+        """
+        amount = self.__runner.SPECIAL_TORPEDOS_AMOUNT
+        for i in range(amount):
+            index = self.special_count[envs]
+            direction = self.ship_direction[envs] + (i * (360 / amount))
+            degrees = np.rint(direction).astype(np.int64) % 360
+            cos, sin = COS_TABLE[degrees], SIN_TABLE[degrees]
+            self.special_x[envs, index] = self.ship_x[envs]
+            self.special_y[envs, index] = self.ship_y[envs]
+            self.special_x_speed[envs, index] = self.ship_x_speed[envs] + \
+                2 * cos
+            self.special_y_speed[envs, index] = self.ship_y_speed[envs] + \
+                2 * sin
+            self.special_direction[envs, index] = direction
+            self.special_cos[envs, index] = cos
+            self.special_sin[envs, index] = sin
+            self.special_life[envs, index] = 0
+            self.special_count[envs] += 1
+
+    def __ship_hit_asteroid(self, dead_ast):
+        """
+        Removes a life and an asteroid from every game whose ship hit an
+        asteroid, like GameRunner.__ship_hit_asteroid.
+        :param dead_ast: a dictionary of every game's list of asteroids to
+        remove, that the hit asteroids are added to
+        :return: None
+        """
+        hits = self.__overlaps(np.arange(self.__envs), self.ship_x,
+                               self.ship_y, Ship.SHIP_RADIUS)
+        for env in np.flatnonzero(hits.any(1)):
+            asteroids = np.flatnonzero(hits[env])
+            # GameRunner stops at the first asteroid while the ship has lives
+            # to lose, and goes over all of them otherwise.
+            ast = asteroids[0] if self.lives[env] > 1 else asteroids[-1]
+            self.lives[env] -= 1
+            dead_ast[env] = [ast]
+
+    def __torpedo_hit_asteroid(self, expired_tor, expired_special, hit_tor,
+                               hit_special, dead_ast):
+        """
+        Finds the torpedos that hit an asteroid in every game, and handles the
+        hits like GameRunner.__torpedo_hit_asteroid: every torpedo can hit one
+        asteroid and every asteroid can be hit by one torpedo, the regular
+        torpedos before the special ones.
+        :param expired_tor: a boolean array of the regular torpedos that
+        arrived to their maximum life-time (and can't hit)
+        :param expired_special: the same for the special torpedos
+        :param hit_tor: a boolean array that the regular torpedos that hit an
+        asteroid are marked in
+        :param hit_special: the same for the special torpedos
+        :param dead_ast: a dictionary of every game's list of asteroids to
+        remove, that the hit asteroids are added to
+        :return: None
+        """
+        taken = {env: set(asteroids) for env, asteroids in dead_ast.items()}
+        groups = []
+        for kind, (xs, ys, count, expired, hit, x_speed, y_speed) in \
+                enumerate(((self.tor_x, self.tor_y, self.tor_count,
+                            expired_tor, hit_tor, self.tor_x_speed,
+                            self.tor_y_speed),
+                           (self.special_x, self.special_y,
+                            self.special_count, expired_special, hit_special,
+                            self.special_x_speed, self.special_y_speed))):
+            envs, tors = np.nonzero(
+                (np.arange(xs.shape[1]) < count[:, None]) & ~expired)
+            overlaps = self.__overlaps(envs, xs[envs, tors], ys[envs, tors],
+                                       Torpedo.TORPEDO_RADIUS)
+            rows = np.flatnonzero(overlaps.any(1))
+            groups.append((envs[rows], np.full(len(rows), kind), tors[rows],
+                           overlaps[rows], hit, x_speed, y_speed))
+        # Only the few torpedos that touch an asteroid are handled one by
+        # one, in the order GameRunner checks them: game by game, the regular
+        # torpedos before the special ones.
+        envs, kinds, tors = (np.concatenate([group[i] for group in groups])
+                             for i in range(3))
+        for row in np.lexsort((tors, kinds, envs)):
+            env, kind, tor = envs[row], kinds[row], tors[row]
+            overlaps, hit, x_speed, y_speed = groups[kind][3:]
+            row -= len(groups[0][0]) if kind else 0
+            env_taken = taken.setdefault(env, set())
+            for ast in np.flatnonzero(overlaps[row]):
+                if ast not in env_taken:
+                    break
+            else:
+                continue
+            env_taken.add(ast)
+            hit[env, tor] = True
+            size = self.ast_size[env, ast]
+            self.score[env] += self.__score_table[size]
+            if size > 1:
+                self.__change_asteroid(env, (x_speed[env, tor],
+                                             y_speed[env, tor]), ast)
+            dead_ast.setdefault(env, []).append(ast)
+
+    def __change_asteroid(self, env, tor_speed, ast):
+        """
+        Adds two smaller asteroids instead of the one that a torpedo hit, like
+        GameRunner.__change_asteroid.
+        :param tor_speed: a tuple of the torpedo's speed in both axises
+        :return: None
+        """
+        new_size = self.ast_size[env, ast] - 1
+        x, y = self.ast_x[env, ast], self.ast_y[env, ast]
+        ast_speed = self.ast_x_speed[env, ast], self.ast_y_speed[env, ast]
+        speed_av = math.sqrt(ast_speed[0] ** 2 + ast_speed[1] ** 2)
+        self.__add_asteroid(env, x, (tor_speed[0] + ast_speed[0]) / speed_av,
+                            y, (tor_speed[1] + ast_speed[1]) / speed_av,
+                            new_size)
+        self.__add_asteroid(env, x, (tor_speed[0] - ast_speed[0]) / speed_av,
+                            y, (tor_speed[1] - ast_speed[1]) / speed_av,
+                            new_size)
+
+    def __remove(self, arrays, count, env, indexes):
+        """
+        Removes objects from a game one after the other, every one by moving
+        the last object to its place (like EntityList.remove).
+        :param arrays: the arrays of the objects' attributes
+        :param count: the array of the amounts of objects in every game
+        :param indexes: the indexes of the objects to remove, in the order of
+        their removal
+        :return: None
+        """
+        for i, index in enumerate(indexes):
+            last = count[env] - 1
+            if index != last:
+                for array in arrays:
+                    array[env, index] = array[env, last]
+                # An object that is still to be removed may have been moved.
+                for j in range(i + 1, len(indexes)):
+                    if indexes[j] == last:
+                        indexes[j] = index
+            count[env] = last
+
+    def __despawn(self, dead_ast):
+        """
+        Removes the asteroids that were destroyed in this tick, in the order
+        they were hit (like GameRunner.__despawn).
+        :param dead_ast: a dictionary of every game's list of asteroids to
+        remove
+        :return: None
+        """
+        for env, asteroids in dead_ast.items():
+            self.__remove(self.__ast_arrays, self.ast_count, env, asteroids)
+
+    def __despawn_torpedos(self, arrays, count, expired, hit):
+        """
+        Removes the torpedos that were destroyed in this tick, in the order
+        GameRunner.__despawn removes them: the torpedos that arrived to their
+        maximum life-time before those that hit an asteroid.
+        :param arrays: the arrays of the torpedos' attributes
+        :param count: the array of the amounts of torpedos in every game
+        :param expired: a boolean array of the torpedos that arrived to their
+        maximum life-time
+        :param hit: a boolean array of the torpedos that hit an asteroid
+        :return: None
+        """
+        for env in np.flatnonzero(expired.any(1) | hit.any(1)):
+            self.__remove(arrays, count, env,
+                          np.flatnonzero(expired[env]).tolist() +
+                          np.flatnonzero(hit[env]).tolist())
+
+    def get_state_digest(self, env):
+        """
+        :return: the checksum of the given game's state, the same as
+        GameRunner.get_state_digest of the same state.
+        """
+        values = [self.ship_x[env], self.ship_y[env], self.ship_x_speed[env],
+                  self.ship_y_speed[env], self.ship_direction[env],
+                  self.score[env], self.lives[env]]
+        for xs, ys, count in ((self.ast_x, self.ast_y, self.ast_count),
+                              (self.tor_x, self.tor_y, self.tor_count),
+                              (self.special_x, self.special_y,
+                               self.special_count)):
+            for index in range(count[env]):
+                values.extend((xs[env, index], ys[env, index]))
+        return zlib.crc32(struct.pack("%dd" % len(values), *values))
+
+
+def compare_with_runner(seed, ticks, asteroids_amount=DEFAULT_ASTEROIDS_NUM,
+                        actions_seed=0):
+    """
+    Runs a game of the engine and a headless GameRunner with the same seed and
+    the same random actions, in the integer-degree heading mode.
+    :return: the first tick whose state is different, or None if all the
+    ticks are the same (until the game ends).
+    """
+    from game_env import AsteroidsEnv
+    trig.use_tables(True)
+    try:
+        engine = VectorGameEngine(1, asteroids_amount)
+        engine.reset([seed])
+        env = AsteroidsEnv(asteroids_amount)
+        env.reset(seed)
+        actions = random.Random(actions_seed)
+        for tick in range(ticks):
+            action = actions.randrange(ACTIONS_AMOUNT)
+            done = env.step(action)[2]
+            dones = engine.step(np.array([action]))[1]
+            if done != dones[0]:
+                return tick
+            if done:
+                return None
+            if engine.get_state_digest(0) != \
+                    env.get_runner().get_state_digest():
+                return tick
+        return None
+    finally:
+        trig.use_tables(False)
+
+
+def main(args):
+    envs = int(args[0]) if len(args) > 0 else 1000
+    ticks = int(args[1]) if len(args) > 1 else 1000
+    engine = VectorGameEngine(envs)
+    engine.reset(range(envs))
+    actions = np.random.default_rng(0)
+    start = time.perf_counter()
+    games = 0
+    for tick in range(ticks):
+        dones = engine.step(actions.integers(ACTIONS_AMOUNT, size=envs))[1]
+        games += dones.sum()
+    elapsed = time.perf_counter() - start
+    print("%d games x %d ticks in %.2f seconds: %.0f game ticks/s, %d games "
+          "ended" % (envs, ticks, elapsed, envs * ticks / elapsed, games))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))